@@ -0,0 +1,61 @@
+"""
+Multi-row inserts for the bulk create db_handlers.
+
+Items are inserted as they arrive, one `INSERT ... VALUES (...), (...) RETURNING` per BULK_INSERT_CHUNK_SIZE
+of them, all in the caller's transaction. The primary keys are generated here so every returned row is
+matched back to its item, Postgres doesnt promise RETURNING keeps the VALUES order.
+"""
+
+import uuid
+from typing import AsyncIterable
+
+from pydantic import BaseModel
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ai_health.root.settings import Settings
+
+
+settings = Settings()
+
+CHUNK_SIZE = settings.BULK_INSERT_CHUNK_SIZE
+
+
+async def insert_in_chunks(
+    session: AsyncSession,
+    orm,
+    id_column,
+    items: AsyncIterable[BaseModel],
+    record_schema: type[BaseModel],
+    chunk_size: int = CHUNK_SIZE,
+) -> list:
+    """
+    Returns the inserted rows as `record_schema`, in the order of `items`
+    """
+    records = []
+    chunk = []
+
+    async for item in items:
+        chunk.append(item)
+
+        if len(chunk) == chunk_size:
+            records.extend(await _insert_chunk(session, orm, id_column, chunk, record_schema))
+            chunk = []
+
+    if chunk:
+        records.extend(await _insert_chunk(session, orm, id_column, chunk, record_schema))
+
+    return records
+
+
+async def _insert_chunk(session: AsyncSession, orm, id_column, chunk: list, record_schema: type[BaseModel]) -> list:
+    rows = [{**item.model_dump(), id_column.key: uuid.uuid4()} for item in chunk]
+    stmt = insert(orm).values(rows).returning(orm)
+
+    inserted = {getattr(row, id_column.key): row for row in (await session.execute(statement=stmt)).scalars()}
+    records = [record_schema.model_validate(inserted[row[id_column.key]]) for row in rows]
+
+    # The rows are already copied out, the session doesnt need to track them until the commit
+    session.expunge_all()
+
+    return records
@@ -0,0 +1,261 @@
+"""
+Read-through Redis cache for db_handler read functions, with tag based invalidation.
+
+    @cached(Doctor, tags=["doctor:{doctor_id}"])
+    async def get_doctor_by_id(doctor_id: str): ...
+
+    async def update_doctor(doctor_id: str, ...):
+        ...
+        await invalidate_tags(make_tag("doctor", doctor_id))
+
+Tags are format strings filled in with the call's arguments, `result_tags` can add more from the result.
+Every tag is a Redis set of the cache keys filed under it, so invalidating a tag deletes all of them.
+
+A load that read the db before an invalidation can finish after it and file its key under the tag again.
+Invalidating a tag also leaves a marker for as long as a load may run, DB_CACHE_LOCK_TIMEOUT, and a loader
+deletes what it just stored when any of its tags has one. A load that ran longer stores nothing.
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import logging
+import math
+import time
+from typing import Any, Callable, Iterable, Optional
+from uuid import UUID
+
+import orjson
+from pydantic import TypeAdapter
+from redis.exceptions import RedisError
+
+from ai_health.root.redis_manager import redis_manager
+from ai_health.root.settings import Settings
+from ai_health.root.utils.cache_codecs import to_json_primitive
+
+
+settings = Settings()
+
+LOGGER = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "db_cache"
+TAG_KEY_PREFIX = "db_cache_tag"
+LOCK_KEY_PREFIX = "db_cache_lock"
+INVALIDATED_KEY_PREFIX = "db_cache_invalidated"
+
+# Outlives any load that still stores, the second covers the loader's own round trip to check it
+INVALIDATED_TTL = math.ceil(settings.DB_CACHE_LOCK_TIMEOUT) + 1
+
+LOCK_POLL_INTERVAL = 0.05  # Seconds
+
+# Loads running in this worker, so concurrent callers of a cold key share one db query
+_in_flight: dict[str, asyncio.Future] = {}
+
+
+def _normalise(value: Any) -> Any:
+    # A UUID can arrive as a UUID, a hex string or a dashed string, they must all give the same key and tag
+    if isinstance(value, UUID):
+        return str(value)
+
+    if isinstance(value, str):
+        try:
+            return str(UUID(value))
+        except ValueError:
+            return value
+
+    return value
+
+
+def _bind_arguments(signature: inspect.Signature, args: tuple, kwargs: dict) -> dict:
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+
+    arguments = {}
+    for name, value in bound.arguments.items():
+        if signature.parameters[name].kind == inspect.Parameter.VAR_KEYWORD:
+            arguments.update({key: _normalise(item) for key, item in value.items()})
+        else:
+            arguments[name] = _normalise(value)
+
+    return arguments
+
+
+def _cache_key(function_name: str, arguments: dict) -> str:
+    arguments_digest = hashlib.sha256(
+        orjson.dumps(arguments, default=to_json_primitive, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+
+    return f"{CACHE_KEY_PREFIX}:{function_name}:{arguments_digest}"
+
+
+def make_tag(name: str, value: Any) -> str:
+    """
+    Builds a tag the same way the `tags` format strings are filled in, e.g make_tag("doctor", doctor_id)
+    """
+    return f"{name}:{_normalise(value)}"
+
+
+def _tag_key(tag: str) -> str:
+    return f"{TAG_KEY_PREFIX}:{tag}"
+
+
+def _invalidated_key(tag: str) -> str:
+    return f"{INVALIDATED_KEY_PREFIX}:{tag}"
+
+
+async def invalidate_tags(*tags: str):
+    """
+    Deletes every cached entry filed under any of the tags.
+
+    The markers are set before the tags are read. A loader that checks them before they are set has already
+    filed its key, so it is deleted with the others.
+
+    A failure is logged and not raised, the write that called it has already been committed.
+    """
+    tag_keys = [_tag_key(tag) for tag in tags]
+
+    try:
+        await redis_manager.set_many(items={_invalidated_key(tag): 1 for tag in tags}, ttl=INVALIDATED_TTL)
+        cache_keys = await redis_manager.get_set_members(keys=tag_keys)
+        await redis_manager.delete_many(keys=[*cache_keys, *tag_keys])
+    except RedisError as e:
+        LOGGER.error(f"Couldnt invalidate the cache tags {tags}")
+        LOGGER.exception(e)
+
+
+def cached(
+    schema: Any,
+    tags: Iterable[str] = (),
+    result_tags: Optional[Callable[[Any], Iterable[str]]] = None,
+    ttl: int = settings.DB_CACHE_TTL,
+):
+    """
+    Caches the result of an async db_handler read function in Redis.
+
+    `schema` is the return type, it is used to store the result and to rebuild it from the cache.
+    Exceptions such as NotFoundException are never cached.
+    When Redis is unavailable the function is called directly.
+    """
+    adapter = TypeAdapter(schema)
+    tags = list(tags)
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        function_name = f"{fn.__module__}.{fn.__qualname__}"
+
+        async def load_and_store(key: str, arguments: dict, args: tuple, kwargs: dict):
+            start = time.monotonic()
+            result = await fn(*args, **kwargs)
+
+            if time.monotonic() - start >= settings.DB_CACHE_LOCK_TIMEOUT:
+                # The markers of invalidations during the load could have expired already
+                LOGGER.warning(f"Not caching {key}, loading it took longer than the lock timeout")
+                return result
+
+            entry_tags = [tag.format(**arguments) for tag in tags]
+            if result_tags is not None:
+                entry_tags.extend(result_tags(result))
+
+            try:
+                async with redis_manager.batch() as batch:
+                    batch.cache_json_item(key=key, value=adapter.dump_python(result, mode="json"), ttl=ttl)
+                    for tag in entry_tags:
+                        batch.add_to_set(key=_tag_key(tag), members=[key], ttl=ttl)
+                    batch.count_existing(keys=[_invalidated_key(tag) for tag in entry_tags])
+
+                if entry_tags and batch.results[-1]:
+                    # One of the tags was invalidated while loading, the result may predate the write
+                    await redis_manager.delete_key(key=key)
+            except RedisError as e:
+                LOGGER.exception(e)
+
+            return result
+
+        async def load(key: str, arguments: dict, args: tuple, kwargs: dict):
+            """
+            Only the caller holding the lock queries the db, the others wait for it to fill the cache
+            """
+            lock = redis_manager.lock(name=f"{LOCK_KEY_PREFIX}:{key}", timeout=settings.DB_CACHE_LOCK_TIMEOUT)
+
+            try:
+                is_loader = await lock.acquire()
+            except RedisError as e:
+                LOGGER.exception(e)
+                return await fn(*args, **kwargs)
+
+            if is_loader:
+                try:
+                    return await load_and_store(key, arguments, args, kwargs)
+                finally:
+                    try:
+                        await lock.release()
+                    except RedisError as e:
+                        # It expires on its own after the lock timeout
+                        LOGGER.warning(f"Couldnt release the cache lock for {key}: {e}")
+
+            waited = 0.0
+            while waited < settings.DB_CACHE_LOCK_WAIT:
+                await asyncio.sleep(LOCK_POLL_INTERVAL)
+                waited += LOCK_POLL_INTERVAL
+
+                try:
+                    cached_value = await redis_manager.get_cached_json_item(key=key)
+                except RedisError as e:
+                    LOGGER.exception(e)
+                    break
+
+                if cached_value is not None:
+                    return adapter.validate_python(cached_value)
+
+            LOGGER.warning(f"Gave up waiting for the cache loader of {key}")
+            return await fn(*args, **kwargs)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            arguments = _bind_arguments(signature, args, kwargs)
+            key = _cache_key(function_name, arguments)
+
+            try:
+                cached_value = await redis_manager.get_cached_json_item(key=key)
+            except RedisError as e:
+                LOGGER.exception(e)
+                return await fn(*args, **kwargs)
+
+            if cached_value is not None:
+                return adapter.validate_python(cached_value)
+
+            in_flight = _in_flight.get(key)
+            if in_flight is not None:
+                try:
+                    return await asyncio.shield(in_flight)
+                except asyncio.CancelledError:
+                    if not in_flight.cancelled():
+                        raise
+
+                    # The request doing the load was cancelled, this one still needs the result
+                    return await fn(*args, **kwargs)
+
+            future = asyncio.get_running_loop().create_future()
+            _in_flight[key] = future
+
+            try:
+                result = await load(key, arguments, args, kwargs)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                future.set_exception(e)
+                # Marks the exception as retrieved when nobody else was waiting on it
+                future.exception()
+                raise
+            finally:
+                _in_flight.pop(key, None)
+
+            future.set_result(result)
+
+            return result
+
+        return wrapper
+
+    return decorator
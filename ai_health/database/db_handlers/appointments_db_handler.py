@@ -1,8 +1,9 @@
 import logging
+from typing import AsyncIterable, Optional
 from sqlalchemy import and_, insert, update, delete, select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import joinedload
 
+from ai_health.database.orms.doctor_orm import Doctor as DoctorDB
 from ai_health.database.orms.medication_n_dosage_orm import Appointment as AppointmentDB
 from ai_health.schemas.appointment_schema import (
     Appointment,
@@ -11,11 +12,19 @@ from ai_health.schemas.appointment_schema import (
     AppointmentUpdate,
     AppointmentWithDoctor,
 )
-from ai_health.root.database import async_session
+from ai_health.root.database import async_session, read_session
+from ai_health.database.bulk import CHUNK_SIZE as BULK_CHUNK_SIZE, insert_in_chunks
+from ai_health.database.pagination import DEFAULT_LIMIT, next_page, paginate
+from ai_health.database.projection import Projection
+from ai_health.database.versions import Version, select_version
+from ai_health.services.utils import user_aggregate_cache
+from ai_health.schemas.doctor_schema import Doctor
 from ai_health.services.utils.exceptions import NotFoundException, RecordExistsException, ServiceException
 
 LOGGER = logging.getLogger(__name__)
 
+APPOINTMENTS = Projection(AppointmentDB, AppointmentWithDoctor, doctor=Projection(DoctorDB, Doctor))
+
 
 async def create_appointment(appointment: AppointmentCreate):
     async with async_session() as session:
@@ -40,11 +49,43 @@ async def create_appointment(appointment: AppointmentCreate):
             raise ServiceException(message=f"Couldn't create record")
 
         await session.commit()
+        await user_aggregate_cache.bump_version(result.patient_id)
+
         return Appointment.model_validate(result)
 
 
-async def get_appointment(appointment_id: int):
+async def create_appointments(
+    appointments: AsyncIterable[AppointmentCreate], chunk_size: int = BULK_CHUNK_SIZE
+) -> list[Appointment]:
+    """
+    Inserts every item in one transaction, either all of them are created or none
+    """
     async with async_session() as session:
+        try:
+            created = await insert_in_chunks(
+                session, AppointmentDB, AppointmentDB.appointment_id, appointments, Appointment, chunk_size=chunk_size
+            )
+        except IntegrityError as e:
+            LOGGER.error(f"Bulk insert of appointments violated a constraint")
+            await session.rollback()
+            raise RecordExistsException(message=f"{e.detail}")
+        except ServiceException:
+            await session.rollback()
+            raise
+        except Exception as e:
+            LOGGER.exception(e)
+            LOGGER.error("An unknown error occurred")
+            await session.rollback()
+            raise ServiceException(message="An unknown error occurred")
+
+        await session.commit()
+        await user_aggregate_cache.bump_version(*{x.patient_id for x in created})
+
+        return created
+
+
+async def get_appointment(appointment_id: int):
+    async with read_session() as session:
         stmt = select(AppointmentDB).filter(AppointmentDB.appointment_id == appointment_id)
 
         result = (await session.execute(statement=stmt)).scalar_one_or_none()
@@ -55,44 +96,76 @@ async def get_appointment(appointment_id: int):
         return Appointment.model_validate(result)
 
 
-async def get_appointments(**kwargs):
-    async with async_session() as session:
-        patient_id = kwargs.get("patient_id", None)
-        doctor_id = kwargs.get("doctor_id", None)
+async def get_appointment_version(appointment_id: str) -> Optional[Version]:
+    """
+    None when there is no such record
+    """
+    async with read_session() as session:
+        stmt = select_version(AppointmentDB).filter(AppointmentDB.appointment_id == appointment_id)
+        version = Version.from_row((await session.execute(statement=stmt)).one())
 
-        filter_conditions = []
-        if patient_id:
-            filter_conditions.append(AppointmentDB.patient_id == patient_id)
-        if doctor_id:
-            filter_conditions.append(AppointmentDB.doctor_id == doctor_id)
+        return version if version.count else None
 
-        stmt = (
-            select(AppointmentDB)
-            .filter(and_(*filter_conditions))
-            .order_by(AppointmentDB.appointment_date.desc())
-            .options(
-                joinedload(
-                    AppointmentDB.doctor,
-                )
-            )
+
+def _filter_conditions(patient_id=None, doctor_id=None, **kwargs) -> list:
+    filter_conditions = []
+    if patient_id:
+        filter_conditions.append(AppointmentDB.patient_id == patient_id)
+    if doctor_id:
+        filter_conditions.append(AppointmentDB.doctor_id == doctor_id)
+
+    return filter_conditions
+
+
+async def get_appointments(
+    limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None, **kwargs
+):
+    async with read_session() as session:
+        stmt = paginate(
+            APPOINTMENTS.select().filter(and_(*_filter_conditions(**kwargs))),
+            AppointmentDB.appointment_date,
+            AppointmentDB.appointment_id,
+            limit=limit,
+            cursor=cursor,
+        )
+
+        result = (await session.execute(statement=stmt)).all()
+        result, next_cursor = next_page(
+            result, AppointmentDB.appointment_date, AppointmentDB.appointment_id, limit=limit
         )
 
-        result = (await session.execute(statement=stmt)).unique().scalars().all()
+        return AppointmentList(
+            detail="Appointments retrieved", appointments=APPOINTMENTS.build(result), next_cursor=next_cursor
+        )
 
-        result_set = []
 
-        for x in result:
-            result_set.append(AppointmentWithDoctor.model_validate(x))
+async def get_appointments_version(**kwargs) -> Version:
+    """
+    Of every record matching the filters, not only of the first page
+    """
+    async with read_session() as session:
+        stmt = APPOINTMENTS.select_version().filter(and_(*_filter_conditions(**kwargs)))
 
-        return AppointmentList(detail="Appointments retrieved", appointments=result_set)
+        return Version.from_row((await session.execute(statement=stmt)).one())
 
 
 async def update_appointment(appointment_id: int, appointment_update: AppointmentUpdate):
     async with async_session() as session:
+        values = appointment_update.model_dump(exclude_none=True, exclude_unset=True)
+
+        previous_patient_id = None
+        if "patient_id" in values:
+            # The record moves to another patient, both aggregates change
+            previous_patient_id = (
+                await session.execute(
+                    select(AppointmentDB.patient_id).where(AppointmentDB.appointment_id == appointment_id)
+                )
+            ).scalar_one_or_none()
+
         stmt = (
             update(AppointmentDB)
             .where(AppointmentDB.appointment_id == appointment_id)
-            .values(appointment_update.model_dump(exclude_none=True, exclude_unset=True))
+            .values(values)
             .returning(AppointmentDB)
         )
 
@@ -102,12 +175,22 @@ async def update_appointment(appointment_id: int, appointment_update: Appointmen
             raise ServiceException(f"Appointment could not be updated for appointment_id {appointment_id}")
 
         await session.commit()
+        await user_aggregate_cache.bump_version(result.patient_id, previous_patient_id)
+
         return Appointment.model_validate(result)
 
 
 async def delete_appointment(appointment_id: int):
     async with async_session() as session:
-        stmt = delete(AppointmentDB).where(AppointmentDB.appointment_id == appointment_id)
+        stmt = (
+            delete(AppointmentDB)
+            .where(AppointmentDB.appointment_id == appointment_id)
+            .returning(AppointmentDB.patient_id)
+        )
+
+        patient_id = (await session.execute(statement=stmt)).scalar_one_or_none()
+        await session.commit()
+
+        await user_aggregate_cache.bump_version(patient_id)
 
-        result = await session.execute(statement=stmt)
-        return result is not None
+        return patient_id is not None
@@ -1,20 +1,67 @@
 import logging
+from typing import AsyncIterator
 from sqlalchemy import insert, select, delete, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 
 from ai_health.schemas.auth_schemas import User, UserCreate, UserEdit, UserExtended, UserWithAllRelations
-from ai_health.root.database import async_session
+from ai_health.schemas.appointment_schema import AppointmentWithDoctor
+from ai_health.schemas.billings_schema import BillingWithDoctor
+from ai_health.schemas.lab_report_schema import LabReport
+from ai_health.schemas.medical_history_schema import MedicalHistory
+from ai_health.schemas.medication_schema import MedicationWithDoctor
+from ai_health.schemas.visits_schema import VisitWithDoctor
+from ai_health.root.database import async_session, read_session
+from ai_health.root.settings import Settings
 
 from ai_health.database.orms.auth_orm import User as UserDB
 from ai_health.database.orms.visits_orm import Visit as VisitDB
 from ai_health.database.orms.billing_orm import Billing as BillingDB
-from ai_health.database.orms.medication_n_dosage_orm import Medication as MedicationDB, Appointment as AppointmentDB
+from ai_health.database.orms.medication_n_dosage_orm import (
+    Medication as MedicationDB,
+    Appointment as AppointmentDB,
+    LabReport as LabReportDB,
+    MedicalHistory as MedicalHistoryDB,
+)
 from ai_health.services.utils.exceptions import NotFoundException, RecordExistsException, ServiceException
+from ai_health.services.utils import user_aggregate_cache, user_cache
 
 
 LOGGER = logging.getLogger(__name__)
 
+settings = Settings()
+
+# Record type in the export, the table, its sort key and primary key, the doctor to join in and the schema
+EXPORT_RELATIONS = (
+    ("visit", VisitDB, VisitDB.visit_date, VisitDB.visit_id, VisitDB.doctor, VisitWithDoctor),
+    (
+        "medication",
+        MedicationDB,
+        MedicationDB.start_date,
+        MedicationDB.medication_id,
+        MedicationDB.doctor,
+        MedicationWithDoctor,
+    ),
+    (
+        "appointment",
+        AppointmentDB,
+        AppointmentDB.appointment_date,
+        AppointmentDB.appointment_id,
+        AppointmentDB.doctor,
+        AppointmentWithDoctor,
+    ),
+    ("lab_report", LabReportDB, LabReportDB.test_date, LabReportDB.report_id, None, LabReport),
+    (
+        "medical_history",
+        MedicalHistoryDB,
+        MedicalHistoryDB.diagnosis_date,
+        MedicalHistoryDB.history_id,
+        None,
+        MedicalHistory,
+    ),
+    ("billing", BillingDB, BillingDB.date_created, BillingDB.billing_id, BillingDB.doctor, BillingWithDoctor),
+)
+
 
 async def create_user(user: UserCreate):
     async with async_session() as session:
@@ -86,6 +133,9 @@ async def update_user(
 
         await session.commit()
 
+        await user_cache.invalidate_user(user_id=result.user_id)
+        await user_aggregate_cache.bump_version(result.user_id)
+
         return User.model_validate(result)
 
 
@@ -118,32 +168,51 @@ async def get_user_with_user_id(user_id: str):
 async def get_user_with_id_and_relations(user_id: str):
     async with async_session() as session:
 
+        # selectinload runs one query per collection, joining all six in one statement returns the product of
+        # their sizes as rows. The doctor of each row is a many-to-one, so it is still joined into that query.
         stmt = (
             select(UserDB)
             .filter(UserDB.user_id == user_id)
             .options(
-                joinedload(UserDB.medical_history),
-                joinedload(UserDB.lab_reports),
-                joinedload(UserDB.visits).options(
-                    joinedload(VisitDB.doctor),
-                ),
-                joinedload(UserDB.appointments).options(
-                    joinedload(AppointmentDB.doctor),
-                ),
-                joinedload(UserDB.medications).options(
-                    joinedload(MedicationDB.doctor),
-                ),
-                joinedload(UserDB.billings).options(
-                    joinedload(BillingDB.doctor),
-                ),
+                selectinload(UserDB.medical_history),
+                selectinload(UserDB.lab_reports),
+                selectinload(UserDB.visits).joinedload(VisitDB.doctor),
+                selectinload(UserDB.appointments).joinedload(AppointmentDB.doctor),
+                selectinload(UserDB.medications).joinedload(MedicationDB.doctor),
+                selectinload(UserDB.billings).joinedload(BillingDB.doctor),
             )
         )
 
-        result = (await session.execute(statement=stmt)).unique().scalar_one_or_none()
+        result = (await session.execute(statement=stmt)).scalar_one_or_none()
 
         if result is None:
             raise NotFoundException(message=f"Couldnt find user with user_id {user_id}")
 
-        print(f"This is teh result {result}")
-
         return UserWithAllRelations.model_validate(result)
+
+
+async def stream_user_records(user_id: str) -> AsyncIterator[tuple[str, list]]:
+    """
+    Yields every record of the user as (record type, chunk of schemas), a chunk at a time.
+
+    Each table is read through a server side cursor in chunks of EXPORT_CHUNK_SIZE rows, and the rows are
+    expunged from the session once converted, so memory doesnt grow with the number of records.
+    """
+    async with read_session() as session:
+        for record_type, orm, sort_column, id_column, doctor, schema in EXPORT_RELATIONS:
+            stmt = (
+                select(orm)
+                .where(orm.patient_id == user_id)
+                .order_by(sort_column.desc(), id_column.desc())
+                .execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
+            )
+            if doctor is not None:
+                stmt = stmt.options(joinedload(doctor))
+
+            result = await session.stream_scalars(statement=stmt)
+
+            async for partition in result.partitions():
+                records = [schema.model_validate(row) for row in partition]
+                session.expunge_all()
+
+                yield record_type, records
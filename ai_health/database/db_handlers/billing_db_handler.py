@@ -1,15 +1,31 @@
 import logging
+from typing import Optional
 from sqlalchemy import insert, select, delete, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload
 
 from ai_health.database.orms.billing_orm import Billing as BillingDB
-from ai_health.schemas.billings_schema import BillingCreate, BillingUpdate, Billing, BillingWithDoctor
-from ai_health.root.database import async_session
+from ai_health.database.orms.doctor_orm import Doctor as DoctorDB
+from ai_health.schemas.billings_schema import (
+    BillingCreate,
+    BillingUpdate,
+    Billing,
+    BillingWithDoctor,
+    BillingsWithDoctorList,
+)
+from ai_health.root.database import async_session, read_session
+from ai_health.database.cache import cached, invalidate_tags, make_tag
+from ai_health.database.pagination import DEFAULT_LIMIT, next_page, paginate
+from ai_health.database.projection import Projection
+from ai_health.database.versions import Version
+from ai_health.services.utils import user_aggregate_cache
+from ai_health.schemas.doctor_schema import Doctor
 from ai_health.services.utils.exceptions import NotFoundException, RecordExistsException, ServiceException
 
 LOGGER = logging.getLogger(__name__)
 
+BILLINGS = Projection(BillingDB, BillingWithDoctor, doctor=Projection(DoctorDB, Doctor))
+
 
 async def create_billing(billing_create: BillingCreate):
     async with async_session() as session:
@@ -29,9 +45,16 @@ async def create_billing(billing_create: BillingCreate):
             await session.rollback()
             raise ServiceException(message="Couldn't create billing record")
         await session.commit()
+        await user_aggregate_cache.bump_version(result.patient_id)
+
         return Billing.from_orm(result)
 
 
+@cached(
+    BillingWithDoctor,
+    tags=["billing:{billing_id}"],
+    result_tags=lambda billing: [make_tag("doctor", billing.doctor_id)],
+)
 async def get_billing_by_id(billing_id: str):
     async with async_session() as session:
         stmt = (
@@ -47,6 +70,17 @@ async def get_billing_by_id(billing_id: str):
         return BillingWithDoctor.model_validate(result)
 
 
+async def get_billing_version(billing_id: str) -> Optional[Version]:
+    """
+    None when there is no such record
+    """
+    async with async_session() as session:
+        stmt = BILLINGS.select_version().filter(BillingDB.billing_id == billing_id)
+        version = Version.from_row((await session.execute(stmt)).one())
+
+        return version if version.count else None
+
+
 async def update_billing(billing_id: str, billing_update: BillingUpdate):
     async with async_session() as session:
         stmt = (
@@ -59,25 +93,42 @@ async def update_billing(billing_id: str, billing_update: BillingUpdate):
         if result is None:
             raise NotFoundException(f"Billing record not found for id {billing_id}")
         await session.commit()
+
+        await invalidate_tags(make_tag("billing", result.billing_id))
+        await user_aggregate_cache.bump_version(result.patient_id)
+
         return Billing.from_orm(result)
 
 
 async def delete_billing(billing_id: str):
     async with async_session() as session:
-        stmt = delete(BillingDB).where(BillingDB.billing_id == billing_id)
-        result = await session.execute(stmt)
-        return result.rowcount > 0
+        stmt = delete(BillingDB).where(BillingDB.billing_id == billing_id).returning(BillingDB.patient_id)
+        patient_id = (await session.execute(stmt)).scalar_one_or_none()
+        await session.commit()
 
+        await invalidate_tags(make_tag("billing", billing_id))
+        await user_aggregate_cache.bump_version(patient_id)
 
-async def get_billings(user_id: str):
-    async with async_session() as session:
-        stmt = (
-            select(BillingDB)
-            .where(BillingDB.patient_id == user_id)
-            .options(
-                joinedload(BillingDB.doctor),
-            )
+        return patient_id is not None
+
+
+async def get_billings(user_id: str, limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    async with read_session() as session:
+        stmt = paginate(
+            BILLINGS.select(BillingDB.date_created).where(BillingDB.patient_id == user_id),
+            BillingDB.date_created,
+            BillingDB.billing_id,
+            limit=limit,
+            cursor=cursor,
         )
-        result = (await session.execute(stmt)).unique().scalars().all()
+        result = (await session.execute(stmt)).all()
+        result, next_cursor = next_page(result, BillingDB.date_created, BillingDB.billing_id, limit=limit)
+
+        return BillingsWithDoctorList(billings=BILLINGS.build(result), next_cursor=next_cursor)
+
+
+async def get_billings_version(user_id: str) -> Version:
+    async with read_session() as session:
+        stmt = BILLINGS.select_version().where(BillingDB.patient_id == user_id)
 
-        return [BillingWithDoctor.model_validate(x) for x in result]
+        return Version.from_row((await session.execute(stmt)).one())
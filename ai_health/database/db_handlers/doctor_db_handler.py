@@ -1,14 +1,35 @@
 import logging
+from typing import Optional
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import insert, select, update, delete
+from sqlalchemy import insert, select, union, update, delete
+from ai_health.database.orms.billing_orm import Billing as BillingDB
 from ai_health.database.orms.doctor_orm import Doctor as DoctorDB
+from ai_health.database.orms.medication_n_dosage_orm import Appointment as AppointmentDB, Medication as MedicationDB
+from ai_health.database.orms.visits_orm import Visit as VisitDB
 from ai_health.schemas.doctor_schema import DoctorCreate, DoctorUpdate, Doctor, DoctorList
 from ai_health.root.database import async_session
+from ai_health.database.cache import cached, invalidate_tags, make_tag
+from ai_health.database.pagination import DEFAULT_LIMIT, next_page, paginate
+from ai_health.database.projection import Projection
+from ai_health.database.versions import Version, select_version
 from ai_health.services.utils.exceptions import NotFoundException, RecordExistsException, ServiceException
+from ai_health.services.utils import user_aggregate_cache
 
 LOGGER = logging.getLogger(__name__)
 
+DOCTORS = Projection(DoctorDB, Doctor)
+
+# The records that embed their doctor in the patient's /auth/me aggregate
+DOCTOR_RECORDS = (AppointmentDB, BillingDB, MedicationDB, VisitDB)
+
+
+def _select_patient_ids(doctor_id: str):
+    """
+    The patients with a record of the doctor, their aggregates change with the doctor
+    """
+    return union(*(select(orm.patient_id).where(orm.doctor_id == doctor_id) for orm in DOCTOR_RECORDS))
+
 
 async def create_doctor(doctor_create: DoctorCreate):
     async with async_session() as session:
@@ -33,18 +54,50 @@ async def create_doctor(doctor_create: DoctorCreate):
             raise ServiceException(message=f"Couldn't create record for doctor {doctor_create.email}")
 
         await session.commit()
+
+        await invalidate_tags("doctors")
+
         return Doctor.model_validate(result)
 
 
-async def get_doctor_by_id(doctor_id: str):
+@cached(tuple[Doctor, Version], tags=["doctor:{doctor_id}"])
+async def _get_versioned_doctor(doctor_id: str) -> tuple[Doctor, Version]:
+    """
+    The doctor with the version it was read at. They are cached together, so the ETag a conditional GET
+    sends is the one of the body it would send.
+
+    The version is read first, a write committed in between only makes the body newer than its version,
+    and the write invalidates the entry.
+    """
     async with async_session() as session:
+        stmt = select_version(DoctorDB).filter(DoctorDB.doctor_id == doctor_id)
+        version = Version.from_row((await session.execute(statement=stmt)).one())
+
         stmt = select(DoctorDB).filter(DoctorDB.doctor_id == doctor_id)
         result = (await session.execute(statement=stmt)).scalar_one_or_none()
 
         if result is None:
             raise NotFoundException(f"Doctor not found for id {doctor_id}")
 
-        return Doctor.model_validate(result)
+        return Doctor.model_validate(result), version
+
+
+async def get_doctor_by_id(doctor_id: str) -> Doctor:
+    doctor, _ = await _get_versioned_doctor(doctor_id=doctor_id)
+
+    return doctor
+
+
+async def get_doctor_version(doctor_id: str) -> Optional[Version]:
+    """
+    The version get_doctor_by_id returns the doctor at, None when there is no such doctor
+    """
+    try:
+        _, version = await _get_versioned_doctor(doctor_id=doctor_id)
+    except NotFoundException:
+        return None
+
+    return version
 
 
 async def update_doctor(doctor_id: str, doctor_update: DoctorUpdate):
@@ -61,19 +114,64 @@ async def update_doctor(doctor_id: str, doctor_update: DoctorUpdate):
         if result is None:
             raise NotFoundException(f"Doctor not found for id {doctor_id}")
 
+        patient_ids = (await session.execute(statement=_select_patient_ids(doctor_id))).scalars().all()
+
         await session.commit()
+
+        await invalidate_tags(make_tag("doctor", result.doctor_id), "doctors")
+        await user_aggregate_cache.bump_version(*patient_ids)
+
         return Doctor.model_validate(result)
 
 
 async def delete_doctor(doctor_id: str):
     async with async_session() as session:
+        # Read before the delete, it cascades to the records
+        patient_ids = (await session.execute(statement=_select_patient_ids(doctor_id))).scalars().all()
+
         stmt = delete(DoctorDB).where(DoctorDB.doctor_id == doctor_id)
         result = await session.execute(statement=stmt)
+        await session.commit()
+
+        await invalidate_tags(make_tag("doctor", doctor_id), "doctors")
+        await user_aggregate_cache.bump_version(*patient_ids)
+
         return result.rowcount > 0
 
 
-async def get_all_doctors():
+@cached(tuple[DoctorList, Version], tags=["doctors"])
+async def _get_versioned_doctors(
+    limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None
+) -> tuple[DoctorList, Version]:
+    """
+    A page of doctors with the version of the table it was read at, like _get_versioned_doctor
+    """
     async with async_session() as session:
-        stmt = select(DoctorDB)
-        result = (await session.execute(statement=stmt)).scalars().all()
-        return [Doctor.model_validate(doctor) for doctor in result]
+        version = Version.from_row((await session.execute(statement=DOCTORS.select_version())).one())
+
+        stmt = paginate(
+            DOCTORS.select(DoctorDB.date_created),
+            DoctorDB.date_created,
+            DoctorDB.doctor_id,
+            limit=limit,
+            cursor=cursor,
+        )
+        result = (await session.execute(statement=stmt)).all()
+        result, next_cursor = next_page(result, DoctorDB.date_created, DoctorDB.doctor_id, limit=limit)
+
+        return DoctorList(doctors=DOCTORS.build(result), next_cursor=next_cursor), version
+
+
+async def get_all_doctors(limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None) -> DoctorList:
+    doctors, _ = await _get_versioned_doctors(limit=limit, cursor=cursor)
+
+    return doctors
+
+
+async def get_all_doctors_version(limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None) -> Version:
+    """
+    The version get_all_doctors returns the page at
+    """
+    _, version = await _get_versioned_doctors(limit=limit, cursor=cursor)
+
+    return version
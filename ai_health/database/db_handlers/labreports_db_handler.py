@@ -1,19 +1,84 @@
 import logging
-from sqlalchemy import and_, insert, update, delete, select
+import uuid
+from typing import AsyncIterable, Iterable, Optional
+from sqlalchemy import and_, insert, update, delete, select, text
 from sqlalchemy.exc import IntegrityError
 
 from ai_health.database.orms.medication_n_dosage_orm import LabReport as LabReportDB
 from ai_health.schemas.lab_report_schema import (
     LabReport,
     LabReportCreate,
+    LabReportImportResult,
     LabReportList,
     LabReportUpdate,
 )
-from ai_health.root.database import async_session
+from ai_health.root.database import async_session, engine, read_session
+from ai_health.database.bulk import CHUNK_SIZE as BULK_CHUNK_SIZE, insert_in_chunks
+from ai_health.database.pagination import DEFAULT_LIMIT, next_page, paginate
+from ai_health.database.projection import Projection
+from ai_health.database.versions import Version, select_version
+from ai_health.services.utils import user_aggregate_cache
 from ai_health.services.utils.exceptions import NotFoundException, RecordExistsException, ServiceException
 
 LOGGER = logging.getLogger(__name__)
 
+LAB_REPORTS = Projection(LabReportDB, LabReport)
+
+IMPORT_STAGING_TABLE = "labreports_import"
+
+IMPORT_STAGING_COLUMNS = ("source_row", "report_id", "patient_id", "test_name", "test_date", "result", "notes")
+
+# Dropped with the transaction, so concurrent imports each get their own
+CREATE_IMPORT_STAGING_TABLE = text(
+    f"""
+    CREATE TEMPORARY TABLE {IMPORT_STAGING_TABLE} (
+        source_row integer NOT NULL,
+        report_id uuid NOT NULL,
+        patient_id uuid NOT NULL,
+        test_name varchar NOT NULL,
+        test_date timestamptz NOT NULL,
+        result varchar NOT NULL,
+        notes varchar NOT NULL
+    ) ON COMMIT DROP
+    """
+)
+
+# The first :limit of them, each with the total count
+UNKNOWN_PATIENT_ROWS = text(
+    f"""
+    SELECT s.source_row, count(*) OVER () AS total
+    FROM {IMPORT_STAGING_TABLE} s
+    WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.user_id = s.patient_id)
+    ORDER BY s.source_row
+    LIMIT :limit
+    """
+)
+
+IMPORTED_PATIENT_IDS = text(
+    f"""
+    SELECT DISTINCT s.patient_id
+    FROM {IMPORT_STAGING_TABLE} s
+    JOIN users u ON u.user_id = s.patient_id
+    """
+)
+
+# A report counts as the same when the patient, the test and its date match, so re-sending a batch is harmless
+MERGE_IMPORT_STAGING_TABLE = text(
+    f"""
+    INSERT INTO labreports (report_id, patient_id, test_name, test_date, result, notes)
+    SELECT DISTINCT ON (s.patient_id, s.test_name, s.test_date)
+        s.report_id, s.patient_id, s.test_name, s.test_date, s.result, s.notes
+    FROM {IMPORT_STAGING_TABLE} s
+    JOIN users u ON u.user_id = s.patient_id
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM labreports l
+        WHERE l.patient_id = s.patient_id AND l.test_date = s.test_date AND l.test_name = s.test_name
+    )
+    ORDER BY s.patient_id, s.test_name, s.test_date, s.source_row
+    """
+)
+
 
 async def create_lab_report(lab_report: LabReportCreate):
     async with async_session() as session:
@@ -38,11 +103,43 @@ async def create_lab_report(lab_report: LabReportCreate):
             raise ServiceException(message=f"Couldn't create record")
 
         await session.commit()
+        await user_aggregate_cache.bump_version(result.patient_id)
+
         return LabReport.model_validate(result)
 
 
-async def get_lab_report(report_id: int):
+async def create_lab_reports(
+    lab_reports: AsyncIterable[LabReportCreate], chunk_size: int = BULK_CHUNK_SIZE
+) -> list[LabReport]:
+    """
+    Inserts every item in one transaction, either all of them are created or none
+    """
     async with async_session() as session:
+        try:
+            created = await insert_in_chunks(
+                session, LabReportDB, LabReportDB.report_id, lab_reports, LabReport, chunk_size=chunk_size
+            )
+        except IntegrityError as e:
+            LOGGER.error(f"Bulk insert of lab_reports violated a constraint")
+            await session.rollback()
+            raise RecordExistsException(message=f"{e.detail}")
+        except ServiceException:
+            await session.rollback()
+            raise
+        except Exception as e:
+            LOGGER.exception(e)
+            LOGGER.error("An unknown error occurred")
+            await session.rollback()
+            raise ServiceException(message="An unknown error occurred")
+
+        await session.commit()
+        await user_aggregate_cache.bump_version(*{x.patient_id for x in created})
+
+        return created
+
+
+async def get_lab_report(report_id: int):
+    async with read_session() as session:
         stmt = select(LabReportDB).filter(LabReportDB.report_id == report_id)
 
         result = (await session.execute(statement=stmt)).scalar_one_or_none()
@@ -53,34 +150,65 @@ async def get_lab_report(report_id: int):
         return LabReport.model_validate(result)
 
 
-async def get_lab_reports(**kwargs):
-    async with async_session() as session:
-        patient_id = kwargs.get("patient_id", None)
+async def get_lab_report_version(report_id: str) -> Optional[Version]:
+    """
+    None when there is no such record
+    """
+    async with read_session() as session:
+        stmt = select_version(LabReportDB).filter(LabReportDB.report_id == report_id)
+        version = Version.from_row((await session.execute(statement=stmt)).one())
+
+        return version if version.count else None
+
+
+def _filter_conditions(patient_id=None, **kwargs) -> list:
+    filter_conditions = []
+    if patient_id:
+        filter_conditions.append(LabReportDB.patient_id == patient_id)
+
+    return filter_conditions
+
 
-        filter_conditions = []
-        if patient_id:
-            filter_conditions.append(LabReportDB.patient_id == patient_id)
+async def get_lab_reports(limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None, **kwargs):
+    async with read_session() as session:
+        stmt = paginate(
+            LAB_REPORTS.select().filter(and_(*_filter_conditions(**kwargs))),
+            LabReportDB.test_date,
+            LabReportDB.report_id,
+            limit=limit,
+            cursor=cursor,
+        )
 
-        stmt = select(LabReportDB).filter(and_(*filter_conditions)).order_by(LabReportDB.test_date.desc())
+        result = (await session.execute(statement=stmt)).all()
+        result, next_cursor = next_page(result, LabReportDB.test_date, LabReportDB.report_id, limit=limit)
 
-        result = (await session.execute(statement=stmt)).unique().scalars().all()
+        return LabReportList(
+            detail="Lab reports retrieved", lab_reports=LAB_REPORTS.build(result), next_cursor=next_cursor
+        )
 
-        result_set = []
 
-        for x in result:
-            result_set.append(LabReport.model_validate(x))
+async def get_lab_reports_version(**kwargs) -> Version:
+    """
+    Of every record matching the filters, not only of the first page
+    """
+    async with read_session() as session:
+        stmt = LAB_REPORTS.select_version().filter(and_(*_filter_conditions(**kwargs)))
 
-        return LabReportList(detail="Lab reports retrieved", lab_reports=result_set)
+        return Version.from_row((await session.execute(statement=stmt)).one())
 
 
 async def update_lab_report(report_id: int, lab_report_update: LabReportUpdate):
     async with async_session() as session:
-        stmt = (
-            update(LabReportDB)
-            .where(LabReportDB.report_id == report_id)
-            .values(lab_report_update.model_dump(exclude_none=True, exclude_unset=True))
-            .returning(LabReportDB)
-        )
+        values = lab_report_update.model_dump(exclude_none=True, exclude_unset=True)
+
+        previous_patient_id = None
+        if "patient_id" in values:
+            # The record moves to another patient, both aggregates change
+            previous_patient_id = (
+                await session.execute(select(LabReportDB.patient_id).where(LabReportDB.report_id == report_id))
+            ).scalar_one_or_none()
+
+        stmt = update(LabReportDB).where(LabReportDB.report_id == report_id).values(values).returning(LabReportDB)
 
         result = (await session.execute(statement=stmt)).scalar_one_or_none()
 
@@ -88,12 +216,69 @@ async def update_lab_report(report_id: int, lab_report_update: LabReportUpdate):
             raise ServiceException(f"Lab report could not be updated for report_id {report_id}")
 
         await session.commit()
+        await user_aggregate_cache.bump_version(result.patient_id, previous_patient_id)
+
         return LabReport.model_validate(result)
 
 
 async def delete_lab_report(report_id: int):
     async with async_session() as session:
-        stmt = delete(LabReportDB).where(LabReportDB.report_id == report_id)
+        stmt = delete(LabReportDB).where(LabReportDB.report_id == report_id).returning(LabReportDB.patient_id)
+
+        patient_id = (await session.execute(statement=stmt)).scalar_one_or_none()
+        await session.commit()
+
+        await user_aggregate_cache.bump_version(patient_id)
+
+        return patient_id is not None
+
+
+async def import_lab_reports(
+    chunks: Iterable[list[tuple[int, LabReportCreate]]], max_unknown_patient_rows: int
+) -> tuple[LabReportImportResult, list[int]]:
+    """
+    COPYs the (row, lab report) chunks into a staging table, then merges it into labreports in one transaction.
+
+    Returns the counts and the first rows skipped because their patient_id matches no user.
+    """
+    async with engine.connect() as connection:
+        # The merge of a large file can outlast the API's statement timeout, the job timeout bounds it instead
+        await connection.execute(text("SET LOCAL statement_timeout = 0"))
+        await connection.execute(CREATE_IMPORT_STAGING_TABLE)
+
+        copy_connection = (await connection.get_raw_connection()).driver_connection
+
+        staged = 0
+        for chunk in chunks:
+            records = [
+                (
+                    row,
+                    uuid.uuid4(),
+                    lab_report.patient_id,
+                    lab_report.test_name,
+                    lab_report.test_date,
+                    lab_report.result,
+                    lab_report.notes,
+                )
+                for row, lab_report in chunk
+            ]
+            await copy_connection.copy_records_to_table(
+                IMPORT_STAGING_TABLE, records=records, columns=IMPORT_STAGING_COLUMNS
+            )
+            staged += len(records)
+
+        unknown = (await connection.execute(UNKNOWN_PATIENT_ROWS, {"limit": max_unknown_patient_rows})).all()
+        unknown_patients = unknown[0].total if unknown else 0
+
+        patient_ids = (await connection.execute(IMPORTED_PATIENT_IDS)).scalars().all()
+        imported = (await connection.execute(MERGE_IMPORT_STAGING_TABLE)).rowcount
+
+        await connection.commit()
+
+    await user_aggregate_cache.bump_version(*patient_ids)
+
+    result = LabReportImportResult(
+        imported=imported, duplicates=staged - imported - unknown_patients, unknown_patients=unknown_patients
+    )
 
-        result = await session.execute(statement=stmt)
-        return result is not None
+    return result, [row.source_row for row in unknown]
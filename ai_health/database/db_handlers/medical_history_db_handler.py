@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 from sqlalchemy import and_, insert, update, delete, select
 from sqlalchemy.exc import IntegrityError
 
@@ -9,11 +10,17 @@ from ai_health.schemas.medical_history_schema import (
     MedicalHistoryList,
     MedicalHistoryUpdate,
 )
-from ai_health.root.database import async_session
+from ai_health.root.database import async_session, read_session
+from ai_health.database.pagination import DEFAULT_LIMIT, next_page, paginate
+from ai_health.database.projection import Projection
+from ai_health.database.versions import Version, select_version
+from ai_health.services.utils import user_aggregate_cache
 from ai_health.services.utils.exceptions import NotFoundException, RecordExistsException, ServiceException
 
 LOGGER = logging.getLogger(__name__)
 
+MEDICAL_HISTORIES = Projection(MedicalHistoryDB, MedicalHistory)
+
 
 async def create_medical_history(medical_history: MedicalHistoryCreate):
     async with async_session() as session:
@@ -38,11 +45,13 @@ async def create_medical_history(medical_history: MedicalHistoryCreate):
             raise ServiceException(message=f"Couldn't create record for history")
 
         await session.commit()
+        await user_aggregate_cache.bump_version(result.patient_id)
+
         return MedicalHistory.model_validate(result)
 
 
 async def get_medical_history(history_id: int):
-    async with async_session() as session:
+    async with read_session() as session:
         stmt = select(MedicalHistoryDB).filter(MedicalHistoryDB.history_id == history_id)
 
         result = (await session.execute(statement=stmt)).scalar_one_or_none()
@@ -53,34 +62,76 @@ async def get_medical_history(history_id: int):
         return MedicalHistory.model_validate(result)
 
 
-async def get_medical_histories(**kwargs):
-    async with async_session() as session:
-        patient_id = kwargs.get("patient_id", None)
+async def get_medical_history_version(history_id: str) -> Optional[Version]:
+    """
+    None when there is no such record
+    """
+    async with read_session() as session:
+        stmt = select_version(MedicalHistoryDB).filter(MedicalHistoryDB.history_id == history_id)
+        version = Version.from_row((await session.execute(statement=stmt)).one())
 
-        filter_conditions = []
-        if patient_id:
-            filter_conditions.append(MedicalHistoryDB.patient_id == patient_id)
+        return version if version.count else None
 
-        stmt = (
-            select(MedicalHistoryDB).filter(and_(*filter_conditions)).order_by(MedicalHistoryDB.diagnosis_date.desc())
+
+def _filter_conditions(patient_id=None, **kwargs) -> list:
+    filter_conditions = []
+    if patient_id:
+        filter_conditions.append(MedicalHistoryDB.patient_id == patient_id)
+
+    return filter_conditions
+
+
+async def get_medical_histories(
+    limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None, **kwargs
+):
+    async with read_session() as session:
+        stmt = paginate(
+            MEDICAL_HISTORIES.select().filter(and_(*_filter_conditions(**kwargs))),
+            MedicalHistoryDB.diagnosis_date,
+            MedicalHistoryDB.history_id,
+            limit=limit,
+            cursor=cursor,
         )
 
-        result = (await session.execute(statement=stmt)).unique().scalars().all()
+        result = (await session.execute(statement=stmt)).all()
+        result, next_cursor = next_page(
+            result, MedicalHistoryDB.diagnosis_date, MedicalHistoryDB.history_id, limit=limit
+        )
 
-        result_set = []
+        return MedicalHistoryList(
+            detail="Medical histories retrieved",
+            medical_histories=MEDICAL_HISTORIES.build(result),
+            next_cursor=next_cursor,
+        )
 
-        for x in result:
-            result_set.append(MedicalHistory.model_validate(x))
 
-        return MedicalHistoryList(detail="Medical histories retrieved", medical_histories=result_set)
+async def get_medical_histories_version(**kwargs) -> Version:
+    """
+    Of every record matching the filters, not only of the first page
+    """
+    async with read_session() as session:
+        stmt = MEDICAL_HISTORIES.select_version().filter(and_(*_filter_conditions(**kwargs)))
+
+        return Version.from_row((await session.execute(statement=stmt)).one())
 
 
 async def update_medical_history(history_id: int, medical_history_update: MedicalHistoryUpdate):
     async with async_session() as session:
+        values = medical_history_update.model_dump(exclude_none=True, exclude_unset=True)
+
+        previous_patient_id = None
+        if "patient_id" in values:
+            # The record moves to another patient, both aggregates change
+            previous_patient_id = (
+                await session.execute(
+                    select(MedicalHistoryDB.patient_id).where(MedicalHistoryDB.history_id == history_id)
+                )
+            ).scalar_one_or_none()
+
         stmt = (
             update(MedicalHistoryDB)
             .where(MedicalHistoryDB.history_id == history_id)
-            .values(medical_history_update.model_dump(exclude_none=True, exclude_unset=True))
+            .values(values)
             .returning(MedicalHistoryDB)
         )
 
@@ -90,12 +141,22 @@ async def update_medical_history(history_id: int, medical_history_update: Medica
             raise ServiceException(f"Medical history could not be updated for history_id {history_id}")
 
         await session.commit()
+        await user_aggregate_cache.bump_version(result.patient_id, previous_patient_id)
+
         return MedicalHistory.model_validate(result)
 
 
 async def delete_medical_history(history_id: int):
     async with async_session() as session:
-        stmt = delete(MedicalHistoryDB).where(MedicalHistoryDB.history_id == history_id)
+        stmt = (
+            delete(MedicalHistoryDB)
+            .where(MedicalHistoryDB.history_id == history_id)
+            .returning(MedicalHistoryDB.patient_id)
+        )
+
+        patient_id = (await session.execute(statement=stmt)).scalar_one_or_none()
+        await session.commit()
+
+        await user_aggregate_cache.bump_version(patient_id)
 
-        result = await session.execute(statement=stmt)
-        return result is not None
+        return patient_id is not None
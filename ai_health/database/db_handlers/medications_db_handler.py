@@ -1,4 +1,5 @@
 import logging
+from typing import AsyncIterable, Optional
 from sqlalchemy import and_, insert, update, delete, select
 from sqlalchemy.exc import IntegrityError
 
@@ -9,11 +10,18 @@ from ai_health.schemas.medication_schema import (
     MedicationList,
     MedicationUpdate,
 )
-from ai_health.root.database import async_session
+from ai_health.root.database import async_session, read_session
+from ai_health.database.bulk import CHUNK_SIZE as BULK_CHUNK_SIZE, insert_in_chunks
+from ai_health.database.pagination import DEFAULT_LIMIT, next_page, paginate
+from ai_health.database.projection import Projection
+from ai_health.database.versions import Version, select_version
+from ai_health.services.utils import user_aggregate_cache
 from ai_health.services.utils.exceptions import NotFoundException, RecordExistsException, ServiceException
 
 LOGGER = logging.getLogger(__name__)
 
+MEDICATIONS = Projection(MedicationDB, Medication)
+
 
 async def create_medication(medication: MedicationCreate):
     async with async_session() as session:
@@ -38,11 +46,43 @@ async def create_medication(medication: MedicationCreate):
             raise ServiceException(message=f"Couldn't create record")
 
         await session.commit()
+        await user_aggregate_cache.bump_version(result.patient_id)
+
         return Medication.model_validate(result)
 
 
-async def get_medication(medication_id: int):
+async def create_medications(
+    medications: AsyncIterable[MedicationCreate], chunk_size: int = BULK_CHUNK_SIZE
+) -> list[Medication]:
+    """
+    Inserts every item in one transaction, either all of them are created or none
+    """
     async with async_session() as session:
+        try:
+            created = await insert_in_chunks(
+                session, MedicationDB, MedicationDB.medication_id, medications, Medication, chunk_size=chunk_size
+            )
+        except IntegrityError as e:
+            LOGGER.error(f"Bulk insert of medications violated a constraint")
+            await session.rollback()
+            raise RecordExistsException(message=f"{e.detail}")
+        except ServiceException:
+            await session.rollback()
+            raise
+        except Exception as e:
+            LOGGER.exception(e)
+            LOGGER.error("An unknown error occurred")
+            await session.rollback()
+            raise ServiceException(message="An unknown error occurred")
+
+        await session.commit()
+        await user_aggregate_cache.bump_version(*{x.patient_id for x in created})
+
+        return created
+
+
+async def get_medication(medication_id: int):
+    async with read_session() as session:
         stmt = select(MedicationDB).filter(MedicationDB.medication_id == medication_id)
 
         result = (await session.execute(statement=stmt)).scalar_one_or_none()
@@ -53,35 +93,72 @@ async def get_medication(medication_id: int):
         return Medication.model_validate(result)
 
 
-async def get_medications(**kwargs):
-    async with async_session() as session:
-        patient_id = kwargs.get("patient_id", None)
-        doctor_id = kwargs.get("doctor_id", None)
+async def get_medication_version(medication_id: str) -> Optional[Version]:
+    """
+    None when there is no such record
+    """
+    async with read_session() as session:
+        stmt = select_version(MedicationDB).filter(MedicationDB.medication_id == medication_id)
+        version = Version.from_row((await session.execute(statement=stmt)).one())
+
+        return version if version.count else None
+
+
+def _filter_conditions(patient_id=None, doctor_id=None, **kwargs) -> list:
+    filter_conditions = []
+    if patient_id:
+        filter_conditions.append(MedicationDB.patient_id == patient_id)
+    if doctor_id:
+        filter_conditions.append(MedicationDB.doctor_id == doctor_id)
 
-        filter_conditions = []
-        if patient_id:
-            filter_conditions.append(MedicationDB.patient_id == patient_id)
-        if doctor_id:
-            filter_conditions.append(MedicationDB.doctor_id == doctor_id)
+    return filter_conditions
 
-        stmt = select(MedicationDB).filter(and_(*filter_conditions)).order_by(MedicationDB.start_date.desc())
 
-        result = (await session.execute(statement=stmt)).unique().scalars().all()
+async def get_medications(limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None, **kwargs):
+    async with read_session() as session:
+        stmt = paginate(
+            MEDICATIONS.select().filter(and_(*_filter_conditions(**kwargs))),
+            MedicationDB.start_date,
+            MedicationDB.medication_id,
+            limit=limit,
+            cursor=cursor,
+        )
+
+        result = (await session.execute(statement=stmt)).all()
+        result, next_cursor = next_page(result, MedicationDB.start_date, MedicationDB.medication_id, limit=limit)
+
+        return MedicationList(
+            detail="Medications retrieved", medications=MEDICATIONS.build(result), next_cursor=next_cursor
+        )
 
-        result_set = []
 
-        for x in result:
-            result_set.append(Medication.model_validate(x))
+async def get_medications_version(**kwargs) -> Version:
+    """
+    Of every record matching the filters, not only of the first page
+    """
+    async with read_session() as session:
+        stmt = MEDICATIONS.select_version().filter(and_(*_filter_conditions(**kwargs)))
 
-        return MedicationList(detail="Medications retrieved", medications=result_set)
+        return Version.from_row((await session.execute(statement=stmt)).one())
 
 
 async def update_medication(medication_id: int, medication_update: MedicationUpdate):
     async with async_session() as session:
+        values = medication_update.model_dump(exclude_none=True, exclude_unset=True)
+
+        previous_patient_id = None
+        if "patient_id" in values:
+            # The record moves to another patient, both aggregates change
+            previous_patient_id = (
+                await session.execute(
+                    select(MedicationDB.patient_id).where(MedicationDB.medication_id == medication_id)
+                )
+            ).scalar_one_or_none()
+
         stmt = (
             update(MedicationDB)
             .where(MedicationDB.medication_id == medication_id)
-            .values(medication_update.model_dump(exclude_none=True, exclude_unset=True))
+            .values(values)
             .returning(MedicationDB)
         )
 
@@ -91,12 +168,22 @@ async def update_medication(medication_id: int, medication_update: MedicationUpd
             raise ServiceException(f"Medication could not be updated for medication_id {medication_id}")
 
         await session.commit()
+        await user_aggregate_cache.bump_version(result.patient_id, previous_patient_id)
+
         return Medication.model_validate(result)
 
 
 async def delete_medication(medication_id: int):
     async with async_session() as session:
-        stmt = delete(MedicationDB).where(MedicationDB.medication_id == medication_id)
+        stmt = (
+            delete(MedicationDB)
+            .where(MedicationDB.medication_id == medication_id)
+            .returning(MedicationDB.patient_id)
+        )
+
+        patient_id = (await session.execute(statement=stmt)).scalar_one_or_none()
+        await session.commit()
+
+        await user_aggregate_cache.bump_version(patient_id)
 
-        result = await session.execute(statement=stmt)
-        return result is not None
+        return patient_id is not None
@@ -1,4 +1,5 @@
 import logging
+from typing import AsyncIterable, Optional
 from sqlalchemy import and_, insert, update, delete, select
 from sqlalchemy.exc import IntegrityError
 
@@ -9,11 +10,18 @@ from ai_health.schemas.visits_schema import (
     VisitList,
     VisitUpdate,
 )
-from ai_health.root.database import async_session
+from ai_health.root.database import async_session, read_session
+from ai_health.database.bulk import CHUNK_SIZE as BULK_CHUNK_SIZE, insert_in_chunks
+from ai_health.database.pagination import DEFAULT_LIMIT, next_page, paginate
+from ai_health.database.projection import Projection
+from ai_health.database.versions import Version, select_version
+from ai_health.services.utils import user_aggregate_cache
 from ai_health.services.utils.exceptions import NotFoundException, RecordExistsException, ServiceException
 
 LOGGER = logging.getLogger(__name__)
 
+VISITS = Projection(VisitDB, Visit)
+
 
 async def create_visit(visit: VisitCreate):
     async with async_session() as session:
@@ -38,11 +46,39 @@ async def create_visit(visit: VisitCreate):
             raise ServiceException(message=f"Couldn't create record for visit")
 
         await session.commit()
+        await user_aggregate_cache.bump_version(result.patient_id)
+
         return Visit.model_validate(result)
 
 
-async def get_visit(visit_id: int):
+async def create_visits(visits: AsyncIterable[VisitCreate], chunk_size: int = BULK_CHUNK_SIZE) -> list[Visit]:
+    """
+    Inserts every item in one transaction, either all of them are created or none
+    """
     async with async_session() as session:
+        try:
+            created = await insert_in_chunks(session, VisitDB, VisitDB.visit_id, visits, Visit, chunk_size=chunk_size)
+        except IntegrityError as e:
+            LOGGER.error(f"Bulk insert of visits violated a constraint")
+            await session.rollback()
+            raise RecordExistsException(message=f"{e.detail}")
+        except ServiceException:
+            await session.rollback()
+            raise
+        except Exception as e:
+            LOGGER.exception(e)
+            LOGGER.error("An unknown error occurred")
+            await session.rollback()
+            raise ServiceException(message="An unknown error occurred")
+
+        await session.commit()
+        await user_aggregate_cache.bump_version(*{x.patient_id for x in created})
+
+        return created
+
+
+async def get_visit(visit_id: int):
+    async with read_session() as session:
         stmt = select(VisitDB).filter(VisitDB.visit_id == visit_id)
 
         result = (await session.execute(statement=stmt)).scalar_one_or_none()
@@ -53,37 +89,65 @@ async def get_visit(visit_id: int):
         return Visit.model_validate(result)
 
 
-async def get_visits(**kwargs):
-    async with async_session() as session:
-        patient_id = kwargs.get("patient_id", None)
-        doctor_id = kwargs.get("doctor_id", None)
+async def get_visit_version(visit_id: str) -> Optional[Version]:
+    """
+    None when there is no such record
+    """
+    async with read_session() as session:
+        stmt = select_version(VisitDB).filter(VisitDB.visit_id == visit_id)
+        version = Version.from_row((await session.execute(statement=stmt)).one())
+
+        return version if version.count else None
+
+
+def _filter_conditions(patient_id=None, doctor_id=None, **kwargs) -> list:
+    filter_conditions = []
+    if patient_id:
+        filter_conditions.append(VisitDB.patient_id == patient_id)
+    if doctor_id:
+        filter_conditions.append(VisitDB.doctor_id == doctor_id)
+
+    return filter_conditions
+
 
-        filter_conditions = []
-        if patient_id:
-            filter_conditions.append(VisitDB.patient_id == patient_id)
-        if doctor_id:
-            filter_conditions.append(VisitDB.doctor_id == doctor_id)
+async def get_visits(limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None, **kwargs):
+    async with read_session() as session:
+        stmt = paginate(
+            VISITS.select().filter(and_(*_filter_conditions(**kwargs))),
+            VisitDB.visit_date,
+            VisitDB.visit_id,
+            limit=limit,
+            cursor=cursor,
+        )
 
-        stmt = select(VisitDB).filter(and_(*filter_conditions)).order_by(VisitDB.visit_date.desc())
+        result = (await session.execute(statement=stmt)).all()
+        result, next_cursor = next_page(result, VisitDB.visit_date, VisitDB.visit_id, limit=limit)
 
-        result = (await session.execute(statement=stmt)).unique().scalars().all()
+        return VisitList(detail="Visits retrieved", visits=VISITS.build(result), next_cursor=next_cursor)
 
-        result_set = []
 
-        for x in result:
-            result_set.append(Visit.model_validate(x))
+async def get_visits_version(**kwargs) -> Version:
+    """
+    Of every record matching the filters, not only of the first page
+    """
+    async with read_session() as session:
+        stmt = VISITS.select_version().filter(and_(*_filter_conditions(**kwargs)))
 
-        return VisitList(detail="Visits retrieved", visits=result_set)
+        return Version.from_row((await session.execute(statement=stmt)).one())
 
 
 async def update_visit(visit_id: int, visit_update: VisitUpdate):
     async with async_session() as session:
-        stmt = (
-            update(VisitDB)
-            .where(VisitDB.visit_id == visit_id)
-            .values(visit_update.model_dump(exclude_none=True, exclude_unset=True))
-            .returning(VisitDB)
-        )
+        values = visit_update.model_dump(exclude_none=True, exclude_unset=True)
+
+        previous_patient_id = None
+        if "patient_id" in values:
+            # The record moves to another patient, both aggregates change
+            previous_patient_id = (
+                await session.execute(select(VisitDB.patient_id).where(VisitDB.visit_id == visit_id))
+            ).scalar_one_or_none()
+
+        stmt = update(VisitDB).where(VisitDB.visit_id == visit_id).values(values).returning(VisitDB)
 
         result = (await session.execute(statement=stmt)).scalar_one_or_none()
 
@@ -91,12 +155,18 @@ async def update_visit(visit_id: int, visit_update: VisitUpdate):
             raise ServiceException(f"Visit could not be updated for visit_id {visit_id}")
 
         await session.commit()
+        await user_aggregate_cache.bump_version(result.patient_id, previous_patient_id)
+
         return Visit.model_validate(result)
 
 
 async def delete_visit(visit_id: int):
     async with async_session() as session:
-        stmt = delete(VisitDB).where(VisitDB.visit_id == visit_id)
+        stmt = delete(VisitDB).where(VisitDB.visit_id == visit_id).returning(VisitDB.patient_id)
+
+        patient_id = (await session.execute(statement=stmt)).scalar_one_or_none()
+        await session.commit()
+
+        await user_aggregate_cache.bump_version(patient_id)
 
-        result = await session.execute(statement=stmt)
-        return result is not None
+        return patient_id is not None
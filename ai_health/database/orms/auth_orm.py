@@ -19,7 +19,7 @@ class User(AbstractBase):
 
     __tablename__ = "users"
 
-    user_id = Column(UUID(as_uuid=True), primary_key=True, unique=True, nullable=False, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), primary_key=True, nullable=False, default=uuid.uuid4)
     first_name: Mapped[str]
     last_name: Mapped[str]
     email: Mapped[str] = mapped_column(unique=True)
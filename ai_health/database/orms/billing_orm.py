@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Enum, Float, ForeignKey
+from sqlalchemy import Column, String, Enum, Float, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from ai_health.root.utils.abstract_base import AbstractBase
@@ -8,7 +8,7 @@ from ai_health.root.utils.abstract_base import AbstractBase
 class Billing(AbstractBase):
     __tablename__ = "billings"
 
-    billing_id = Column(UUID(as_uuid=True), primary_key=True, unique=True, nullable=False, default=uuid.uuid4)
+    billing_id = Column(UUID(as_uuid=True), primary_key=True, nullable=False, default=uuid.uuid4)
     title: Mapped[str]
     status: Mapped[str]
     amount: Mapped[float]
@@ -18,3 +18,12 @@ class Billing(AbstractBase):
 
     doctor_id = mapped_column(ForeignKey("doctors.doctor_id", ondelete="CASCADE"), nullable=False)
     doctor = relationship("Doctor", back_populates="billings", uselist=False)
+
+
+Index(
+    "ix_billings_patient_id_date_created",
+    Billing.patient_id,
+    Billing.date_created.desc(),
+    Billing.billing_id.desc(),
+)
+Index("ix_billings_doctor_id", Billing.doctor_id)
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional
 import uuid
 
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -11,7 +11,7 @@ from ai_health.root.utils.abstract_base import AbstractBase
 
 class Doctor(AbstractBase):
     __tablename__ = "doctors"
-    doctor_id = Column(UUID(as_uuid=True), primary_key=True, unique=True, nullable=False, default=uuid.uuid4)
+    doctor_id = Column(UUID(as_uuid=True), primary_key=True, nullable=False, default=uuid.uuid4)
     first_name: Mapped[str]
     last_name: Mapped[str]
     specialty: Mapped[str]
@@ -22,3 +22,6 @@ class Doctor(AbstractBase):
     medications = relationship("Medication", back_populates="doctor")
     appointments = relationship("Appointment", back_populates="doctor")
     billings = relationship("Billing", back_populates="doctor")
+
+
+Index("ix_doctors_date_created", Doctor.date_created.desc(), Doctor.doctor_id.desc())
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey
+from sqlalchemy import Column, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -12,7 +12,7 @@ from ai_health.root.utils.abstract_base import AbstractBase
 
 class Medication(AbstractBase):
     __tablename__ = "medications"
-    medication_id = Column(UUID(as_uuid=True), primary_key=True, unique=True, nullable=False, default=uuid.uuid4)
+    medication_id = Column(UUID(as_uuid=True), primary_key=True, nullable=False, default=uuid.uuid4)
     medication_name: Mapped[str]
     dosage: Mapped[str]
     start_date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -27,7 +27,7 @@ class Medication(AbstractBase):
 
 class Appointment(AbstractBase):
     __tablename__ = "appointments"
-    appointment_id = Column(UUID(as_uuid=True), primary_key=True, unique=True, nullable=False, default=uuid.uuid4)
+    appointment_id = Column(UUID(as_uuid=True), primary_key=True, nullable=False, default=uuid.uuid4)
 
     appointment_date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     reason_for_appointment: Mapped[str]
@@ -43,7 +43,7 @@ class Appointment(AbstractBase):
 
 class LabReport(AbstractBase):
     __tablename__ = "labreports"
-    report_id = Column(UUID(as_uuid=True), primary_key=True, unique=True, nullable=False, default=uuid.uuid4)
+    report_id = Column(UUID(as_uuid=True), primary_key=True, nullable=False, default=uuid.uuid4)
     test_name: Mapped[str]
     test_date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     result: Mapped[str]
@@ -55,10 +55,56 @@ class LabReport(AbstractBase):
 
 class MedicalHistory(AbstractBase):
     __tablename__ = "medical_history"
-    history_id = Column(UUID(as_uuid=True), primary_key=True, unique=True, nullable=False, default=uuid.uuid4)
+    history_id = Column(UUID(as_uuid=True), primary_key=True, nullable=False, default=uuid.uuid4)
     condition: Mapped[str]
     diagnosis_date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     notes: Mapped[str]
 
     patient_id: Mapped[UUID] = mapped_column(ForeignKey("users.user_id", ondelete="CASCADE"))
     patient = relationship("User", back_populates="medical_history")
+
+
+# Indexes for the list filters and their keyset order
+Index(
+    "ix_medications_patient_id_start_date",
+    Medication.patient_id,
+    Medication.start_date.desc(),
+    Medication.medication_id.desc(),
+)
+Index(
+    "ix_medications_doctor_id_start_date",
+    Medication.doctor_id,
+    Medication.start_date.desc(),
+    Medication.medication_id.desc(),
+)
+Index("ix_medications_start_date", Medication.start_date.desc(), Medication.medication_id.desc())
+
+Index(
+    "ix_appointments_patient_id_appointment_date",
+    Appointment.patient_id,
+    Appointment.appointment_date.desc(),
+    Appointment.appointment_id.desc(),
+)
+Index(
+    "ix_appointments_doctor_id_appointment_date",
+    Appointment.doctor_id,
+    Appointment.appointment_date.desc(),
+    Appointment.appointment_id.desc(),
+)
+Index("ix_appointments_appointment_date", Appointment.appointment_date.desc(), Appointment.appointment_id.desc())
+
+Index(
+    "ix_labreports_patient_id_test_date",
+    LabReport.patient_id,
+    LabReport.test_date.desc(),
+    LabReport.report_id.desc(),
+)
+Index("ix_labreports_test_date", LabReport.test_date.desc(), LabReport.report_id.desc())
+
+Index(
+    "ix_medical_history_patient_id_diagnosis_date",
+    MedicalHistory.patient_id,
+    MedicalHistory.diagnosis_date.desc(),
+    MedicalHistory.history_id.desc(),
+)
+Index("ix_medical_history_diagnosis_date", MedicalHistory.diagnosis_date.desc(), MedicalHistory.history_id.desc())
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey
+from sqlalchemy import Column, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -12,7 +12,7 @@ from ai_health.root.utils.abstract_base import AbstractBase
 
 class Visit(AbstractBase):
     __tablename__ = "visits"
-    visit_id = Column(UUID(as_uuid=True), primary_key=True, unique=True, nullable=False, default=uuid.uuid4)
+    visit_id = Column(UUID(as_uuid=True), primary_key=True, nullable=False, default=uuid.uuid4)
     visit_date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
 
     reason_for_visit: Mapped[str]
@@ -26,3 +26,9 @@ class Visit(AbstractBase):
 
     doctor_id: Mapped[UUID] = mapped_column(ForeignKey("doctors.doctor_id", ondelete="CASCADE"), nullable=False)
     doctor: Mapped["Doctor"] = relationship("Doctor", back_populates="visits")
+
+
+# Indexes for the visit list filters and its keyset order
+Index("ix_visits_patient_id_visit_date", Visit.patient_id, Visit.visit_date.desc(), Visit.visit_id.desc())
+Index("ix_visits_doctor_id_visit_date", Visit.doctor_id, Visit.visit_date.desc(), Visit.visit_id.desc())
+Index("ix_visits_visit_date", Visit.visit_date.desc(), Visit.visit_id.desc())
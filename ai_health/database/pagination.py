@@ -0,0 +1,71 @@
+"""
+Keyset pagination for the list db_handlers.
+
+Rows are ordered newest first on a timestamp column with the primary key as the tie breaker. A page asks
+for one row more than the limit to learn whether another page follows, and the cursor of that next page
+is the sort key of the last row returned. It is an opaque url safe token, clients only pass it back.
+
+    stmt = paginate(select(VisitDB), VisitDB.visit_date, VisitDB.visit_id, limit=limit, cursor=cursor)
+    rows = (await session.execute(statement=stmt)).scalars().all()
+    visits, next_cursor = next_page(rows, VisitDB.visit_date, VisitDB.visit_id, limit=limit)
+"""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Sequence
+from uuid import UUID
+
+import orjson
+from sqlalchemy import Select, literal, tuple_
+
+from ai_health.root.settings import Settings
+from ai_health.services.utils.exceptions import BadRequestException
+
+
+settings = Settings()
+
+DEFAULT_LIMIT = settings.PAGINATION_DEFAULT_LIMIT
+
+
+def encode_cursor(sort_value: datetime, row_id: UUID) -> str:
+    token = orjson.dumps([sort_value.isoformat(), str(row_id)])
+
+    return base64.urlsafe_b64encode(token).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        token = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = orjson.loads(token)
+
+        return datetime.fromisoformat(sort_value), UUID(row_id)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise BadRequestException(message="Invalid pagination cursor")
+
+
+def paginate(stmt: Select, sort_column, id_column, limit: int, cursor: Optional[str] = None) -> Select:
+    """
+    Orders the statement by the keyset and limits it to the page after `cursor`, or the first page
+    """
+    if cursor is not None:
+        sort_value, row_id = decode_cursor(cursor)
+        after_cursor = tuple_(literal(sort_value, sort_column.type), literal(row_id, id_column.type))
+        stmt = stmt.where(tuple_(sort_column, id_column) < after_cursor)
+
+    return stmt.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def next_page(rows: Sequence, sort_column, id_column, limit: int) -> tuple[list, Optional[str]]:
+    """
+    Trims the extra row fetched by `paginate` and returns the page with the cursor of the next one, if any
+    """
+    rows = list(rows)
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last_row = rows[-1]
+
+    return rows, encode_cursor(getattr(last_row, sort_column.key), getattr(last_row, id_column.key))
@@ -0,0 +1,102 @@
+"""
+Column projected reads for the list db_handlers.
+
+Selecting ORM entities hydrates an identity mapped object per row and tracks its state, then model_validate
+copies every attribute into the schema and validates it again, down to the doctor's EmailStr. A Projection
+selects only the columns the schema has, with the ones of its nested models joined in, as Core rows, and
+builds the schemas with model_construct in one loop. The values come from typed columns, they arent
+validated again.
+
+    APPOINTMENTS = Projection(AppointmentDB, AppointmentWithDoctor, doctor=Projection(DoctorDB, Doctor))
+
+    stmt = paginate(APPOINTMENTS.select(), AppointmentDB.appointment_date, AppointmentDB.appointment_id, ...)
+    rows = (await session.execute(statement=stmt)).all()
+    rows, next_cursor = next_page(rows, AppointmentDB.appointment_date, AppointmentDB.appointment_id, ...)
+    appointments = APPOINTMENTS.build(rows)
+"""
+
+from typing import Sequence
+
+from pydantic import BaseModel
+from sqlalchemy import Row, Select, select
+
+from ai_health.database.versions import select_version
+
+
+class Projection:
+    def __init__(self, orm, schema: type[BaseModel], **nested: "Projection") -> None:
+        """
+        `nested` maps a field of the schema holding a model to the projection of the relationship of the
+        same name, it is joined with a LEFT OUTER JOIN. Nested projections cant have their own.
+        """
+        table = orm.__table__
+
+        self.orm = orm
+        self.schema = schema
+        self.nested = nested
+        self.fields = [name for name in schema.model_fields if name in table.c and name not in nested]
+
+        missing = [
+            name
+            for name, field in schema.model_fields.items()
+            if name not in self.fields and name not in nested and field.is_required()
+        ]
+        if missing:
+            raise ValueError(f"{table.name} has no columns for {schema.__name__}.{', '.join(missing)}")
+
+        if any(projection.nested for projection in nested.values()):
+            raise ValueError("Nested projections cant have their own nested projections")
+
+        self.columns = [table.c[name] for name in self.fields]
+
+    def select(self, *extra_columns) -> Select:
+        """
+        The schema's columns under their own names, then the nested ones labelled `<field>__<column>`, then
+        `extra_columns` that arent selected already, e.g the sort column of the pagination
+        """
+        columns = list(self.columns)
+
+        for field, projection in self.nested.items():
+            columns.extend(column.label(f"{field}__{column.key}") for column in projection.columns)
+
+        columns.extend(column for column in extra_columns if column.key not in self.fields)
+
+        stmt = select(*columns).select_from(self.orm)
+        for field in self.nested:
+            stmt = stmt.outerjoin(getattr(self.orm, field))
+
+        return stmt
+
+    def select_version(self) -> Select:
+        """
+        The version of the rows `select` returns, to be filtered the same way
+        """
+        return select_version(self.orm, *(getattr(self.orm, field) for field in self.nested))
+
+    def build(self, rows: Sequence[Row]) -> list[BaseModel]:
+        fields = self.fields
+        construct = self.schema.model_construct
+        own = len(fields)
+
+        nested = []
+        start = own
+        for field, projection in self.nested.items():
+            end = start + len(projection.fields)
+            nested.append((field, projection.fields, projection.schema.model_construct, start, end))
+            start = end
+
+        records = []
+        for row in rows:
+            values = dict(zip(fields, row[:own]))
+
+            for field, nested_fields, nested_construct, start, end in nested:
+                nested_values = row[start:end]
+                # Every column is NULL when the outer join found nothing
+                if any(value is not None for value in nested_values):
+                    values[field] = nested_construct(**dict(zip(nested_fields, nested_values)))
+                else:
+                    values[field] = None
+
+            records.append(construct(**values))
+
+        return records
@@ -0,0 +1,53 @@
+"""
+Versions of what the GET db_handlers would return, read without loading the rows, for conditional GETs.
+
+A version is the number of rows and the latest date_updated among them and the rows joined into them, e.g
+their doctors. An insert or update moves the latest date_updated, a delete changes the count. The statement
+is filtered like the read it versions:
+
+    stmt = select_version(AppointmentDB, AppointmentDB.doctor).filter(and_(*filter_conditions))
+    version = Version.from_row((await session.execute(statement=stmt)).one())
+
+It isnt monotonic. date_updated is now(), the start of the writing transaction, not its commit. A transaction
+that started before the latest date_updated was written but commits after it doesnt move the max:
+- Its inserts still change the count.
+- Its updates, or an insert together with a delete, leave the version as it was.
+Clients then get 304s for the old rows until the next write moves the version. The window is as long as
+a write transaction, and the writes here are short ones.
+"""
+
+from datetime import datetime
+from typing import NamedTuple, Optional, Sequence
+
+from sqlalchemy import Select, func, select
+
+
+class Version(NamedTuple):
+    count: int
+    last_modified: Optional[datetime]
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> "Version":
+        """
+        From a row of `select_version`, the count then the latest date_updated of each table
+        """
+        timestamps = [timestamp for timestamp in row[1:] if timestamp is not None]
+
+        return cls(count=row[0], last_modified=max(timestamps, default=None))
+
+
+def select_version(orm, *relationships) -> Select:
+    """
+    The count of `orm`'s rows, their latest date_updated and the latest of the rows each many-to-one
+    relationship joins in, which dont change the count
+    """
+    joined = [relationship.property.mapper.class_ for relationship in relationships]
+
+    stmt = select(
+        func.count(), func.max(orm.date_updated), *(func.max(target.date_updated) for target in joined)
+    ).select_from(orm)
+
+    for relationship in relationships:
+        stmt = stmt.outerjoin(relationship)
+
+    return stmt
@@ -0,0 +1,140 @@
+"""
+Background import of lab report batches sent by labs as CSV or Parquet files.
+
+The upload route saves the file under LAB_REPORT_IMPORT_DIR and enqueues `import_lab_reports`. The job reads
+it in chunks of LAB_REPORT_IMPORT_CHUNK_SIZE rows, validates every row against LabReportCreate and hands the
+valid ones to labreports_db_handler.import_lab_reports, which COPYs them into a staging table and merges it
+into labreports. Progress and row errors are kept in the job's meta for the status route.
+"""
+
+import asyncio
+import csv
+import logging
+import os
+from typing import Iterator
+
+from pydantic import ValidationError
+from rq import get_current_job
+from rq.job import Job
+
+from ai_health.database.db_handlers import labreports_db_handler
+from ai_health.root.database import engine
+from ai_health.root.redis_manager import redis_manager
+from ai_health.root.settings import Settings
+from ai_health.schemas.lab_report_schema import LabReportCreate
+
+
+settings = Settings()
+
+LOGGER = logging.getLogger(__name__)
+
+FILE_FORMATS = ("csv", "parquet")
+
+COLUMNS = list(LabReportCreate.model_fields)
+
+
+class ImportFileError(ValueError): ...
+
+
+def _read_csv(path: str, chunk_size: int) -> Iterator[list[dict]]:
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        reader = csv.DictReader(file)
+
+        missing = set(COLUMNS) - set(reader.fieldnames or [])
+        if missing:
+            raise ImportFileError(f"Missing columns: {', '.join(sorted(missing))}")
+
+        chunk = []
+        for row in reader:
+            chunk.append(row)
+
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+
+def _read_parquet(path: str, chunk_size: int) -> Iterator[list[dict]]:
+    # Only the workers read Parquet, the API doesnt need pyarrow
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+
+    missing = set(COLUMNS) - set(parquet_file.schema_arrow.names)
+    if missing:
+        raise ImportFileError(f"Missing columns: {', '.join(sorted(missing))}")
+
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=COLUMNS):
+        yield batch.to_pylist()
+
+
+def _validated_chunks(job: Job, path: str, file_format: str) -> Iterator[list[tuple[int, LabReportCreate]]]:
+    read = _read_csv if file_format == "csv" else _read_parquet
+    row = 0
+
+    for chunk in read(path, settings.LAB_REPORT_IMPORT_CHUNK_SIZE):
+        valid = []
+
+        for values in chunk:
+            row += 1
+
+            try:
+                valid.append((row, LabReportCreate.model_validate(values)))
+            except ValidationError as e:
+                job.meta["rows_invalid"] += 1
+                errors = e.errors(include_url=False, include_context=False, include_input=False)
+                _add_error(job, row, errors)
+
+        job.meta["rows_read"] = row
+        job.save_meta()
+
+        yield valid
+
+    job.meta["stage"] = "merging"
+    job.save_meta()
+
+
+def _add_error(job: Job, row: int, errors: list[dict]):
+    if len(job.meta["errors"]) < settings.LAB_REPORT_IMPORT_MAX_ERRORS:
+        job.meta["errors"].append({"row": row, "errors": errors})
+
+
+async def _import(job: Job, path: str, file_format: str) -> dict:
+    try:
+        result, unknown_patient_rows = await labreports_db_handler.import_lab_reports(
+            _validated_chunks(job, path, file_format), max_unknown_patient_rows=settings.LAB_REPORT_IMPORT_MAX_ERRORS
+        )
+    finally:
+        # Connections of this event loop cant be reused by the next job's, asyncio.run gives each job its own
+        await engine.dispose()
+        await redis_manager.reset()
+
+    for row in unknown_patient_rows:
+        _add_error(job, row, [{"type": "unknown_patient", "loc": ["patient_id"], "msg": "No user has this id"}])
+
+    return result.model_dump()
+
+
+def import_lab_reports(path: str, file_format: str) -> dict:
+    job = get_current_job()
+    job.meta.update(stage="importing", rows_read=0, rows_invalid=0, errors=[])
+    job.save_meta()
+
+    try:
+        result = asyncio.run(_import(job, path, file_format))
+    except Exception as e:
+        detail = str(e) if isinstance(e, ImportFileError) else "The import failed, nothing was imported"
+        job.meta.update(stage="failed", detail=detail)
+        job.save_meta()
+        raise
+    finally:
+        os.remove(path)
+
+    job.meta["stage"] = "finished"
+    job.save_meta()
+
+    LOGGER.info(f"Lab report import {job.id} finished: {result}")
+
+    return result
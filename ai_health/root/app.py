@@ -1,20 +1,43 @@
-import time
 from logging import getLogger
-from fastapi import FastAPI, Request
-from fastapi.concurrency import asynccontextmanager
-from fastapi.responses import ORJSONResponse, RedirectResponse
+from fastapi import FastAPI
+from fastapi.concurrency import asynccontextmanager, run_in_threadpool
+from fastapi.responses import ORJSONResponse, RedirectResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST
 
+from ai_health.root import compression, database, metrics, query_budget
 from ai_health.root.app_routers import api
+from ai_health.root.middlewares import (
+    CompressionMiddleware,
+    MetricsMiddleware,
+    QueryBudgetMiddleware,
+    ServerTimingMiddleware,
+)
+from ai_health.root.redis_manager import redis_manager
 from ai_health.root.settings import Settings
+from ai_health.services.utils import password_utils, user_cache
 
 
 LOGGER = getLogger(__file__)
 settings = Settings()
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    user_cache.start_invalidation_listener()
+    database.start_replica_health_check()
+
+    yield
+
+    await database.stop_replica_health_check()
+    await user_cache.stop_invalidation_listener()
+    password_utils.password_executor.shutdown()
+    await redis_manager.close()
+    LOGGER.info(f"User cache stats {user_cache.user_cache.stats()}")
+
+
 def intialize() -> FastAPI:
-    app = FastAPI(default_response_class=ORJSONResponse)
+    app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
     ORIGINS = ["*"]
 
@@ -25,6 +48,16 @@ def intialize() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    encoders = compression.configured_encoders()
+    if encoders:
+        app.add_middleware(
+            CompressionMiddleware, encoders=encoders, minimum_size=settings.RESPONSE_COMPRESSION_MIN_SIZE
+        )
+    # The last one added runs first, the metrics middleware starts the request context the others read
+    if query_budget.ENABLED:
+        app.add_middleware(QueryBudgetMiddleware)
+    app.add_middleware(ServerTimingMiddleware)
+    app.add_middleware(MetricsMiddleware)
     
     app.include_router(router=api)
 
@@ -34,15 +67,11 @@ def intialize() -> FastAPI:
 app = intialize()
 
 
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
-
-
 @app.get("/")
 def home():
     return RedirectResponse(url="/docs")
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return Response(content=await run_in_threadpool(metrics.render), media_type=CONTENT_TYPE_LATEST)
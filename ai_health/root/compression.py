@@ -0,0 +1,198 @@
+"""
+Content-Encoding negotiation and the encoders of CompressionMiddleware.
+
+RESPONSE_COMPRESSION lists the encodings offered, preferred first, the client's q-values decide and ties go to
+the order of the list. gzip is the stdlib's zlib, zstd needs the zstandard package and br the brotli package.
+Those are optional, an encoding whose package isnt installed is left out with a warning and clients get one
+of the others. The levels are per encoding, RESPONSE_COMPRESSION_<ENCODING>_LEVEL, their scales differ.
+
+An encoder compresses a whole body with `compress`, or a streaming one a chunk at a time with the compressor
+`stream` returns. Each chunk is flushed, so what the client already has can be decompressed before the next
+chunk arrives, at the cost of some ratio.
+"""
+
+import logging
+import zlib
+from typing import Optional, Sequence
+
+from ai_health.root.settings import Settings
+
+
+settings = Settings()
+
+LOGGER = logging.getLogger(__name__)
+
+# 16 + MAX_WBITS makes zlib write a gzip header and trailer instead of a zlib one
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+# Media types worth compressing, anything else, e.g images or archives, already is or isnt text
+COMPRESSIBLE_TYPES = {"application/json", "application/x-ndjson", "application/javascript", "application/xml"}
+
+
+class GzipStream:
+    def __init__(self, level: int) -> None:
+        self._compressobj = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressobj.compress(chunk) + self._compressobj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, chunk: bytes) -> bytes:
+        return self._compressobj.compress(chunk) + self._compressobj.flush()
+
+
+class GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int = 6) -> None:
+        self.level = level
+
+    def compress(self, body: bytes) -> bytes:
+        compressobj = zlib.compressobj(self.level, zlib.DEFLATED, GZIP_WBITS)
+        return compressobj.compress(body) + compressobj.flush()
+
+    def stream(self) -> GzipStream:
+        return GzipStream(self.level)
+
+
+class BrotliStream:
+    def __init__(self, compressor) -> None:
+        self._compressor = compressor
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self, chunk: bytes) -> bytes:
+        return self._compressor.process(chunk) + self._compressor.finish()
+
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self, level: int = 4) -> None:
+        try:
+            import brotli
+        except ImportError as e:
+            raise ImportError("The br response encoding needs the brotli package, pip install brotli") from e
+
+        self.brotli = brotli
+        self.level = level
+
+    def compress(self, body: bytes) -> bytes:
+        return self.brotli.compress(body, quality=self.level)
+
+    def stream(self) -> BrotliStream:
+        return BrotliStream(self.brotli.Compressor(quality=self.level))
+
+
+class ZstdStream:
+    def __init__(self, zstandard, compressobj) -> None:
+        self._zstandard = zstandard
+        self._compressobj = compressobj
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressobj.compress(chunk) + self._compressobj.flush(self._zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self, chunk: bytes) -> bytes:
+        return self._compressobj.compress(chunk) + self._compressobj.flush()
+
+
+class ZstdEncoder:
+    name = "zstd"
+
+    def __init__(self, level: int = 3) -> None:
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("The zstd response encoding needs the zstandard package, pip install zstandard") from e
+
+        self.zstandard = zstandard
+        self.level = level
+        # A compressor context does one compression at a time. Whole bodies are compressed without awaiting,
+        # so they can share one, every stream gets its own.
+        self._compressor = zstandard.ZstdCompressor(level=level)
+
+    def compress(self, body: bytes) -> bytes:
+        return self._compressor.compress(body)
+
+    def stream(self) -> ZstdStream:
+        return ZstdStream(self.zstandard, self.zstandard.ZstdCompressor(level=self.level).compressobj())
+
+
+ENCODERS = {encoder.name: encoder for encoder in (ZstdEncoder, BrotliEncoder, GzipEncoder)}
+
+
+def configured_encoders() -> list:
+    """
+    The encoders of RESPONSE_COMPRESSION whose packages are installed, preferred first
+    """
+    levels = {
+        "zstd": settings.RESPONSE_COMPRESSION_ZSTD_LEVEL,
+        "br": settings.RESPONSE_COMPRESSION_BROTLI_LEVEL,
+        "gzip": settings.RESPONSE_COMPRESSION_GZIP_LEVEL,
+    }
+
+    encoders = []
+    for name in (name.strip() for name in settings.RESPONSE_COMPRESSION.split(",")):
+        if not name:
+            continue
+        if name not in ENCODERS:
+            raise ValueError(f"Unknown response encoding {name}")
+
+        try:
+            encoders.append(ENCODERS[name](level=levels[name]))
+        except ImportError as e:
+            LOGGER.warning(f"{e}, {name} isnt offered")
+
+    return encoders
+
+
+def accepted_encodings(accept_encoding: str) -> dict[str, float]:
+    """
+    The codings of an Accept-Encoding header with their q-values, a malformed q-value counts as 0
+    """
+    accepted = {}
+
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+
+        accepted[coding] = q
+
+    return accepted
+
+
+def negotiate(accept_encoding: str, encoders: Sequence):
+    """
+    The encoder with the client's highest q-value, the first one of `encoders` on a tie, None when the
+    client accepts none of them
+    """
+    accepted = accepted_encodings(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+
+    best, best_q = None, 0.0
+    for encoder in encoders:
+        q = accepted.get(encoder.name, wildcard)
+        if q > best_q:
+            best, best_q = encoder, q
+
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+
+    media_type = content_type.partition(";")[0].strip().lower()
+
+    return media_type.startswith("text/") or media_type.endswith("+json") or media_type in COMPRESSIBLE_TYPES
@@ -1,10 +1,19 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+import logging
+from typing import AsyncIterator, Optional
+
 from alembic import command
 from alembic.config import Config
-from sqlalchemy import MetaData, create_engine, inspect
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy import MetaData, create_engine, inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
+from ai_health.root import metrics, query_budget
 from ai_health.root.settings import Settings
 from ai_health.root.utils.abstract_base import AbstractBase
+from ai_health.root.utils.instrumented_pool import InstrumentedAsyncPool
 from ai_health.database.orms.auth_orm import User
 from ai_health.database.orms.doctor_orm import Doctor   
 from ai_health.database.orms.medication_n_dosage_orm import Medication, Appointment, LabReport, MedicalHistory
@@ -13,11 +22,159 @@ from ai_health.database.orms.billing_orm import Billing
 
 settings = Settings()
 
-engine = create_async_engine(url=str(settings.POSTGRES_URL))
+LOGGER = logging.getLogger(__name__)
+
+
+def _create_engine(url: str, name: str) -> AsyncEngine:
+    async_engine = create_async_engine(
+        url=url,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            # Set it to 0 behind pgbouncer in transaction mode, prepared statements dont survive across its backends
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT)},
+        },
+    )
+
+    async_engine.pool.metrics_label = name
+    metrics.instrument_engine(async_engine.sync_engine)
+    query_budget.instrument_engine(async_engine.sync_engine)
 
+    return async_engine
+
+
+engine = _create_engine(str(settings.POSTGRES_URL), "primary")
 
 async_session = async_sessionmaker(engine, expire_on_commit=False)
 
+replica_engine = (
+    _create_engine(str(settings.POSTGRES_REPLICA_URL), "replica") if settings.POSTGRES_REPLICA_URL else None
+)
+
+replica_session = async_sessionmaker(replica_engine, expire_on_commit=False) if replica_engine else None
+
+# Set for the rest of a request that must see its user's own writes
+_read_from_primary: ContextVar[bool] = ContextVar("read_from_primary", default=False)
+
+_replica_check_task: asyncio.Task | None = None
+
+# Seconds the replica is behind, 0 when it has replayed everything it received
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReplicaHealth:
+    """
+    Whether reads can go to the replica. It starts unhealthy so nothing is read from it before the first check.
+    """
+
+    def __init__(self) -> None:
+        self.healthy = False
+        self.lag: Optional[float] = None
+
+    def update(self, lag: Optional[float]):
+        healthy = lag is not None and lag <= settings.REPLICA_MAX_LAG
+
+        if healthy != self.healthy:
+            LOGGER.warning(f"Read replica is now {'healthy' if healthy else 'unhealthy'}, lag {lag}")
+
+        self.healthy = healthy
+        self.lag = lag
+
+
+replica_health = ReplicaHealth()
+
+
+def read_from_primary():
+    """
+    Sends the reads of the rest of the current request to the primary
+    """
+    _read_from_primary.set(True)
+
+
+async def _open_read_session() -> AsyncSession:
+    if replica_session is None or not replica_health.healthy or _read_from_primary.get():
+        return async_session()
+
+    session = replica_session()
+
+    try:
+        await session.connection()
+    except (OSError, SQLAlchemyError) as e:
+        LOGGER.error("Couldnt connect to the read replica, reading from the primary")
+        LOGGER.exception(e)
+        replica_health.update(lag=None)
+        await session.close()
+
+        return async_session()
+
+    return session
+
+
+@asynccontextmanager
+async def read_session() -> AsyncIterator[AsyncSession]:
+    """
+    A session for db_handler reads, on the replica when there is a healthy one and on the primary otherwise.
+
+    Reads whose result is shared through a cache stay on async_session, a lagging replica would put data that
+    was just invalidated back into the cache.
+    """
+    session = await _open_read_session()
+
+    async with session:
+        yield session
+
+
+async def _check_replica():
+    while True:
+        try:
+            async with replica_engine.connect() as connection:
+                lag = (await connection.execute(REPLICA_LAG_QUERY)).scalar_one()
+
+            replica_health.update(lag=float(lag))
+        except (OSError, SQLAlchemyError) as e:
+            LOGGER.exception(e)
+            replica_health.update(lag=None)
+
+        await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_INTERVAL)
+
+
+def start_replica_health_check():
+    """
+    Checks the replica's lag on a background task of this worker, when a replica is configured
+    """
+    global _replica_check_task
+
+    if replica_engine is not None and _replica_check_task is None:
+        _replica_check_task = asyncio.create_task(_check_replica())
+
+
+async def stop_replica_health_check():
+    global _replica_check_task
+
+    if _replica_check_task is None:
+        return
+
+    _replica_check_task.cancel()
+
+    try:
+        await _replica_check_task
+    except asyncio.CancelledError:
+        pass
+
+    _replica_check_task = None
+
 
 # Handles creating migration from the changed
 def create_migration():
@@ -0,0 +1,149 @@
+"""
+Prometheus metrics, served by GET /metrics.
+
+Under gunicorn every worker writes its samples to PROMETHEUS_MULTIPROC_DIR and /metrics aggregates all of
+them, see deployment/gunicorn.conf.py. Without the variable, e.g under `make start`, only the serving
+process is reported.
+"""
+
+import logging
+import os
+import time
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+from prometheus_client import multiprocess
+from prometheus_client.core import GaugeMetricFamily
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ai_health.job_manager import job_runner
+from ai_health.root import request_context
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Queries and commands outside a request, e.g the replica health check or the user cache listener
+BACKGROUND_ROUTE = "background"
+
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+REQUEST_DURATION = Histogram("http_request_duration_seconds", "Time to serve a request", ["method", "route", "status"])
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requests being served", ["method"], multiprocess_mode="livesum"
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Time a database query took", ["route"], buckets=FAST_BUCKETS
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request", "Database queries a request ran", ["route"], buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds", "Time a Redis command or pipeline took", ["command"], buckets=FAST_BUCKETS
+)
+REDIS_ERRORS = Counter("redis_command_errors", "Redis commands that raised", ["command"])
+CACHE_LOOKUPS = Counter("cache_lookups", "Lookups of an in-process cache by result", ["cache", "result"])
+CACHE_EVICTIONS = Counter("cache_evictions", "Entries evicted from a full in-process cache", ["cache"])
+CACHE_ENTRIES = Gauge("cache_entries", "Entries an in-process cache holds", ["cache"], multiprocess_mode="livesum")
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections", "Connections checked out of the pool", ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections", "Connections open beyond the pool size", ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds", "Time to check a connection out of the pool", ["pool"], buckets=FAST_BUCKETS
+)
+DB_POOL_TIMEOUTS = Counter("db_pool_timeouts", "Checkouts that gave up waiting for a connection", ["pool"])
+
+
+def observe_request(method: str, route: str, status: int, seconds: float, stats: request_context.RequestStats):
+    REQUEST_DURATION.labels(method, route, status).observe(seconds)
+    DB_QUERIES_PER_REQUEST.labels(route).observe(stats.db_queries)
+
+
+def observe_redis_command(command: str, duration_ns: int, failed: bool = False):
+    REDIS_COMMAND_DURATION.labels(command).observe(duration_ns / 1e9)
+
+    if failed:
+        REDIS_ERRORS.labels(command).inc()
+
+    stats = request_context.current()
+    if stats is not None:
+        stats.redis_commands += 1
+        stats.redis_ns += duration_ns
+
+
+def observe_pool_checkout(pool: str, seconds: float, timed_out: bool = False):
+    DB_POOL_WAIT.labels(pool).observe(seconds)
+
+    if timed_out:
+        DB_POOL_TIMEOUTS.labels(pool).inc()
+
+
+def observe_pool_connections(pool: str, checked_out: int, overflow: int):
+    DB_POOL_CHECKED_OUT.labels(pool).set(checked_out)
+    DB_POOL_OVERFLOW.labels(pool).set(overflow)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.query_start_ns = time.perf_counter_ns()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration_ns = time.perf_counter_ns() - context.query_start_ns
+    stats = request_context.current()
+
+    if stats is None:
+        DB_QUERY_DURATION.labels(BACKGROUND_ROUTE).observe(duration_ns / 1e9)
+        return
+
+    stats.db_queries += 1
+    stats.db_ns += duration_ns
+    DB_QUERY_DURATION.labels(stats.route).observe(duration_ns / 1e9)
+
+
+def instrument_engine(engine: Engine):
+    """
+    Times every query of the engine, pass the sync_engine of an async one
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueueDepthCollector:
+    """
+    Reads the RQ queue's job counts from Redis when /metrics is scraped, they arent per worker
+    """
+
+    def collect(self):
+        queue = job_runner.queue
+        depth = GaugeMetricFamily("rq_jobs", "Jobs of the RQ queue by state", labels=["queue", "state"])
+
+        try:
+            depth.add_metric([queue.name, "queued"], queue.count)
+            depth.add_metric([queue.name, "started"], queue.started_job_registry.count)
+            depth.add_metric([queue.name, "scheduled"], queue.scheduled_job_registry.count)
+            depth.add_metric([queue.name, "failed"], queue.failed_job_registry.count)
+        except RedisError as e:
+            LOGGER.exception(e)
+            return
+
+        yield depth
+
+
+queue_registry = CollectorRegistry()
+queue_registry.register(QueueDepthCollector())
+
+
+def render() -> bytes:
+    """
+    The exposition text, blocking since the queue depth is read with the sync Redis client of RQ
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry) + generate_latest(queue_registry)
@@ -0,0 +1,247 @@
+"""
+Pure ASGI middlewares. Unlike @app.middleware("http") they dont run the app in a separate task nor wrap the
+response body, so streaming responses and the request context are left alone.
+"""
+
+import time
+from collections import Counter
+from typing import Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ai_health.root import compression, metrics, query_budget, request_context
+
+
+class MetricsMiddleware:
+    """
+    Starts the request context and records the request's latency, status and database query count
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        # Stays 500 when the app raises before responding, the error middleware answers with a 500 then
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+            await send(message)
+
+        stats, token = request_context.start_request(scope)
+        metrics.REQUESTS_IN_PROGRESS.labels(method).inc()
+        start = time.perf_counter_ns()
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            seconds = (time.perf_counter_ns() - start) / 1e9
+            metrics.observe_request(method, stats.route, status_code, seconds, stats)
+            metrics.REQUESTS_IN_PROGRESS.labels(method).dec()
+            request_context.end_request(token)
+
+
+def _server_timing(stats: Optional[request_context.RequestStats], total_ns: int, now_ns: int) -> str:
+    def metric(name: str, duration_ns: int, description: str = "") -> str:
+        value = f"{name};dur={duration_ns / 1e6:.3f}"
+        return f'{value};desc="{description}"' if description else value
+
+    if stats is None:
+        return metric("total", total_ns)
+
+    timings = [
+        metric("auth", stats.auth_ns),
+        metric("db", stats.db_ns, f"{stats.db_queries} queries"),
+        metric("redis", stats.redis_ns, f"{stats.redis_commands} commands"),
+    ]
+    if stats.endpoint_returned_ns is not None:
+        timings.append(metric("serialize", now_ns - stats.endpoint_returned_ns))
+    timings.append(metric("total", total_ns))
+
+    return ", ".join(timings)
+
+
+class ServerTimingMiddleware:
+    """
+    Adds a Server-Timing header splitting the time to respond into auth, db, redis and serialize, and the
+    total as X-Process-Time in seconds.
+
+    The segments come from the request context, so it goes inside MetricsMiddleware. Auth includes its
+    own cache and database lookups, which db and redis count too. The headers are sent before the body,
+    so for a streaming response the time to produce the body isnt included.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = request_context.current()
+        start = time.perf_counter_ns()
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                now = time.perf_counter_ns()
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", _server_timing(stats, now - start, now))
+                headers.append("X-Process-Time", str((now - start) / 1e9))
+
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+
+
+class QueryBudgetMiddleware:
+    """
+    Records the statements of each request and checks them against its route's query budget once it is
+    done, see ai_health.root.query_budget. Only added when QUERY_BUDGET_MODE isnt off.
+
+    Reads the request context, so it goes inside MetricsMiddleware. The check runs after the response is
+    sent, the statements a streaming response runs for its body count too.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        stats = request_context.current()
+
+        if scope["type"] != "http" or stats is None:
+            await self.app(scope, receive, send)
+            return
+
+        stats.statements = Counter()
+
+        await self.app(scope, receive, send)
+
+        query_budget.check(stats)
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies with the encoding negotiated from Accept-Encoding, see
+    ai_health.root.compression. Only added when RESPONSE_COMPRESSION offers an encoding.
+
+    A body sent at once is compressed when it has at least `minimum_size` bytes. A streaming response is
+    compressed a chunk at a time whatever its size, which isnt known up front, and loses its Content-Length.
+    Responses with a Content-Encoding already, without a body, that arent text or JSON or whose Cache-Control
+    has no-transform are sent as they are. A strong ETag is made weak, the compressed bytes differ.
+
+    Every response that could be compressed gets Vary: Accept-Encoding, also the ones sent uncompressed
+    because they are small or the client accepts no offered encoding, and so does every 204 and 304. Otherwise
+    a shared cache could hand the identity body it stored for one client to another that would get it
+    compressed, or the other way around.
+
+    Goes inside ServerTimingMiddleware, the start of a response is held until its body is compressed, so the
+    compression of a body sent at once is part of serialize.
+    """
+
+    def __init__(self, app: ASGIApp, encoders: Sequence, minimum_size: int = 1024) -> None:
+        self.app = app
+        self.encoders = encoders
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding")
+        encoder = compression.negotiate(accept_encoding, self.encoders) if accept_encoding else None
+
+        start_message: Optional[Message] = None
+        stream = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start_message, stream, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                # Without a body, e.g the 304s of conditional(), there is no Content-Type to go by. They vary like
+                # the 200 they stand for, or a cache would update the stored response's Vary from them.
+                if message["status"] in (204, 304):
+                    headers.add_vary_header("Accept-Encoding")
+                    passthrough = True
+                    await send(message)
+                    return
+
+                if (
+                    "content-encoding" in headers
+                    or "no-transform" in headers.get("cache-control", "")
+                    or not compression.is_compressible(headers.get("content-type"))
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+
+                headers.add_vary_header("Accept-Encoding")
+
+                if encoder is None:
+                    passthrough = True
+                    await send(message)
+                    return
+
+                # Held until the first body message shows whether it is compressed
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                passthrough = True
+                if start_message is not None:
+                    await send(start_message)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if stream is None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                headers = MutableHeaders(scope=start_message)
+                headers["Content-Encoding"] = encoder.name
+
+                etag = headers.get("etag")
+                if etag is not None and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+
+                if not more_body:
+                    body = encoder.compress(body)
+                    headers["Content-Length"] = str(len(body))
+
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+
+                stream = encoder.stream()
+                await send(start_message)
+
+            body = stream.compress(body) if more_body else stream.finish(body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
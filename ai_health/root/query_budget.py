@@ -0,0 +1,105 @@
+"""
+Per request query budgets and N+1 detection, for development, CI and staging.
+
+With QUERY_BUDGET_MODE set to log or strict, every statement a request runs is counted by its text. Once the
+request is done QueryBudgetMiddleware checks the count against the budget of the matched route, and logs the
+SELECTs that ran QUERY_REPEAT_THRESHOLD times or more, the signature of an N+1. In strict mode going over
+the budget raises QueryBudgetExceeded, so a test client request to that route fails the test.
+
+Routes get QUERY_BUDGET_DEFAULT statements, an endpoint that needs more declares it under the route decorator:
+
+    @visit_router.get("/")
+    @query_budget(2)
+    async def get_visits(...):
+
+The mode is off in production, the statements arent recorded then.
+"""
+
+import logging
+import re
+from collections import Counter
+from typing import Callable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ai_health.root import request_context
+from ai_health.root.settings import Settings
+
+
+settings = Settings()
+
+LOGGER = logging.getLogger(__name__)
+
+ENABLED = settings.QUERY_BUDGET_MODE != "off"
+
+# Bound parameter lists, e.g a selectinload's IN ($1, $2, $3), differ in length but are the same query
+PARAMETER_LIST = re.compile(r"\$\d+(?:, \$\d+)*")
+
+MAX_LOGGED_STATEMENT = 300
+
+EndpointT = TypeVar("EndpointT", bound=Callable)
+
+
+class QueryBudgetExceeded(Exception): ...
+
+
+def query_budget(statements: int) -> Callable[[EndpointT], EndpointT]:
+    """
+    Declares how many statements a request to the endpoint may run, read by TimedAPIRoute
+    """
+
+    def declare(endpoint: EndpointT) -> EndpointT:
+        endpoint.query_budget = statements
+        return endpoint
+
+    return declare
+
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    stats = request_context.current()
+
+    if stats is not None and stats.statements is not None:
+        stats.statements[statement] += 1
+
+
+def instrument_engine(engine: Engine):
+    """
+    Records the statements run for each request when the mode isnt off, pass the sync_engine of an async one
+    """
+    if ENABLED:
+        event.listen(engine, "after_cursor_execute", _record_statement)
+
+
+def _repeated_selects(statements: Counter) -> list[tuple[str, int]]:
+    shapes = Counter()
+
+    for statement, count in statements.items():
+        # Repeated INSERTs are the bulk routes' chunks, an N+1 is a read
+        if statement.lstrip().upper().startswith("SELECT"):
+            shapes[PARAMETER_LIST.sub("?", statement)] += count
+
+    return [(shape, count) for shape, count in shapes.most_common() if count >= settings.QUERY_REPEAT_THRESHOLD]
+
+
+def check(stats: request_context.RequestStats):
+    """
+    Called by QueryBudgetMiddleware once the request is done
+    """
+    route = f"{stats.scope['method']} {stats.route}"
+
+    for shape, count in _repeated_selects(stats.statements):
+        LOGGER.warning(f"Possible N+1 on {route}, ran {count} times: {shape[:MAX_LOGGED_STATEMENT]}")
+
+    budget = getattr(stats.scope.get("route"), "query_budget", None)
+    queries = sum(stats.statements.values())
+
+    if budget is None or queries <= budget:
+        return
+
+    message = f"{route} ran {queries} queries, its budget is {budget}"
+
+    if settings.QUERY_BUDGET_MODE == "strict":
+        raise QueryBudgetExceeded(message)
+
+    LOGGER.warning(message)
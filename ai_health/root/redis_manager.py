@@ -1,41 +1,229 @@
-import json
-from typing import Union
-import redis
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterable, Optional, Union
+
+from redis import asyncio as aioredis
 
 from ai_health.root.settings import Settings
+from ai_health.root.utils.cache_codecs import CacheSerializer
+from ai_health.root.utils.instrumented_redis import InstrumentedRedis
 
 
 settings = Settings()
 
 
+class RedisBatch:
+    """
+    Queues cache writes from one request so they go to Redis in a single round trip.
+
+    Use it through `RedisManager.batch()`, the queued commands are sent when the block exits without an error.
+    """
+
+    def __init__(self, manager: "RedisManager") -> None:
+        self.manager = manager
+        self.pipeline = manager.redis_client.pipeline(transaction=False)
+        self.results: list = []
+
+    def cache_json_item(self, key: str, value: Any, ttl: int = 3600):
+        self.pipeline.set(name=key, value=self.manager.serializer.dumps(value), ex=ttl)
+
+    def delete_key(self, key: str):
+        self.pipeline.delete(key)
+
+    def delete_many(self, keys: Iterable[str]):
+        keys = list(keys)
+        if keys:
+            self.pipeline.delete(*keys)
+
+    def add_to_set(self, key: str, members: Iterable[str], ttl: int = 3600):
+        members = list(members)
+        if members:
+            self.pipeline.sadd(key, *members)
+            self.pipeline.expire(key, ttl)
+
+    def increment(self, key: str):
+        self.pipeline.incr(key)
+
+    def count_existing(self, keys: Iterable[str]):
+        keys = list(keys)
+        if keys:
+            self.pipeline.exists(*keys)
+
+    def set_if_missing(self, key: str, value: Any):
+        self.pipeline.set(name=key, value=value, nx=True)
+
+    def publish(self, channel: str, message: str):
+        self.pipeline.publish(channel=channel, message=message)
+
+    async def execute(self) -> list:
+        try:
+            if len(self.pipeline):
+                self.results = await self.pipeline.execute()
+        finally:
+            await self.pipeline.reset()
+
+        return self.results
+
+
 class RedisManager:
+    """
+    Asyncio Redis client, every worker shares one size limited connection pool.
+
+    When all the connections are in use a command waits up to REDIS_POOL_TIMEOUT seconds for a free one.
+    """
+
     def __init__(self) -> None:
-        self.redis_client = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
+        self._create_pool()
+        self.serializer = CacheSerializer(
+            codec=settings.REDIS_CACHE_CODEC,
+            compression_threshold=settings.REDIS_CACHE_COMPRESSION_THRESHOLD,
+            compression_level=settings.REDIS_CACHE_COMPRESSION_LEVEL,
+        )
+
+    def _create_pool(self):
+        self.connection_pool = aioredis.BlockingConnectionPool(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        )
+        self.redis_client = InstrumentedRedis(connection_pool=self.connection_pool)
 
-    def cache_json_item(self, key: str, value: dict, ttl: int = 3600):
+    async def cache_json_item(self, key: str, value: Any, ttl: int = 3600):
         """
         Caches a JSON Item for some time set with the ttl- time to live.
 
         After the TTL, it is cleared from the Redis Db.
-        Its Expiration date is 3600s (1 Hr) by default
+        Its Expiration date is 3600s (1 Hr) by default.
+        UUIDs, datetimes and pydantic models in the value are serialized too
         """
-        value_as_string = json.dumps(value)
+        value_encoded = self.serializer.dumps(value)
 
-        self.redis_client.set(name=key, value=value_as_string, ex=ttl)
+        await self.redis_client.set(name=key, value=value_encoded, ex=ttl)
 
-    def get_cached_json_item(self, key: str) -> Union[dict, None]:
-        value = self.redis_client.get(name=key)
+    async def get_cached_json_item(self, key: str) -> Union[Any, None]:
+        value = await self.redis_client.get(name=key)
 
         if value is None:
             return None
 
-        # value_decoded = json.loads(str(value))
-        value_decoded = json.loads(value)
+        value_decoded = self.serializer.loads(value)
 
         return value_decoded
 
-    def delete_key(self, key: str):
-        self.redis_client.delete(key)
+    async def cache_bytes(self, key: str, value: bytes, ttl: int = 3600):
+        """
+        Caches already serialized bytes as they are, without the cache codec
+        """
+        await self.redis_client.set(name=key, value=value, ex=ttl)
+
+    async def get_cached_bytes(self, key: str) -> Union[bytes, None]:
+        return await self.redis_client.get(name=key)
+
+    async def get_or_set(self, key: str, value: Any) -> bytes:
+        """
+        The key's value, set to `value` first if the key doesnt exist, in one round trip
+        """
+        async with self.redis_client.pipeline(transaction=False) as pipeline:
+            pipeline.set(name=key, value=value, nx=True)
+            pipeline.get(name=key)
+            _, current = await pipeline.execute()
+
+        return current
+
+    async def delete_key(self, key: str):
+        await self.redis_client.delete(key)
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """
+        Gets several cached items with one MGET, keys that are not cached are left out of the result
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        values = await self.redis_client.mget(keys)
+
+        return {key: self.serializer.loads(value) for key, value in zip(keys, values) if value is not None}
+
+    async def set_many(self, items: dict[str, Any], ttl: int = 3600, ttls: Optional[dict[str, int]] = None):
+        """
+        Caches several items in one pipelined round trip.
+
+        Each key expires after its entry in `ttls`, or after `ttl` if it has none
+        """
+        if not items:
+            return
+
+        ttls = ttls or {}
+
+        async with self.redis_client.pipeline(transaction=False) as pipeline:
+            for key, value in items.items():
+                pipeline.set(name=key, value=self.serializer.dumps(value), ex=ttls.get(key, ttl))
+
+            await pipeline.execute()
+
+    async def delete_many(self, keys: Iterable[str]):
+        keys = list(keys)
+        if keys:
+            await self.redis_client.delete(*keys)
+
+    async def get_set_members(self, keys: Iterable[str]) -> set[str]:
+        """
+        The union of the members of several sets, read in one pipelined round trip
+        """
+        keys = list(keys)
+        if not keys:
+            return set()
+
+        async with self.redis_client.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.smembers(key)
+
+            results = await pipeline.execute()
+
+        return {member.decode() for members in results for member in members}
+
+    def lock(self, name: str, timeout: float):
+        """
+        A non blocking distributed lock that expires after `timeout` seconds if it is never released
+        """
+        return self.redis_client.lock(name=name, timeout=timeout, blocking=False)
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator[RedisBatch]:
+        """
+        Usage:
+            async with redis_manager.batch() as batch:
+                batch.cache_json_item(key=key, value=value)
+                batch.delete_many(keys=stale_keys)
+        """
+        batch = RedisBatch(self)
+
+        try:
+            yield batch
+        except BaseException:
+            await batch.pipeline.reset()
+            raise
+
+        await batch.execute()
+
+    async def publish(self, channel: str, message: str):
+        await self.redis_client.publish(channel=channel, message=message)
+
+    async def close(self):
+        await self.redis_client.aclose()
+        await self.connection_pool.disconnect()
+
+    async def reset(self):
+        """
+        Closes the connections and starts over with a new pool. The pool and its connections belong to the event
+        loop they were first used in, code that runs each job in its own loop, e.g with asyncio.run, resets it
+        before that loop closes.
+        """
+        await self.close()
+        self._create_pool()
 
 
 redis_manager = RedisManager()
@@ -0,0 +1,85 @@
+"""
+Per request counters the database, Redis and auth instrumentation add to, read back by the middlewares.
+
+The middleware starts a RequestStats for every HTTP request. Code running for that request, including
+SQLAlchemy's events inside its greenlets, finds it through `current()`. Outside a request it is None.
+Durations are in nanoseconds from time.perf_counter_ns.
+"""
+
+import time
+from contextlib import contextmanager
+from collections import Counter
+from contextvars import ContextVar, Token
+from typing import Iterator, Optional
+
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestStats:
+    __slots__ = (
+        "scope",
+        "db_queries",
+        "db_ns",
+        "redis_commands",
+        "redis_ns",
+        "auth_ns",
+        "endpoint_returned_ns",
+        "statements",
+    )
+
+    def __init__(self, scope: dict) -> None:
+        self.scope = scope
+        self.db_queries = 0
+        self.db_ns = 0
+        self.redis_commands = 0
+        self.redis_ns = 0
+        self.auth_ns = 0
+        # When the route's endpoint returned, the time from then until the response starts is serialization
+        self.endpoint_returned_ns: Optional[int] = None
+        # Runs of each statement text, only recorded while a query budget mode is on
+        self.statements: Optional[Counter] = None
+
+    @property
+    def route(self) -> str:
+        """
+        The path template of the matched route, e.g /v1/visits/{visit_id}, so labels dont grow with ids
+        """
+        route = self.scope.get("route")
+
+        return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def start_request(scope: dict) -> tuple[RequestStats, Token]:
+    stats = RequestStats(scope)
+
+    return stats, _current.set(stats)
+
+
+def end_request(token: Token):
+    _current.reset(token)
+
+
+def current() -> Optional[RequestStats]:
+    return _current.get()
+
+
+@contextmanager
+def measure_auth() -> Iterator[None]:
+    start = time.perf_counter_ns()
+
+    try:
+        yield
+    finally:
+        stats = _current.get()
+        if stats is not None:
+            stats.auth_ns += time.perf_counter_ns() - start
+
+
+def mark_endpoint_returned():
+    stats = _current.get()
+    if stats is not None:
+        stats.endpoint_returned_ns = time.perf_counter_ns()
@@ -1,9 +1,23 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings
 from pydantic.networks import PostgresDsn, AnyUrl
 
 
 class Settings(BaseSettings):
     POSTGRES_URL: PostgresDsn
+    DB_POOL_SIZE: int = 10  # Per worker, so the total is this times the gunicorn workers
+    DB_MAX_OVERFLOW: int = 10  # Extra connections opened during bursts and closed once returned
+    DB_POOL_TIMEOUT: float = 10  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True  # Checks a connection is alive before handing it out, e.g after a Postgres restart
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements cached per connection, 0 disables it
+    DB_STATEMENT_TIMEOUT: int = 30000  # Milliseconds before Postgres cancels a statement, 0 disables it
+
+    POSTGRES_REPLICA_URL: Optional[PostgresDsn] = None  # Reads go to the primary when it isnt set
+    REPLICA_MAX_LAG: float = 5  # Seconds behind the primary before reads move back to the primary
+    REPLICA_HEALTH_CHECK_INTERVAL: float = 5  # Seconds
+    REPLICA_STICKY_SECONDS: int = 10  # How long a user's reads stay on the primary after they write
     ACCESS_TOKEN_SECRET: str
     REFRESH_TOKEN_SECRET: str
     RESET_PASSWORD_SECRET: str
@@ -12,6 +26,43 @@ class Settings(BaseSettings):
 
     REDIS_HOST: str
     REDIS_PORT: int
+    REDIS_MAX_CONNECTIONS: int = 50  # Per worker
+    REDIS_POOL_TIMEOUT: float = 5  # Seconds to wait for a free connection
+    REDIS_SOCKET_TIMEOUT: float = 5
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 2
+    REDIS_CACHE_CODEC: str = "orjson"  # orjson or msgpack, msgpack needs the msgpack package installed
+    REDIS_CACHE_COMPRESSION_THRESHOLD: int = 1024  # Bytes, larger values are zlib compressed
+    REDIS_CACHE_COMPRESSION_LEVEL: int = 6
+
+    DB_CACHE_TTL: int = 300  # Seconds a cached db_handler read lives
+    DB_CACHE_LOCK_TIMEOUT: float = 5  # Seconds before a stuck loader's lock expires
+    DB_CACHE_LOCK_WAIT: float = 2  # Seconds other callers wait for the loader before querying themselves
+
+    USER_AGGREGATE_CACHE_TTL: int = 3600  # Seconds a serialized /auth/me response lives
+
+    PAGINATION_DEFAULT_LIMIT: int = 50
+    PAGINATION_MAX_LIMIT: int = 200
+
+    EXPORT_CHUNK_SIZE: int = 1000  # Rows fetched per round trip when streaming a patient's record export
+
+    BULK_INSERT_CHUNK_SIZE: int = 1000  # Rows per multi-row INSERT, asyncpg allows 32767 parameters a statement
+    BULK_MAX_ITEMS: int = 50000
+
+    LAB_REPORT_IMPORT_DIR: str = "/tmp/ai_health/lab_report_imports"  # Must be shared with the RQ workers
+    LAB_REPORT_IMPORT_CHUNK_SIZE: int = 5000  # Rows validated and copied to the staging table at a time
+    LAB_REPORT_IMPORT_MAX_ERRORS: int = 1000  # Row errors kept on the job, the rest are only counted
+    LAB_REPORT_IMPORT_TIMEOUT: int = 3600
+    LAB_REPORT_IMPORT_RESULT_TTL: int = 86400  # Seconds the job status stays readable once it ended
+
+    QUERY_BUDGET_MODE: Literal["off", "log", "strict"] = "off"  # Strict raises when a route goes over its budget
+    QUERY_BUDGET_DEFAULT: int = 5  # Statements a route may run unless it declares its own budget
+    QUERY_REPEAT_THRESHOLD: int = 3  # Runs of the same SELECT in a request before it is logged as a likely N+1
+
+    RESPONSE_COMPRESSION: str = "zstd,br,gzip"  # Encodings offered, preferred first, empty disables compression
+    RESPONSE_COMPRESSION_MIN_SIZE: int = 1024  # Bytes, smaller bodies are sent uncompressed
+    RESPONSE_COMPRESSION_ZSTD_LEVEL: int = 3  # 1 to 22, needs the zstandard package installed
+    RESPONSE_COMPRESSION_BROTLI_LEVEL: int = 4  # 0 to 11, needs the brotli package installed
+    RESPONSE_COMPRESSION_GZIP_LEVEL: int = 6  # 1 to 9
 
     JWT_ALGORITHM: str
 
@@ -22,5 +73,15 @@ class Settings(BaseSettings):
 
     CLOUD_FRONT_URL: AnyUrl
 
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL: int = 60  # Seconds
+    USER_CACHE_INVALIDATION_CHANNEL: str = "user_cache_invalidations"
+
+    VERIFIED_TOKEN_CACHE_MAX_SIZE: int = 10000
+
+    PASSWORD_HASHER_EXECUTOR: str = "thread"  # thread or process
+    PASSWORD_HASHER_WORKERS: int = 4
+    PASSWORD_HASHER_MAX_QUEUE: int = 64  # Jobs waiting for a worker before new ones get a 503
+
     class Config:
         env_file = ".env"
@@ -0,0 +1,117 @@
+"""
+Serialization for values cached in Redis.
+
+Every encoded value starts with a header byte naming the codec, with the high bit set when the body is zlib
+compressed. Values written before the header existed are plain stdlib JSON, which never starts with one of the
+header bytes, so both formats can be read side by side.
+"""
+
+import json
+import zlib
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+import orjson
+from pydantic import BaseModel
+
+
+COMPRESSED_FLAG = 0x80
+
+
+def to_json_primitive(obj: Any):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Type {type(obj).__name__} is not serializable")
+
+
+class OrjsonCodec:
+    header = 0x01
+    name = "orjson"
+
+    def dumps(self, value: Any) -> bytes:
+        # orjson handles UUID, datetime and enums natively
+        return orjson.dumps(value, default=to_json_primitive)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec:
+    header = 0x02
+    name = "msgpack"
+
+    def __init__(self) -> None:
+        self._msgpack = None
+
+    @property
+    def msgpack(self):
+        # msgpack is optional, it is only needed when REDIS_CACHE_CODEC is msgpack or a msgpack value is read
+        if self._msgpack is None:
+            try:
+                import msgpack
+            except ImportError as e:
+                raise ImportError("The msgpack cache codec needs the msgpack package, pip install msgpack") from e
+
+            self._msgpack = msgpack
+
+        return self._msgpack
+
+    def dumps(self, value: Any) -> bytes:
+        return self.msgpack.packb(value, default=to_json_primitive, datetime=False)
+
+    def loads(self, data: bytes) -> Any:
+        return self.msgpack.unpackb(data)
+
+
+CODECS = {codec.header: codec for codec in (OrjsonCodec(), MsgpackCodec())}
+CODECS_BY_NAME = {codec.name: codec for codec in CODECS.values()}
+
+
+class CacheSerializer:
+    """
+    Encodes values with the configured codec and compresses the ones above the size threshold
+    """
+
+    def __init__(self, codec: str = "orjson", compression_threshold: int = 1024, compression_level: int = 6) -> None:
+        if codec not in CODECS_BY_NAME:
+            raise ValueError(f"Unknown cache codec {codec}")
+
+        self.codec = CODECS_BY_NAME[codec]
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+
+    def dumps(self, value: Any) -> bytes:
+        body = self.codec.dumps(value)
+        header = self.codec.header
+
+        if len(body) >= self.compression_threshold:
+            body = zlib.compress(body, self.compression_level)
+            header |= COMPRESSED_FLAG
+
+        return bytes((header,)) + body
+
+    def loads(self, data: bytes) -> Any:
+        if not data:
+            return None
+
+        header = data[0]
+        codec = CODECS.get(header & ~COMPRESSED_FLAG)
+
+        if codec is None:
+            # Written before the header byte was added
+            return json.loads(data)
+
+        body = data[1:]
+
+        if header & COMPRESSED_FLAG:
+            body = zlib.decompress(body)
+
+        return codec.loads(body)
@@ -0,0 +1,111 @@
+"""
+Conditional GETs, answered from the version of what a route returns before it loads anything.
+
+`conditional(version)` is a dependency of the route. `version` is a dependency too, so it gets the route's
+path and query parameters, and returns the Version of the rows the route would return, or None when there
+are none, e.g for an unknown id, or it couldnt be read, the route then answers as usual. The weak ETag and
+the Last-Modified derived from the version are set on the response, with `Cache-Control: private, no-cache`
+so clients revalidate instead of guessing a freshness from Last-Modified. When If-None-Match, or
+If-Modified-Since without it, shows the client has the response already, a 304 is raised with them before
+the endpoint runs, no rows are loaded or serialized.
+
+Declare it after the user, so unauthenticated requests still get their 401. A delete only changes the count,
+which the ETag has and Last-Modified cant tell, clients should revalidate with If-None-Match.
+
+A response served from a cache has to be versioned by what its cache entry is keyed on, or a client could be
+sent a new validator with an old body and keep revalidating it. `version` then returns that key as an int
+instead, e.g /auth/me the version its aggregate is cached under, which only gives an ETag.
+
+    async def appointments_version(filter: AppointmentFilter = Depends(AppointmentFilter)):
+        return await appointments_service.get_appointments_version(**filter.model_dump())
+
+    @appointment_router.get("/", response_model=AppointmentList)
+    async def get_all_appointments(
+        ...,
+        user: User = Depends(get_current_user),
+        _: None = Depends(conditional(appointments_version)),
+    ):
+"""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Awaitable, Callable, Mapping, Optional, Union
+
+from fastapi import Depends, HTTPException, Request, Response, status
+
+from ai_health.database.versions import Version
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def _utc(value: datetime) -> datetime:
+    # Postgres returns timezone aware values, naive ones are taken as UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def etag(version: Union[Version, int]) -> str:
+    """
+    Weak, the body is only the same semantically once it has been compressed
+    """
+    if isinstance(version, int):
+        return f'W/"{version:x}"'
+
+    microseconds = 0
+    if version.last_modified is not None:
+        microseconds = (_utc(version.last_modified) - EPOCH) // timedelta(microseconds=1)
+
+    return f'W/"{version.count:x}-{microseconds:x}"'
+
+
+def validators(version: Union[Version, int]) -> dict[str, str]:
+    headers = {"ETag": etag(version), "Cache-Control": CACHE_CONTROL}
+
+    if isinstance(version, Version) and version.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_utc(version.last_modified), usegmt=True)
+
+    return headers
+
+
+def _opaque_tags(header: str) -> set[str]:
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def is_not_modified(request_headers: Mapping[str, str], version: Union[Version, int]) -> bool:
+    """
+    If-None-Match with the weak comparison, If-Modified-Since only when there is no If-None-Match
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = _opaque_tags(if_none_match)
+        return "*" in tags or etag(version).removeprefix("W/") in tags
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since is None or not isinstance(version, Version) or version.last_modified is None:
+        return False
+
+    try:
+        since = _utc(parsedate_to_datetime(if_modified_since))
+    except (TypeError, ValueError):
+        return False
+
+    # HTTP dates have whole seconds
+    return _utc(version.last_modified).replace(microsecond=0) <= since
+
+
+def conditional(version: Callable[..., Awaitable[Optional[Union[Version, int]]]]) -> Callable[..., Awaitable[None]]:
+    async def check_version(
+        request: Request, response: Response, current: Optional[Union[Version, int]] = Depends(version)
+    ):
+        if current is None:
+            return
+
+        headers = validators(current)
+        response.headers.update(headers)
+
+        if is_not_modified(request.headers, current):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return check_version
@@ -0,0 +1,46 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from ai_health.root import metrics
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    The async engine's default pool, also recording its checked out and overflow connections, how long
+    requests waited to check a connection out and the checkouts that timed out in the db_pool_* metrics,
+    labelled with `metrics_label`.
+
+    The wait covers queueing for a free connection, opening a new one and the pre ping.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        self.metrics_label = "primary"
+
+    def connect(self):
+        start = time.perf_counter()
+        timed_out = False
+
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            metrics.observe_pool_checkout(self.metrics_label, time.perf_counter() - start, timed_out)
+            metrics.observe_pool_connections(self.metrics_label, self.checkedout(), max(self.overflow(), 0))
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+
+        metrics.observe_pool_connections(self.metrics_label, self.checkedout(), max(self.overflow(), 0))
+
+    def recreate(self):
+        # Keeps the label when the pool is recreated, e.g by engine.dispose()
+        pool = super().recreate()
+        pool.metrics_label = self.metrics_label
+
+        return pool
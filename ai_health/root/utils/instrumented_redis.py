@@ -0,0 +1,45 @@
+import time
+from typing import Optional
+
+from redis.asyncio.client import Pipeline, Redis
+from redis.exceptions import RedisError
+
+from ai_health.root import metrics
+
+
+class InstrumentedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True):
+        # An empty pipeline doesnt reach Redis, execute() resets the stack so it is counted first
+        queued = len(self.command_stack)
+        start = time.perf_counter_ns()
+        failed = False
+
+        try:
+            return await super().execute(raise_on_error=raise_on_error)
+        except RedisError:
+            failed = True
+            raise
+        finally:
+            if queued:
+                metrics.observe_redis_command("PIPELINE", time.perf_counter_ns() - start, failed=failed)
+
+
+class InstrumentedRedis(Redis):
+    """
+    The asyncio Redis client, also timing every command and pipeline it sends
+    """
+
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter_ns()
+        failed = False
+
+        try:
+            return await super().execute_command(*args, **options)
+        except RedisError:
+            failed = True
+            raise
+        finally:
+            metrics.observe_redis_command(str(args[0]).upper(), time.perf_counter_ns() - start, failed=failed)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
@@ -0,0 +1,124 @@
+"""
+Splits a JSON array arriving in chunks into its items, without holding the whole document.
+
+Only the item being read is buffered, each one is handed out as raw bytes as soon as it is complete, so it
+can be validated with model_validate_json and dropped before the next one arrives.
+
+    async for item in iter_json_array(request.stream()):
+        visit = VisitCreate.model_validate_json(item)
+"""
+
+import re
+from typing import AsyncIterable, AsyncIterator
+
+
+# Outside a string only these bytes change the structure, inside one only a quote or an escape can matter
+STRUCTURAL = re.compile(rb'[\[\]{},"]')
+STRING_END = re.compile(rb'\\.|"', re.DOTALL)
+
+WHITESPACE = b" \t\r\n"
+
+
+class JSONStreamError(ValueError): ...
+
+
+class JSONArraySplitter:
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._pos = 0  # Where scanning resumes in the buffer
+        self._item_start = 0
+        self._depth = 0  # 1 while inside the top level array
+        self._in_string = False
+        self._started = False
+        self._finished = False
+        self._expects_item = False  # A comma was read, another item must follow
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        if self._finished:
+            if chunk.strip(WHITESPACE):
+                raise JSONStreamError("Unexpected data after the end of the array")
+            return []
+
+        self._buffer += chunk
+        items = []
+
+        while not self._finished:
+            if self._in_string:
+                match = STRING_END.search(self._buffer, self._pos)
+                if match is None:
+                    # A lone backslash at the end escapes the first byte of the next chunk
+                    trailing_escape = len(self._buffer) > self._pos and self._buffer[-1] == ord("\\")
+                    self._pos = len(self._buffer) - 1 if trailing_escape else len(self._buffer)
+                    break
+
+                self._pos = match.end()
+                if match.group() == b'"':
+                    self._in_string = False
+                continue
+
+            match = STRUCTURAL.search(self._buffer, self._pos)
+            if match is None:
+                self._pos = len(self._buffer)
+                break
+
+            self._pos = match.end()
+            char = match.group()
+
+            if not self._started:
+                if char != b"[" or self._buffer[: match.start()].strip(WHITESPACE):
+                    raise JSONStreamError("Expected a JSON array")
+
+                self._started = True
+                self._depth = 1
+                self._item_start = self._pos
+            elif char == b'"':
+                self._in_string = True
+            elif char in (b"[", b"{"):
+                self._depth += 1
+            elif self._depth > 1:
+                if char in (b"]", b"}"):
+                    self._depth -= 1
+            elif char == b",":
+                items.append(self._take_item(match.start(), required=True))
+                self._expects_item = True
+            elif char == b"]":
+                item = self._take_item(match.start(), required=self._expects_item)
+                if item:
+                    items.append(item)
+
+                self._finished = True
+                if self._buffer[self._pos :].strip(WHITESPACE):
+                    raise JSONStreamError("Unexpected data after the end of the array")
+            else:
+                raise JSONStreamError("Unbalanced brackets in the JSON array")
+
+        # Drops what has been handed out, so the buffer only ever holds the item being read
+        trim = len(self._buffer) if self._finished else self._item_start
+        del self._buffer[:trim]
+        self._pos -= trim
+        self._item_start -= trim
+
+        return items
+
+    def close(self):
+        if not self._finished:
+            raise JSONStreamError("The JSON array is incomplete")
+
+    def _take_item(self, end: int, required: bool) -> bytes:
+        item = bytes(self._buffer[self._item_start : end]).strip(WHITESPACE)
+        self._item_start = end + 1
+
+        if required and not item:
+            raise JSONStreamError("Empty item in the JSON array")
+
+        return item
+
+
+async def iter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    splitter = JSONArraySplitter()
+
+    async for chunk in chunks:
+        for item in splitter.feed(chunk):
+            yield item
+
+    splitter.close()
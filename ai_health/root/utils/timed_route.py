@@ -0,0 +1,80 @@
+import asyncio
+import functools
+
+from fastapi import Response, status
+from fastapi.routing import APIRoute
+
+from ai_health.root import request_context
+from ai_health.root.settings import Settings
+from ai_health.root.utils.typed_response import TypedResponseSerializer
+
+
+settings = Settings()
+
+# The endpoint's `response` parameter, for endpoints that dont declare one
+SUB_RESPONSE_PARAM = "_timed_route_sub_response"
+
+
+class TimedAPIRoute(APIRoute):
+    """
+    Notes in the request context when the endpoint returns, so ServerTimingMiddleware can tell the time
+    FastAPI then spends validating, serializing and rendering the response.
+
+    Also holds the route's query budget, the one declared with @query_budget or QUERY_BUDGET_DEFAULT, and
+    serializes the results of endpoints marked with @typed_response itself.
+
+    FastAPI drops the headers set on the `response` parameter, e.g by a `conditional` dependency, when the
+    endpoint returns a Response, they are copied onto it here.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        self.query_budget: int = getattr(self.endpoint, "query_budget", settings.QUERY_BUDGET_DEFAULT)
+
+        serializer = None
+        if getattr(self.endpoint, "typed_response", False):
+            if self.response_model is None:
+                raise ValueError(f"{self.path} is marked with @typed_response but has no response_model")
+
+            serializer = TypedResponseSerializer(self.response_model, self.status_code or status.HTTP_200_OK)
+
+        # FastAPI passes the `response` parameter to the endpoint only if it declares one
+        sub_response_param = self.dependant.response_param_name
+        endpoint_takes_response = sub_response_param is not None
+        if not endpoint_takes_response:
+            sub_response_param = self.dependant.response_param_name = SUB_RESPONSE_PARAM
+
+        def respond(result, sub_response: Response):
+            # Marked before a typed response is dumped, so the dump still counts as serialization
+            request_context.mark_endpoint_returned()
+
+            if serializer is not None:
+                result = serializer.response(result)
+
+            if isinstance(result, Response) and sub_response.headers:
+                result.headers.raw.extend(sub_response.headers.raw)
+
+            return result
+
+        def sub_response_of(kwargs) -> Response:
+            return kwargs[sub_response_param] if endpoint_takes_response else kwargs.pop(sub_response_param)
+
+        # The dependant was built from the endpoint already, only the call itself is wrapped
+        endpoint = self.dependant.call
+
+        if asyncio.iscoroutinefunction(endpoint):
+
+            @functools.wraps(endpoint)
+            async def timed_endpoint(*args, **kwargs):
+                sub_response = sub_response_of(kwargs)
+                return respond(await endpoint(*args, **kwargs), sub_response)
+
+        else:
+
+            @functools.wraps(endpoint)
+            def timed_endpoint(*args, **kwargs):
+                sub_response = sub_response_of(kwargs)
+                return respond(endpoint(*args, **kwargs), sub_response)
+
+        self.dependant.call = timed_endpoint
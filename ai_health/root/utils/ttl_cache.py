@@ -0,0 +1,97 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, Optional
+
+from ai_health.root import metrics
+
+
+class TTLCache:
+    """
+    A bounded, in-process LRU cache whose entries expire after a time to live.
+
+    Each gunicorn worker holds its own instance. When the cache is full the least recently used entry is evicted.
+    Hits, misses and evictions are counted so the cache effectiveness can be observed, in `stats()` and in the
+    cache_* metrics labelled with `name`.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60, name: str = "unnamed") -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.name = name
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Bound once, the lookups are on the path of every request
+        self._hit_counter = metrics.CACHE_LOOKUPS.labels(name, "hit")
+        self._miss_counter = metrics.CACHE_LOOKUPS.labels(name, "miss")
+        self._eviction_counter = metrics.CACHE_EVICTIONS.labels(name)
+        self._entries_gauge = metrics.CACHE_ENTRIES.labels(name)
+
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+
+            if item is None:
+                self.misses += 1
+                self._miss_counter.inc()
+                return None
+
+            expires_at, value = item
+
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                self._miss_counter.inc()
+                self._entries_gauge.set(len(self._data))
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            self._hit_counter.inc()
+
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Stores a value, the cache default ttl is used if no ttl is given
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+                self._eviction_counter.inc()
+
+            self._entries_gauge.set(len(self._data))
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+            self._entries_gauge.set(len(self._data))
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._entries_gauge.set(0)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
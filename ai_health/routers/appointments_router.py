@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from ai_health.schemas.appointment_schema import (
     AppointmentCreate,
     Appointment,
@@ -6,11 +6,18 @@ from ai_health.schemas.appointment_schema import (
     AppointmentList,
     AppointmentUpdate,
 )
+from ai_health.schemas.bulk_schema import BulkResult, bulk_request_body
+from ai_health.schemas.pagination_schema import PaginationParams
 from ai_health.services import appointments_service
 from ai_health.services.utils.auth_utils import get_current_user
+from ai_health.services.utils.bulk import BULK_QUERY_BUDGET
 from ai_health.schemas.auth_schemas import User, UserType
+from ai_health.root.query_budget import query_budget
+from ai_health.root.utils.conditional import conditional
+from ai_health.root.utils.timed_route import TimedAPIRoute
+from ai_health.root.utils.typed_response import typed_response
 
-appointment_router = APIRouter(prefix="/appointments", tags=["Appointment Management"])
+appointment_router = APIRouter(prefix="/appointments", tags=["Appointment Management"], route_class=TimedAPIRoute)
 
 
 @appointment_router.post("/", response_model=Appointment)
@@ -18,16 +25,37 @@ async def create_appointment(appointment_create: AppointmentCreate, user: User =
     return await appointments_service.create_appointment(appointment_create)
 
 
+@appointment_router.post(
+    "/bulk", response_model=BulkResult[Appointment], openapi_extra=bulk_request_body(AppointmentCreate)
+)
+@query_budget(BULK_QUERY_BUDGET)
+async def create_appointments_bulk(request: Request, user: User = Depends(get_current_user)):
+    # The array is read from the body as it arrives instead of being parsed into a list up front
+    return await appointments_service.create_appointments_bulk(request.stream())
+
+
 @appointment_router.get("/{appointment_id}", response_model=Appointment)
-async def get_appointment(appointment_id: str, user: User = Depends(get_current_user)):
+async def get_appointment(
+    appointment_id: str,
+    user: User = Depends(get_current_user),
+    _: None = Depends(conditional(appointments_service.get_appointment_version)),
+):
     return await appointments_service.get_appointment_by_id(appointment_id)
 
 
+async def appointments_version(filter: AppointmentFilter = Depends(AppointmentFilter)):
+    return await appointments_service.get_all_appointments_version(**filter.model_dump())
+
+
 @appointment_router.get("/", response_model=AppointmentList)
+@typed_response
 async def get_all_appointments(
-    filter: AppointmentFilter = Depends(AppointmentFilter), user: User = Depends(get_current_user)
+    filter: AppointmentFilter = Depends(AppointmentFilter),
+    pagination: PaginationParams = Depends(PaginationParams),
+    user: User = Depends(get_current_user),
+    _: None = Depends(conditional(appointments_version)),
 ):
-    return await appointments_service.get_all_appointments(**filter.model_dump())
+    return await appointments_service.get_all_appointments(**filter.model_dump(), pagination=pagination)
 
 
 @appointment_router.patch("/{appointment_id}", response_model=Appointment)
@@ -1,5 +1,6 @@
 from typing import Annotated
-from fastapi import APIRouter, Body, Depends
+from fastapi import APIRouter, Body, Depends, Response
+from fastapi.responses import StreamingResponse
 from ai_health.schemas.auth_schemas import (
     Login,
     ResetPassword,
@@ -15,9 +16,12 @@ from ai_health.schemas.auth_schemas import (
 from ai_health.schemas.response_info_schema import ResponseInfo
 from ai_health.services import auth_services
 from ai_health.services.utils import auth_utils
+from ai_health.root.query_budget import query_budget
+from ai_health.root.utils.conditional import conditional
+from ai_health.root.utils.timed_route import TimedAPIRoute
 
 
-auth_router = APIRouter(prefix="/auth", tags=["Authentication"])
+auth_router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=TimedAPIRoute)
 
 
 @auth_router.post("/signup", response_model=Token)
@@ -45,9 +49,30 @@ async def resend_verification_otp(email: str = Body(embed=True)):
     return await auth_services.resend_verification_otp(user_email=email)
 
 
+async def me_version(user: User = Depends(auth_utils.get_current_user)):
+    return await auth_services.get_complete_user_details_version(user_id=user.user_id)
+
+
 @auth_router.get("/me", response_model=UserWithAllRelations)
-async def me(user: User = Depends(auth_utils.get_current_user)):
-    return await auth_services.get_complete_user_details_by_id(user_id=user.user_id)
+@query_budget(8)  # The user, then one query per relation unless the aggregate is cached
+async def me(
+    user: User = Depends(auth_utils.get_current_user),
+    _: None = Depends(conditional(me_version)),
+):
+    # The service returns the user already serialized, returning a Response skips the response_model validation
+    user_details = await auth_services.get_complete_user_details_by_id(user_id=user.user_id)
+
+    return Response(content=user_details, media_type="application/json")
+
+
+@auth_router.get("/me/export", response_class=StreamingResponse)
+@query_budget(8)  # The user, then one server side cursor per relation
+async def export_me(user: User = Depends(auth_utils.get_current_user)):
+    return StreamingResponse(
+        auth_services.export_user_records(user=user),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="ai-health-export.ndjson"'},
+    )
 
 
 @auth_router.post("/refresh-token", response_model=Token)
@@ -9,15 +9,21 @@ from ai_health.schemas.billings_schema import (
     BillingWithDoctor,
     BillingsWithDoctorList,
 )
+from ai_health.schemas.pagination_schema import PaginationParams
 from ai_health.services.billing_service import (
     create_billing_service,
     get_billing_service,
     update_billing_service,
     delete_billing_service,
     get_billings_for_user,
+    get_billing_version,
+    get_billings_version,
 )
+from ai_health.root.utils.conditional import conditional
+from ai_health.root.utils.timed_route import TimedAPIRoute
+from ai_health.root.utils.typed_response import typed_response
 
-billing_router = APIRouter(prefix="/billings", tags=["Billing Management"])
+billing_router = APIRouter(prefix="/billings", tags=["Billing Management"], route_class=TimedAPIRoute)
 
 
 @billing_router.post("/", response_model=Billing)
@@ -25,13 +31,26 @@ async def create_billing(billing_create: BillingCreate, user: User = Depends(get
     return await create_billing_service(billing_create)
 
 
+async def billings_version(user: User = Depends(get_current_user)):
+    return await get_billings_version(user_id=user.user_id.hex)
+
+
 @billing_router.get("/", response_model=BillingsWithDoctorList)
-async def get_billings(user: User = Depends(get_current_user)):
-    return await get_billings_for_user(user_id=user.user_id.hex)
+@typed_response
+async def get_billings(
+    pagination: PaginationParams = Depends(PaginationParams),
+    user: User = Depends(get_current_user),
+    _: None = Depends(conditional(billings_version)),
+):
+    return await get_billings_for_user(user_id=user.user_id.hex, pagination=pagination)
 
 
 @billing_router.get("/{billing_id}", response_model=BillingWithDoctor)
-async def get_billing(billing_id: str, user: User = Depends(get_current_user)):
+async def get_billing(
+    billing_id: str,
+    user: User = Depends(get_current_user),
+    _: None = Depends(conditional(get_billing_version)),
+):
     return await get_billing_service(billing_id)
 
 
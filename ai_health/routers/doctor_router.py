@@ -1,11 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from uuid import UUID
 from ai_health.schemas.doctor_schema import DoctorCreate, DoctorUpdate, Doctor, DoctorList
+from ai_health.schemas.pagination_schema import PaginationParams
 from ai_health.services import doctor_service
 from ai_health.services.utils.auth_utils import get_current_user
 from ai_health.schemas.auth_schemas import User, UserType
+from ai_health.root.utils.conditional import conditional
+from ai_health.root.utils.timed_route import TimedAPIRoute
+from ai_health.root.utils.typed_response import typed_response
 
-doctor_router = APIRouter(prefix="/doctors", tags=["Doctor Management"])
+doctor_router = APIRouter(prefix="/doctors", tags=["Doctor Management"], route_class=TimedAPIRoute)
 
 
 @doctor_router.post("/", response_model=Doctor)
@@ -18,7 +22,11 @@ async def create_doctor(doctor_create: DoctorCreate, user: User = Depends(get_cu
 
 
 @doctor_router.get("/{doctor_id}", response_model=Doctor)
-async def get_doctor(doctor_id: UUID, user: User = Depends(get_current_user)):
+async def get_doctor(
+    doctor_id: UUID,
+    user: User = Depends(get_current_user),
+    _: None = Depends(conditional(doctor_service.get_doctor_version)),
+):
     return await doctor_service.get_doctor(doctor_id)
 
 
@@ -40,10 +48,19 @@ async def delete_doctor(doctor_id: UUID, user: User = Depends(get_current_user))
     await doctor_service.delete_doctor(doctor_id)
 
 
+async def doctors_version(pagination: PaginationParams = Depends(PaginationParams)):
+    return await doctor_service.get_all_doctors_version(pagination=pagination)
+
+
 @doctor_router.get("/", response_model=DoctorList)
-async def get_all_doctors(user: User = Depends(get_current_user)):
+@typed_response
+async def get_all_doctors(
+    pagination: PaginationParams = Depends(PaginationParams),
+    user: User = Depends(get_current_user),
+    _: None = Depends(conditional(doctors_version)),
+):
     # if user.user_type != UserType.ADMIN:
     #     raise HTTPException(
     #         status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to access this resource"
     #     )
-    return await doctor_service.get_all_doctors()
+    return await doctor_service.get_all_doctors(pagination=pagination)
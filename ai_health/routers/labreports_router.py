@@ -1,15 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
 from ai_health.schemas.lab_report_schema import (
     LabReportCreate,
     LabReport,
+    LabReportImportJob,
+    LabReportImportStatus,
     LabReportList,
     LabReportUpdate,
 )
+from ai_health.schemas.bulk_schema import BulkResult, bulk_request_body
+from ai_health.schemas.pagination_schema import PaginationParams
 from ai_health.services import lab_reports
 from ai_health.services.utils.auth_utils import get_current_user
+from ai_health.services.utils.bulk import BULK_QUERY_BUDGET
 from ai_health.schemas.auth_schemas import User, UserType
+from ai_health.root.query_budget import query_budget
+from ai_health.root.utils.conditional import conditional
+from ai_health.root.utils.timed_route import TimedAPIRoute
+from ai_health.root.utils.typed_response import typed_response
 
-lab_report_router = APIRouter(prefix="/lab_reports", tags=["Lab Report Management"])
+lab_report_router = APIRouter(prefix="/lab_reports", tags=["Lab Report Management"], route_class=TimedAPIRoute)
 
 
 @lab_report_router.post("/", response_model=LabReport)
@@ -17,14 +26,42 @@ async def create_lab_report(lab_report_create: LabReportCreate, user: User = Dep
     return await lab_reports.create_lab_report(lab_report_create)
 
 
+@lab_report_router.post(
+    "/bulk", response_model=BulkResult[LabReport], openapi_extra=bulk_request_body(LabReportCreate)
+)
+@query_budget(BULK_QUERY_BUDGET)
+async def create_lab_reports_bulk(request: Request, user: User = Depends(get_current_user)):
+    # The array is read from the body as it arrives instead of being parsed into a list up front
+    return await lab_reports.create_lab_reports_bulk(request.stream())
+
+
+@lab_report_router.post("/imports", response_model=LabReportImportJob, status_code=status.HTTP_202_ACCEPTED)
+async def import_lab_reports(file: UploadFile = File(...), user: User = Depends(get_current_user)):
+    return await lab_reports.start_lab_report_import(file)
+
+
+@lab_report_router.get("/imports/{job_id}", response_model=LabReportImportStatus)
+async def get_lab_report_import(job_id: str, user: User = Depends(get_current_user)):
+    return await lab_reports.get_lab_report_import(job_id)
+
+
 @lab_report_router.get("/{lab_report_id}", response_model=LabReport)
-async def get_lab_report(lab_report_id: str, user: User = Depends(get_current_user)):
+async def get_lab_report(
+    lab_report_id: str,
+    user: User = Depends(get_current_user),
+    _: None = Depends(conditional(lab_reports.get_lab_report_version)),
+):
     return await lab_reports.get_lab_report_by_id(lab_report_id)
 
 
 @lab_report_router.get("/", response_model=LabReportList)
-async def get_all_lab_reports(user: User = Depends(get_current_user)):
-    return await lab_reports.get_all_lab_reports()
+@typed_response
+async def get_all_lab_reports(
+    pagination: PaginationParams = Depends(PaginationParams),
+    user: User = Depends(get_current_user),
+    _: None = Depends(conditional(lab_reports.get_all_lab_reports_version)),
+):
+    return await lab_reports.get_all_lab_reports(pagination=pagination)
 
 
 @lab_report_router.patch("/{lab_report_id}", response_model=LabReport)
@@ -5,11 +5,17 @@ from ai_health.schemas.medical_history_schema import (
     MedicalHistoryList,
     MedicalHistoryUpdate,
 )
+from ai_health.schemas.pagination_schema import PaginationParams
 from ai_health.services import medical_history_service
 from ai_health.services.utils.auth_utils import get_current_user
 from ai_health.schemas.auth_schemas import User, UserType
+from ai_health.root.utils.conditional import conditional
+from ai_health.root.utils.timed_route import TimedAPIRoute
+from ai_health.root.utils.typed_response import typed_response
 
-medical_history_router = APIRouter(prefix="/medical_history", tags=["Medical History Management"])
+medical_history_router = APIRouter(
+    prefix="/medical_history", tags=["Medical History Management"], route_class=TimedAPIRoute
+)
 
 
 @medical_history_router.post("/", response_model=MedicalHistory)
@@ -18,13 +24,22 @@ async def create_medical_history(medical_history_create: MedicalHistoryCreate, u
 
 
 @medical_history_router.get("/{medical_history_id}", response_model=MedicalHistory)
-async def get_medical_history(medical_history_id: str, user: User = Depends(get_current_user)):
+async def get_medical_history(
+    medical_history_id: str,
+    user: User = Depends(get_current_user),
+    _: None = Depends(conditional(medical_history_service.get_medical_history_version)),
+):
     return await medical_history_service.get_medical_history_by_id(medical_history_id)
 
 
 @medical_history_router.get("/", response_model=MedicalHistoryList)
-async def get_all_medical_histories(user: User = Depends(get_current_user)):
-    return await medical_history_service.get_all_medical_histories()
+@typed_response
+async def get_all_medical_histories(
+    pagination: PaginationParams = Depends(PaginationParams),
+    user: User = Depends(get_current_user),
+    _: None = Depends(conditional(medical_history_service.get_all_medical_histories_version)),
+):
+    return await medical_history_service.get_all_medical_histories(pagination=pagination)
 
 
 @medical_history_router.patch("/{medical_history_id}", response_model=MedicalHistory)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from ai_health.schemas.medication_schema import (
     MedicationCreate,
     Medication,
@@ -6,11 +6,18 @@ from ai_health.schemas.medication_schema import (
     MedicationList,
     MedicationUpdate,
 )
+from ai_health.schemas.bulk_schema import BulkResult, bulk_request_body
+from ai_health.schemas.pagination_schema import PaginationParams
 from ai_health.services import medications_service
 from ai_health.services.utils.auth_utils import get_current_user
+from ai_health.services.utils.bulk import BULK_QUERY_BUDGET
 from ai_health.schemas.auth_schemas import User, UserType
+from ai_health.root.query_budget import query_budget
+from ai_health.root.utils.conditional import conditional
+from ai_health.root.utils.timed_route import TimedAPIRoute
+from ai_health.root.utils.typed_response import typed_response
 
-medication_router = APIRouter(prefix="/medications", tags=["Medication Management"])
+medication_router = APIRouter(prefix="/medications", tags=["Medication Management"], route_class=TimedAPIRoute)
 
 
 @medication_router.post("/", response_model=Medication)
@@ -18,14 +25,37 @@ async def create_medication(medication_create: MedicationCreate, user: User = De
     return await medications_service.create_medication(medication_create)
 
 
+@medication_router.post(
+    "/bulk", response_model=BulkResult[Medication], openapi_extra=bulk_request_body(MedicationCreate)
+)
+@query_budget(BULK_QUERY_BUDGET)
+async def create_medications_bulk(request: Request, user: User = Depends(get_current_user)):
+    # The array is read from the body as it arrives instead of being parsed into a list up front
+    return await medications_service.create_medications_bulk(request.stream())
+
+
 @medication_router.get("/{medication_id}", response_model=Medication)
-async def get_medication(medication_id: str, user: User = Depends(get_current_user)):
+async def get_medication(
+    medication_id: str,
+    user: User = Depends(get_current_user),
+    _: None = Depends(conditional(medications_service.get_medication_version)),
+):
     return await medications_service.get_medication_by_id(medication_id)
 
 
+async def medications_version(filter: MedicationFilter = Depends(MedicationFilter)):
+    return await medications_service.get_all_medications_version(**filter.model_dump())
+
+
 @medication_router.get("/", response_model=MedicationList)
-async def get_all_medications(filter: MedicationFilter = Depends(MedicationFilter) ,user: User = Depends(get_current_user)):
-    return await medications_service.get_all_medications(**filter.model_dump())
+@typed_response
+async def get_all_medications(
+    filter: MedicationFilter = Depends(MedicationFilter),
+    pagination: PaginationParams = Depends(PaginationParams),
+    user: User = Depends(get_current_user),
+    _: None = Depends(conditional(medications_version)),
+):
+    return await medications_service.get_all_medications(**filter.model_dump(), pagination=pagination)
 
 
 @medication_router.patch("/{medication_id}", response_model=Medication)
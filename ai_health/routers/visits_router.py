@@ -1,15 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from ai_health.schemas.visits_schema import (
     VisitCreate,
     Visit,
     VisitList,
     VisitUpdate,
 )
+from ai_health.schemas.bulk_schema import BulkResult, bulk_request_body
+from ai_health.schemas.pagination_schema import PaginationParams
 from ai_health.services import visits_service
 from ai_health.services.utils.auth_utils import get_current_user
+from ai_health.services.utils.bulk import BULK_QUERY_BUDGET
 from ai_health.schemas.auth_schemas import User, UserType
+from ai_health.root.query_budget import query_budget
+from ai_health.root.utils.conditional import conditional
+from ai_health.root.utils.timed_route import TimedAPIRoute
+from ai_health.root.utils.typed_response import typed_response
 
-visit_router = APIRouter(prefix="/visits", tags=["Visit Management"])
+visit_router = APIRouter(prefix="/visits", tags=["Visit Management"], route_class=TimedAPIRoute)
 
 
 @visit_router.post("/", response_model=Visit)
@@ -17,14 +24,30 @@ async def create_visit(visit_create: VisitCreate, user: User = Depends(get_curre
     return await visits_service.create_visit(visit_create)
 
 
+@visit_router.post("/bulk", response_model=BulkResult[Visit], openapi_extra=bulk_request_body(VisitCreate))
+@query_budget(BULK_QUERY_BUDGET)
+async def create_visits_bulk(request: Request, user: User = Depends(get_current_user)):
+    # The array is read from the body as it arrives instead of being parsed into a list up front
+    return await visits_service.create_visits_bulk(request.stream())
+
+
 @visit_router.get("/{visit_id}", response_model=Visit)
-async def get_visit(visit_id: str, user: User = Depends(get_current_user)):
+async def get_visit(
+    visit_id: str,
+    user: User = Depends(get_current_user),
+    _: None = Depends(conditional(visits_service.get_visit_version)),
+):
     return await visits_service.get_visit_by_id(visit_id)
 
 
 @visit_router.get("/", response_model=VisitList)
-async def get_all_visits(user: User = Depends(get_current_user)):
-    return await visits_service.get_all_visits()
+@typed_response
+async def get_all_visits(
+    pagination: PaginationParams = Depends(PaginationParams),
+    user: User = Depends(get_current_user),
+    _: None = Depends(conditional(visits_service.get_all_visits_version)),
+):
+    return await visits_service.get_all_visits(pagination=pagination)
 
 
 @visit_router.patch("/{visit_id}", response_model=Visit)
@@ -42,3 +42,4 @@ class AppointmentWithDoctor(Appointment):
 class AppointmentList(BaseModel):
     detail: str
     appointments: List[AppointmentWithDoctor]
+    next_cursor: Optional[str] = None
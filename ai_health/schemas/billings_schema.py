@@ -35,4 +35,5 @@ class BillingWithDoctor(Billing):
 
 class BillingsWithDoctorList(BaseModel):
     detail: str = "Billings gotten"
-    billings: list[BillingWithDoctor]
\ No newline at end of file
+    billings: list[BillingWithDoctor]
+    next_cursor: Optional[str] = None
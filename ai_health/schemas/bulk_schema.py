@@ -0,0 +1,31 @@
+from typing import Any, Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+
+RecordT = TypeVar("RecordT", bound=BaseModel)
+
+
+class BulkItemResult(BaseModel, Generic[RecordT]):
+    index: int  # Position of the item in the request array
+    record: Optional[RecordT] = None
+    errors: Optional[List[dict[str, Any]]] = None
+
+
+class BulkResult(BaseModel, Generic[RecordT]):
+    detail: str
+    created: int
+    failed: int
+    items: List[BulkItemResult[RecordT]]
+
+
+def bulk_request_body(create_schema: type[BaseModel]) -> dict:
+    """
+    OpenAPI request body of a bulk route, which reads the array itself instead of declaring a body parameter
+    """
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": {"type": "array", "items": create_schema.model_json_schema()}}},
+        }
+    }
@@ -29,3 +29,4 @@ class Doctor(DoctorBase):
 
 class DoctorList(BaseModel):
     doctors: List[Doctor]
+    next_cursor: Optional[str] = None
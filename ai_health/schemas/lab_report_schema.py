@@ -1,7 +1,7 @@
 from datetime import datetime
 from pydantic import BaseModel, Field
 from uuid import UUID
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from ai_health.root.utils.base_models_abstract import AbstractModel
 
@@ -33,7 +33,35 @@ class LabReport(LabReportBase):
 class LabReportList(BaseModel):
     detail: str
     lab_reports: List[LabReport]
+    next_cursor: Optional[str] = None
 
 
 class LabReportFilter(BaseModel):
     patient_id: Optional[UUID] = None
+
+
+class LabReportImportJob(BaseModel):
+    job_id: str
+    status: str
+
+
+class LabReportImportRowError(BaseModel):
+    row: int  # 1 based data row of the file, the header not counted
+    errors: List[dict[str, Any]]
+
+
+class LabReportImportResult(BaseModel):
+    imported: int
+    duplicates: int  # Already in labreports, or repeated in the file
+    unknown_patients: int  # Rows whose patient_id matches no user
+
+
+class LabReportImportStatus(BaseModel):
+    job_id: str
+    status: str
+    stage: Optional[str] = None
+    rows_read: int = 0
+    rows_invalid: int = 0
+    errors: List[LabReportImportRowError] = []
+    result: Optional[LabReportImportResult] = None
+    detail: Optional[str] = None
@@ -31,3 +31,4 @@ class MedicalHistory(MedicalHistoryBase):
 class MedicalHistoryList(AbstractModel):
     detail: str
     medical_histories: List[MedicalHistory]
+    next_cursor: Optional[str] = None
@@ -35,6 +35,7 @@ class Medication(MedicationBase):
 class MedicationList(BaseModel):
     detail: str
     medications: List[Medication]
+    next_cursor: Optional[str] = None
 
 class MedicationFilter(BaseModel):
     doctor_id: Optional[UUID] = None
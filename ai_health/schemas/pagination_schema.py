@@ -0,0 +1,13 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from ai_health.root.settings import Settings
+
+
+settings = Settings()
+
+
+class PaginationParams(BaseModel):
+    limit: int = Field(default=settings.PAGINATION_DEFAULT_LIMIT, ge=1, le=settings.PAGINATION_MAX_LIMIT)
+    cursor: Optional[str] = None
@@ -38,6 +38,7 @@ class Visit(VisitBase):
 class VisitList(BaseModel):
     detail: str
     visits: List[Visit]
+    next_cursor: Optional[str] = None
 
 class VisitWithDoctor(Visit):
     doctor: Doctor
\ No newline at end of file
@@ -1,10 +1,19 @@
 import logging
+from typing import AsyncIterable, Optional
 from datetime import datetime, timezone
 from fastapi import HTTPException, status
 
 from ai_health.schemas.appointment_schema import AppointmentCreate, AppointmentUpdate, Appointment, AppointmentList
 from ai_health.database.db_handlers import appointments_db_handler
-from ai_health.services.utils.exceptions import RecordExistsException, ServiceException, NotFoundException
+from ai_health.database.versions import Version
+from ai_health.schemas.pagination_schema import PaginationParams
+from ai_health.services.utils import bulk
+from ai_health.services.utils.exceptions import (
+    BadRequestException,
+    NotFoundException,
+    RecordExistsException,
+    ServiceException,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +34,16 @@ async def create_appointment(appointment_create: AppointmentCreate):
     return Appointment(**created_appointment.model_dump())
 
 
+async def create_appointments_bulk(body: AsyncIterable[bytes]):
+    return await bulk.create_in_bulk(
+        body,
+        AppointmentCreate,
+        Appointment,
+        appointments_db_handler.create_appointments,
+        detail="Appointments created",
+    )
+
+
 async def get_appointment_by_id(appointment_id: str):
     try:
         appointment = await appointments_db_handler.get_appointment(appointment_id)
@@ -39,9 +58,23 @@ async def get_appointment_by_id(appointment_id: str):
     return Appointment(**appointment.model_dump())
 
 
-async def get_all_appointments(patient_id: str = None, doctor_id: str = None):
+async def get_appointment_version(appointment_id: str) -> Optional[Version]:
+    try:
+        return await appointments_db_handler.get_appointment_version(appointment_id)
+    except Exception as e:
+        LOGGER.exception(e)
+        return None
+
+
+async def get_all_appointments(
+    patient_id: str = None, doctor_id: str = None, pagination: PaginationParams = PaginationParams()
+):
     try:
-        appointments = await appointments_db_handler.get_appointments(patient_id=patient_id, doctor_id=doctor_id)
+        appointments = await appointments_db_handler.get_appointments(
+            limit=pagination.limit, cursor=pagination.cursor, patient_id=patient_id, doctor_id=doctor_id
+        )
+    except BadRequestException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except ServiceException as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     except Exception as e:
@@ -51,6 +84,14 @@ async def get_all_appointments(patient_id: str = None, doctor_id: str = None):
     return appointments
 
 
+async def get_all_appointments_version(patient_id: str = None, doctor_id: str = None) -> Optional[Version]:
+    try:
+        return await appointments_db_handler.get_appointments_version(patient_id=patient_id, doctor_id=doctor_id)
+    except Exception as e:
+        LOGGER.exception(e)
+        return None
+
+
 async def update_appointment(appointment_id: str, appointment_update: AppointmentUpdate):
     try:
         updated_appointment = await appointments_db_handler.update_appointment(appointment_id, appointment_update)
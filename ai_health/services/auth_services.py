@@ -1,9 +1,11 @@
 from datetime import datetime
 import traceback
+from typing import AsyncIterator, Optional
 import uuid
 
 from fastapi import HTTPException, status
 import nanoid
+import orjson
 
 from ai_health.schemas.auth_schemas import (
     Login,
@@ -20,7 +22,7 @@ from ai_health.schemas.auth_schemas import (
     VerifyRestPasswordToken,
 )
 from ai_health.schemas.response_info_schema import ResponseInfo
-from ai_health.services.utils import auth_utils, token_utils
+from ai_health.services.utils import auth_utils, token_utils, user_aggregate_cache
 from ai_health.database.db_handlers import auth_db_handler
 from ai_health.services.utils.exceptions import NotFoundException, RecordExistsException, ServiceException
 from ai_health.job_manager import job_runner
@@ -34,7 +36,7 @@ async def signup(signup_user: SignUpUser) -> Token:
 
     sign_up_data = signup_user.model_dump()
 
-    hashed_password = auth_utils.get_password_hash(password=signup_user.password)
+    hashed_password = await auth_utils.get_password_hash(password=signup_user.password)
     sign_up_data["password"] = hashed_password
     sign_up_data["date_created"] = datetime.now()
 
@@ -59,7 +61,7 @@ async def signup(signup_user: SignUpUser) -> Token:
     # Save Otp Data to redis
     data = {"user_email": signup_user.email, "otp": otp}
     key = token_utils.gen_otp_verification_redis_key(user_email=signup_user.email)
-    redis_manager.cache_json_item(key=key, value=data)
+    await redis_manager.cache_json_item(key=key, value=data)
 
     # Send the email to the client
     # payload = {
@@ -86,7 +88,7 @@ async def verify_account_verification_otp(otp: str, user_email: str) -> Response
     """
 
     key = token_utils.gen_otp_verification_redis_key(user_email=user_email)
-    data = redis_manager.get_cached_json_item(key=key)
+    data = await redis_manager.get_cached_json_item(key=key)
 
     if data is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"OTP invalid, it has expired")
@@ -112,7 +114,7 @@ async def verify_account_verification_otp(otp: str, user_email: str) -> Response
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unknown error occurred")
 
-    redis_manager.delete_key(key=key)
+    await redis_manager.delete_key(key=key)
 
     # return User(**user.model_dump())
     return ResponseInfo(details="Account verified successfully")
@@ -142,7 +144,7 @@ async def resend_verification_otp(user_email: str) -> ResponseInfo:
     # Save Otp Data to redis
     data = {"user_email": user_email, "otp": otp}
     key = token_utils.gen_otp_verification_redis_key(user_email=user_email)
-    redis_manager.cache_json_item(key=key, value=data)
+    await redis_manager.cache_json_item(key=key, value=data)
 
     # Send the email to the client
     payload = {
@@ -174,7 +176,9 @@ async def signin(login_data: Login) -> SigninResponse:
         print(e)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unknown error occurred")
 
-    is_password_valid = auth_utils.verify_password(plain_password=login_data.password, hashed_password=user.password)
+    is_password_valid = await auth_utils.verify_password(
+        plain_password=login_data.password, hashed_password=user.password
+    )
 
     if not is_password_valid:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Email or password is invalid")
@@ -232,7 +236,7 @@ async def request_forgot_password_link(user_email: str):
     # The data would contain the user email.
     # Cache in redis
     data = {"user_email": user_email}
-    redis_manager.cache_json_item(key=unique_token, value=data)
+    await redis_manager.cache_json_item(key=unique_token, value=data)
 
     # Send the email to the client
     payload = {
@@ -255,7 +259,7 @@ async def verify_reset_password_token(verify_password_token: str):
     """
     Verify the reset password token
     """
-    data = redis_manager.get_cached_json_item(key=verify_password_token)
+    data = await redis_manager.get_cached_json_item(key=verify_password_token)
 
     if data is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Token is invalid")
@@ -266,7 +270,7 @@ async def verify_reset_password_token(verify_password_token: str):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Token is invalid")
 
     # Delete the token from the redis cache
-    redis_manager.delete_key(key=verify_password_token)
+    await redis_manager.delete_key(key=verify_password_token)
 
     # Since the email is verified now, get a an encrypted token to be sent to the user to rest the password
     data = {"user_email": user_email}
@@ -296,7 +300,7 @@ async def reset_password(reset_password: ResetPassword):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unknown error occurred")
 
     user_email = jwt_data.get("user_email", None)
-    password_hash = auth_utils.get_password_hash(password=reset_password.password)
+    password_hash = await auth_utils.get_password_hash(password=reset_password.password)
 
     user_edit_data = UserEdit(**{"password": password_hash})
 
@@ -309,10 +313,17 @@ async def reset_password(reset_password: ResetPassword):
 
     return ResponseInfo(details="Password reset successfully!")
 
-async def get_complete_user_details_by_id(user_id: str) -> User:
+async def get_complete_user_details_by_id(user_id: str) -> bytes:
     """
-    Get a user by id
+    Get a user by id with all their records, as serialized JSON.
+
+    It is served from the user aggregate cache when the user's records havent changed since it was built.
     """
+    version, cached_user = await user_aggregate_cache.get_cached_aggregate(user_id=user_id)
+
+    if cached_user is not None:
+        return cached_user
+
     try:
         user = await auth_db_handler.get_user_with_id_and_relations(user_id=user_id)
     except NotFoundException as e:
@@ -325,4 +336,35 @@ async def get_complete_user_details_by_id(user_id: str) -> User:
         traceback.print_exc()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unknown error occurred")
 
-    return user
\ No newline at end of file
+    serialized_user = user.model_dump_json().encode()
+
+    await user_aggregate_cache.cache_aggregate(user_id=user_id, version=version, aggregate=serialized_user)
+
+    return serialized_user
+
+
+async def get_complete_user_details_version(user_id: str) -> Optional[int]:
+    """
+    The version the user's aggregate is cached under, see user_aggregate_cache
+    """
+    return await user_aggregate_cache.get_version(user_id=user_id)
+
+
+def _export_line(record_type: str, record) -> bytes:
+    return orjson.dumps({"type": record_type, "data": record.model_dump(mode="json")}) + b"\n"
+
+
+async def export_user_records(user: User) -> AsyncIterator[bytes]:
+    """
+    Streams the user's profile and then every one of their records as NDJSON, a chunk of lines at a time
+    """
+    yield _export_line("user", user)
+
+    try:
+        async for record_type, records in auth_db_handler.stream_user_records(user_id=user.user_id):
+            yield b"".join(_export_line(record_type, record) for record in records)
+    except Exception as e:
+        # The status line has already been sent, the client sees a truncated export
+        print(e)
+        traceback.print_exc()
+        raise
@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 from fastapi import HTTPException, status
 from ai_health.schemas.billings_schema import (
     BillingCreate,
@@ -8,7 +9,14 @@ from ai_health.schemas.billings_schema import (
     BillingsWithDoctorList,
 )
 from ai_health.database.db_handlers import billing_db_handler
-from ai_health.services.utils.exceptions import NotFoundException, RecordExistsException, ServiceException
+from ai_health.database.versions import Version
+from ai_health.schemas.pagination_schema import PaginationParams
+from ai_health.services.utils.exceptions import (
+    BadRequestException,
+    NotFoundException,
+    RecordExistsException,
+    ServiceException,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -37,6 +45,14 @@ async def get_billing_service(billing_id: str) -> BillingWithDoctor:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="An unknown error occurred")
 
 
+async def get_billing_version(billing_id: str) -> Optional[Version]:
+    try:
+        return await billing_db_handler.get_billing_version(billing_id)
+    except Exception as e:
+        LOGGER.error(f"An error occurred: {e}")
+        return None
+
+
 async def update_billing_service(billing_id: str, billing_update: BillingUpdate) -> Billing:
     try:
         return await billing_db_handler.update_billing(billing_id, billing_update)
@@ -59,9 +75,13 @@ async def delete_billing_service(billing_id: str) -> bool:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="An unknown error occurred")
 
 
-async def get_billings_for_user(user_id: str) -> BillingsWithDoctorList:
+async def get_billings_for_user(
+    user_id: str, pagination: PaginationParams = PaginationParams()
+) -> BillingsWithDoctorList:
     try:
-        billings = await billing_db_handler.get_billings(user_id)
+        billings = await billing_db_handler.get_billings(user_id, limit=pagination.limit, cursor=pagination.cursor)
+    except BadRequestException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except NotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except ServiceException as e:
@@ -70,4 +90,12 @@ async def get_billings_for_user(user_id: str) -> BillingsWithDoctorList:
         LOGGER.error(f"An error occurred: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="An unknown error occurred")
 
-    return BillingsWithDoctorList(billings=billings)
+    return billings
+
+
+async def get_billings_version(user_id: str) -> Optional[Version]:
+    try:
+        return await billing_db_handler.get_billings_version(user_id)
+    except Exception as e:
+        LOGGER.error(f"An error occurred: {e}")
+        return None
@@ -1,10 +1,12 @@
 import logging
 from uuid import UUID
 from fastapi import HTTPException, status
-from typing import List
+from typing import List, Optional
 from ai_health.schemas.doctor_schema import DoctorCreate, DoctorUpdate, Doctor, DoctorList
 from ai_health.database.db_handlers import doctor_db_handler
-from ai_health.services.utils.exceptions import RecordExistsException, ServiceException
+from ai_health.database.versions import Version
+from ai_health.schemas.pagination_schema import PaginationParams
+from ai_health.services.utils.exceptions import BadRequestException, RecordExistsException, ServiceException
 
 LOGGER = logging.getLogger(__name__)
 LOGGER.setLevel(logging.INFO)
@@ -40,6 +42,14 @@ async def get_doctor(doctor_id: UUID) -> Doctor:
     return Doctor.model_validate(doctor_in_db)
 
 
+async def get_doctor_version(doctor_id: UUID) -> Optional[Version]:
+    try:
+        return await doctor_db_handler.get_doctor_version(doctor_id)
+    except Exception as e:
+        LOGGER.error(f"Unexpected error: {e}")
+        return None
+
+
 async def update_doctor(doctor_id: UUID, doctor_update: DoctorUpdate) -> Doctor:
     try:
         doctor_in_db = await doctor_db_handler.update_doctor(doctor_id, doctor_update)
@@ -66,9 +76,11 @@ async def delete_doctor(doctor_id: UUID) -> None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="An unknown error occurred")
 
 
-async def get_all_doctors() -> DoctorList:
+async def get_all_doctors(pagination: PaginationParams = PaginationParams()) -> DoctorList:
     try:
-        doctors = await doctor_db_handler.get_all_doctors()
+        doctors = await doctor_db_handler.get_all_doctors(limit=pagination.limit, cursor=pagination.cursor)
+    except BadRequestException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except ServiceException as e:
         LOGGER.error(f"Service exception: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
@@ -76,4 +88,12 @@ async def get_all_doctors() -> DoctorList:
         LOGGER.error(f"Unexpected error: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="An unknown error occurred")
 
-    return DoctorList(doctors=[Doctor.model_validate(doctor) for doctor in doctors])
+    return doctors
+
+
+async def get_all_doctors_version(pagination: PaginationParams = PaginationParams()) -> Optional[Version]:
+    try:
+        return await doctor_db_handler.get_all_doctors_version(limit=pagination.limit, cursor=pagination.cursor)
+    except Exception as e:
+        LOGGER.error(f"Unexpected error: {e}")
+        return None
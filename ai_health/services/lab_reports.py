@@ -1,10 +1,37 @@
 import logging
+import os
+import shutil
+import uuid
+from typing import AsyncIterable, Optional
 from datetime import datetime, timezone
-from fastapi import HTTPException, status
-
-from ai_health.schemas.lab_report_schema import LabReportCreate, LabReportUpdate, LabReport, LabReportList
+from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from redis.exceptions import RedisError
+from rq.exceptions import NoSuchJobError
+from rq.job import Job, JobStatus
+
+from ai_health.schemas.lab_report_schema import (
+    LabReportCreate,
+    LabReportImportJob,
+    LabReportImportStatus,
+    LabReportUpdate,
+    LabReport,
+    LabReportList,
+)
 from ai_health.database.db_handlers import labreports_db_handler
-from ai_health.services.utils.exceptions import RecordExistsException, ServiceException, NotFoundException
+from ai_health.database.versions import Version
+from ai_health.job_manager import job_runner, lab_report_import
+from ai_health.root.settings import Settings
+from ai_health.schemas.pagination_schema import PaginationParams
+from ai_health.services.utils import bulk
+from ai_health.services.utils.exceptions import (
+    BadRequestException,
+    NotFoundException,
+    RecordExistsException,
+    ServiceException,
+)
+
+settings = Settings()
 
 LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +52,12 @@ async def create_lab_report(lab_report_create: LabReportCreate):
     return LabReport(**created_lab_report.model_dump())
 
 
+async def create_lab_reports_bulk(body: AsyncIterable[bytes]):
+    return await bulk.create_in_bulk(
+        body, LabReportCreate, LabReport, labreports_db_handler.create_lab_reports, detail="Lab reports created"
+    )
+
+
 async def get_lab_report_by_id(lab_report_id: str):
     try:
         lab_report = await labreports_db_handler.get_lab_report(lab_report_id)
@@ -39,9 +72,19 @@ async def get_lab_report_by_id(lab_report_id: str):
     return LabReport.model_validate(lab_report)
 
 
-async def get_all_lab_reports():
+async def get_lab_report_version(lab_report_id: str) -> Optional[Version]:
     try:
-        lab_reports = await labreports_db_handler.get_lab_reports()
+        return await labreports_db_handler.get_lab_report_version(lab_report_id)
+    except Exception as e:
+        LOGGER.exception(e)
+        return None
+
+
+async def get_all_lab_reports(pagination: PaginationParams = PaginationParams()):
+    try:
+        lab_reports = await labreports_db_handler.get_lab_reports(limit=pagination.limit, cursor=pagination.cursor)
+    except BadRequestException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except ServiceException as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     except Exception as e:
@@ -51,6 +94,14 @@ async def get_all_lab_reports():
     return lab_reports
 
 
+async def get_all_lab_reports_version() -> Optional[Version]:
+    try:
+        return await labreports_db_handler.get_lab_reports_version()
+    except Exception as e:
+        LOGGER.exception(e)
+        return None
+
+
 async def update_lab_report(lab_report_id: str, lab_report_update: LabReportUpdate):
     try:
         updated_lab_report = await labreports_db_handler.update_lab_report(lab_report_id, lab_report_update)
@@ -77,3 +128,68 @@ async def delete_lab_report(lab_report_id: str):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unknown error occurred")
 
     return {"deleted": success}
+
+
+def _save_import_file(file: UploadFile, file_format: str) -> str:
+    os.makedirs(settings.LAB_REPORT_IMPORT_DIR, exist_ok=True)
+    path = os.path.join(settings.LAB_REPORT_IMPORT_DIR, f"{uuid.uuid4().hex}.{file_format}")
+
+    with open(path, "wb") as saved_file:
+        shutil.copyfileobj(file.file, saved_file, length=1024 * 1024)
+
+    return path
+
+
+def _enqueue_import(path: str, file_format: str) -> Job:
+    return job_runner.queue.enqueue_call(
+        func=lab_report_import.import_lab_reports,
+        args=(path, file_format),
+        timeout=settings.LAB_REPORT_IMPORT_TIMEOUT,
+        result_ttl=settings.LAB_REPORT_IMPORT_RESULT_TTL,
+        failure_ttl=settings.LAB_REPORT_IMPORT_RESULT_TTL,
+        meta={"stage": "queued", "rows_read": 0, "rows_invalid": 0, "errors": []},
+    )
+
+
+async def start_lab_report_import(file: UploadFile) -> LabReportImportJob:
+    file_format = os.path.splitext(file.filename or "")[1].lstrip(".").lower()
+
+    if file_format not in lab_report_import.FILE_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Only {', '.join(lab_report_import.FILE_FORMATS)} files can be imported",
+        )
+
+    # Both block, the file is copied to disk and the queue uses the sync Redis client
+    path = await run_in_threadpool(_save_import_file, file, file_format)
+
+    try:
+        job = await run_in_threadpool(_enqueue_import, path, file_format)
+    except RedisError as e:
+        LOGGER.exception(e)
+        os.remove(path)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Couldnt queue the import")
+
+    return LabReportImportJob(job_id=job.id, status=JobStatus.QUEUED.value)
+
+
+def _read_import_job(job_id: str) -> LabReportImportStatus:
+    job = Job.fetch(job_id, connection=job_runner.queue.connection)
+    job_status = JobStatus(job.get_status(refresh=False))
+
+    return LabReportImportStatus(
+        job_id=job.id,
+        status=job_status.value,
+        result=job.return_value() if job_status == JobStatus.FINISHED else None,
+        **job.meta,
+    )
+
+
+async def get_lab_report_import(job_id: str) -> LabReportImportStatus:
+    try:
+        return await run_in_threadpool(_read_import_job, job_id)
+    except NoSuchJobError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No import found for job_id {job_id}")
+    except RedisError as e:
+        LOGGER.exception(e)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unknown error occurred")
@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 from datetime import datetime, timezone
 from fastapi import HTTPException, status
 
@@ -9,7 +10,14 @@ from ai_health.schemas.medical_history_schema import (
     MedicalHistoryList,
 )
 from ai_health.database.db_handlers import medical_history_db_handler
-from ai_health.services.utils.exceptions import RecordExistsException, ServiceException, NotFoundException
+from ai_health.database.versions import Version
+from ai_health.schemas.pagination_schema import PaginationParams
+from ai_health.services.utils.exceptions import (
+    BadRequestException,
+    NotFoundException,
+    RecordExistsException,
+    ServiceException,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -44,9 +52,21 @@ async def get_medical_history_by_id(medical_history_id: str):
     return MedicalHistory(**medical_history.model_dump())
 
 
-async def get_all_medical_histories():
+async def get_medical_history_version(medical_history_id: str) -> Optional[Version]:
+    try:
+        return await medical_history_db_handler.get_medical_history_version(medical_history_id)
+    except Exception as e:
+        LOGGER.exception(e)
+        return None
+
+
+async def get_all_medical_histories(pagination: PaginationParams = PaginationParams()):
     try:
-        medical_histories = await medical_history_db_handler.get_medical_histories()
+        medical_histories = await medical_history_db_handler.get_medical_histories(
+            limit=pagination.limit, cursor=pagination.cursor
+        )
+    except BadRequestException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except ServiceException as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     except Exception as e:
@@ -56,6 +76,14 @@ async def get_all_medical_histories():
     return medical_histories
 
 
+async def get_all_medical_histories_version() -> Optional[Version]:
+    try:
+        return await medical_history_db_handler.get_medical_histories_version()
+    except Exception as e:
+        LOGGER.exception(e)
+        return None
+
+
 async def update_medical_history(medical_history_id: str, medical_history_update: MedicalHistoryUpdate):
     try:
         updated_medical_history = await medical_history_db_handler.update_medical_history(
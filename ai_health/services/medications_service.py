@@ -1,10 +1,19 @@
 import logging
+from typing import AsyncIterable, Optional
 from datetime import datetime, timezone
 from fastapi import HTTPException, status
 
 from ai_health.schemas.medication_schema import MedicationCreate, MedicationUpdate, Medication, MedicationList
 from ai_health.database.db_handlers import medications_db_handler
-from ai_health.services.utils.exceptions import RecordExistsException, ServiceException, NotFoundException
+from ai_health.database.versions import Version
+from ai_health.schemas.pagination_schema import PaginationParams
+from ai_health.services.utils import bulk
+from ai_health.services.utils.exceptions import (
+    BadRequestException,
+    NotFoundException,
+    RecordExistsException,
+    ServiceException,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +34,12 @@ async def create_medication(medication_create: MedicationCreate):
     return Medication(**created_medication.model_dump())
 
 
+async def create_medications_bulk(body: AsyncIterable[bytes]):
+    return await bulk.create_in_bulk(
+        body, MedicationCreate, Medication, medications_db_handler.create_medications, detail="Medications created"
+    )
+
+
 async def get_medication_by_id(medication_id: str):
     try:
         medication = await medications_db_handler.get_medication(medication_id)
@@ -39,9 +54,23 @@ async def get_medication_by_id(medication_id: str):
     return Medication(**medication.model_dump())
 
 
-async def get_all_medications(patient_id: str = None, doctor_id: str = None):
+async def get_medication_version(medication_id: str) -> Optional[Version]:
+    try:
+        return await medications_db_handler.get_medication_version(medication_id)
+    except Exception as e:
+        LOGGER.exception(e)
+        return None
+
+
+async def get_all_medications(
+    patient_id: str = None, doctor_id: str = None, pagination: PaginationParams = PaginationParams()
+):
     try:
-        medications = await medications_db_handler.get_medications(patient_id=patient_id, doctor_id=doctor_id)
+        medications = await medications_db_handler.get_medications(
+            limit=pagination.limit, cursor=pagination.cursor, patient_id=patient_id, doctor_id=doctor_id
+        )
+    except BadRequestException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except ServiceException as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     except Exception as e:
@@ -51,6 +80,14 @@ async def get_all_medications(patient_id: str = None, doctor_id: str = None):
     return medications
 
 
+async def get_all_medications_version(patient_id: str = None, doctor_id: str = None) -> Optional[Version]:
+    try:
+        return await medications_db_handler.get_medications_version(patient_id=patient_id, doctor_id=doctor_id)
+    except Exception as e:
+        LOGGER.exception(e)
+        return None
+
+
 async def update_medication(medication_id: str, medication_update: MedicationUpdate):
     try:
         updated_medication = await medications_db_handler.update_medication(medication_id, medication_update)
@@ -1,22 +1,26 @@
 from datetime import datetime, timedelta
+import hashlib
 import json
 from logging import getLogger
 from random import randint
+import time
 from typing import Annotated, Optional
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 import jwt
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from passlib.context import CryptContext
 from itsdangerous.url_safe import URLSafeSerializer
 from itsdangerous import BadTimeSignature, BadSignature
 
 
+from ai_health.root import request_context
 from ai_health.root.settings import Settings
+from ai_health.root.utils.ttl_cache import TTLCache
 from ai_health.schemas.auth_schemas import Token, User, UserType
 from ai_health.schemas.error_messages_schema import AuthMessage
 from ai_health.services.utils.exceptions import NotFoundException, ServiceException
+from ai_health.services.utils import password_utils, read_your_writes, user_cache
 from ai_health.database.db_handlers import auth_db_handler
 
 
@@ -38,10 +42,15 @@ ITS_DANGEROUS_SECRET = settings.SECRET_KEY
 Logger = getLogger(__name__)
 
 
-prototype_pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 security = HTTPBearer()
 
+token_serializer = URLSafeSerializer(ITS_DANGEROUS_SECRET)
+
+# Maps the digest of an encrypted access token to its verified claims, each entry lives until the token's exp
+verified_token_cache = TTLCache(
+    max_size=settings.VERIFIED_TOKEN_CACHE_MAX_SIZE, ttl=ACCESS_TOKEN_EXPIRY, name="verified_token"
+)
+
 
 class UUIDEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -63,9 +72,7 @@ def credential_exception(
 
 
 def encrypt_jwt_data(jwt_token: str) -> str:
-    s1 = URLSafeSerializer(ITS_DANGEROUS_SECRET)
-
-    token = s1.dumps(jwt_token)
+    token = token_serializer.dumps(jwt_token)
 
     return token
 
@@ -80,10 +87,8 @@ def decrypt_jwt_data(encrypted_jwt_token: str) -> (str | None, str):
     it is (None, str) if the token was unsuccessful
     """
 
-    s1 = URLSafeSerializer(ITS_DANGEROUS_SECRET)
-
     try:
-        token = s1.loads(encrypted_jwt_token)
+        token = token_serializer.loads(encrypted_jwt_token)
     except BadTimeSignature as e:
         Logger.exception(e)
         return None, "Invalid Token"
@@ -100,18 +105,20 @@ def decrypt_jwt_data(encrypted_jwt_token: str) -> (str | None, str):
     return token, ""
 
 
-def verify_password(plain_password, hashed_password):
+async def verify_password(plain_password, hashed_password):
     """
-    Verifies the supplied password with the hashed password
+    Verifies the supplied password with the hashed password, on the password executor
     """
-    return prototype_pwd_context.verify(plain_password, hashed_password)
+    return await password_utils.password_executor.run(
+        password_utils.verify_password_hash, plain_password, hashed_password
+    )
 
 
-def get_password_hash(password):
+async def get_password_hash(password):
     """
-    Generates the hash for a password
+    Generates the hash for a password, on the password executor
     """
-    return prototype_pwd_context.hash(password)
+    return await password_utils.password_executor.run(password_utils.generate_password_hash, password)
 
 
 def create_access_token(data: dict):
@@ -242,6 +249,13 @@ def get_new_tokens(encrypted_refresh_token: str) -> Token:
 
 async def verify_access_token(encrypted_token: str):
 
+    # A token that was verified before skips both signature checks until it expires
+    token_digest = hashlib.sha256(encrypted_token.encode()).digest()
+    payload = verified_token_cache.get(token_digest)
+
+    if payload is not None:
+        return payload.get("user_id")
+
     # Unencrypt the token
     token, message = decrypt_jwt_data(encrypted_jwt_token=encrypted_token)
 
@@ -259,6 +273,10 @@ async def verify_access_token(encrypted_token: str):
     if payload is None:
         credential_exception()
 
+    time_to_expiry = payload.get("exp", 0) - time.time()
+    if time_to_expiry > 0:
+        verified_token_cache.set(token_digest, payload, ttl=time_to_expiry)
+
     user_id = payload.get("user_id")
 
     return user_id
@@ -266,24 +284,35 @@ async def verify_access_token(encrypted_token: str):
 
 async def extract_token(credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]):
 
-    if not credentials.credentials:
-        credential_exception()
+    with request_context.measure_auth():
+        if not credentials.credentials:
+            credential_exception()
 
-    return await verify_access_token(encrypted_token=credentials.credentials)
+        return await verify_access_token(encrypted_token=credentials.credentials)
 
 
-async def get_current_user(user_id: str = Depends(extract_token)):
-    # Get the user details from the user id
+async def get_current_user(request: Request, user_id: str = Depends(extract_token)):
+    with request_context.measure_auth():
+        # Get the user details from the user id
+        user = await _get_user_from_user_id(user_id=user_id)
 
-    return await _get_user_from_user_id(user_id=user_id)
+        await read_your_writes.route_reads(method=request.method, user_id=user.user_id)
+
+    return user
 
 
 async def _get_user_from_user_id(user_id: str):
     """
     An abstraction over the get_user_from_userid of the auth_db_handler
 
-    Gets the user details from the db and populates needed fields for the user
+    Gets the user details from the db and populates needed fields for the user.
+    The user is served from the per worker user cache when it is there
     """
+    user = user_cache.get_cached_user(user_id=user_id)
+
+    if user is not None:
+        return user
+
     try:
         user_extended = await auth_db_handler.get_user_with_user_id(user_id=user_id)
     except NotFoundException as e:
@@ -291,6 +320,8 @@ async def _get_user_from_user_id(user_id: str):
 
     user = User(**user_extended.model_dump())
 
+    user_cache.cache_user(user=user)
+
     return user
 
 
@@ -0,0 +1,79 @@
+"""
+Reads the JSON array body of a bulk create route item by item and reports on every one of them.
+
+Items that fail validation are reported with their errors and skipped, the valid ones are created together
+by the db_handler, in one transaction. A 50k item body is never held whole, neither as bytes nor as models.
+"""
+
+import logging
+import math
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+
+from ai_health.root.settings import Settings
+from ai_health.root.utils.json_stream import JSONStreamError, iter_json_array
+from ai_health.schemas.bulk_schema import BulkItemResult, BulkResult
+from ai_health.services.utils.exceptions import BadRequestException, RecordExistsException, ServiceException
+
+
+settings = Settings()
+
+LOGGER = logging.getLogger(__name__)
+
+# The INSERTs of the largest bulk request and the user's lookup
+BULK_QUERY_BUDGET = math.ceil(settings.BULK_MAX_ITEMS / settings.BULK_INSERT_CHUNK_SIZE) + 1
+
+
+async def create_in_bulk(
+    body: AsyncIterable[bytes],
+    create_schema: type[BaseModel],
+    record_schema: type[BaseModel],
+    create_records: Callable[[AsyncIterator[BaseModel]], Awaitable[list]],
+    detail: str,
+) -> BulkResult:
+    item_result = BulkItemResult[record_schema]
+    failed: list[BulkItemResult] = []
+    valid_indexes: list[int] = []
+
+    async def valid_items():
+        index = -1
+
+        try:
+            async for item in iter_json_array(body):
+                index += 1
+
+                if index >= settings.BULK_MAX_ITEMS:
+                    raise BadRequestException(message=f"A bulk request takes at most {settings.BULK_MAX_ITEMS} items")
+
+                try:
+                    validated = create_schema.model_validate_json(item)
+                except ValidationError as e:
+                    errors = e.errors(include_url=False, include_context=False, include_input=False)
+                    failed.append(item_result(index=index, errors=errors))
+                    continue
+
+                valid_indexes.append(index)
+                yield validated
+        except JSONStreamError as e:
+            raise BadRequestException(message=f"Invalid JSON array: {e}")
+
+    try:
+        records = await create_records(valid_items())
+    except BadRequestException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+    except RecordExistsException as e:
+        LOGGER.error(f"Bulk create rolled back: {e.message}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+    except ServiceException as e:
+        LOGGER.exception(e)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=e.message)
+    except Exception as e:
+        LOGGER.exception(e)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unknown error occurred")
+
+    created = [item_result(index=index, record=record) for index, record in zip(valid_indexes, records)]
+    items = sorted(created + failed, key=lambda item: item.index)
+
+    return BulkResult[record_schema](detail=detail, created=len(created), failed=len(failed), items=items)
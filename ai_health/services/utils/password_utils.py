@@ -0,0 +1,90 @@
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from ai_health.root.settings import Settings
+
+
+settings = Settings()
+
+LOGGER = logging.getLogger(__name__)
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def verify_password_hash(plain_password: str, hashed_password: str) -> bool:
+    """
+    Runs on the password executor, it must stay a module level function so the process pool can pickle it
+    """
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def generate_password_hash(password: str) -> str:
+    """
+    Runs on the password executor, it must stay a module level function so the process pool can pickle it
+    """
+    return pwd_context.hash(password)
+
+
+class PasswordExecutor:
+    """
+    A bounded executor for the bcrypt work so hashing never blocks the event loop.
+
+    At most `max_workers` hashes run at once and at most `max_queue` more wait for a worker.
+    Anything beyond that is rejected with a 503 instead of queueing up without a limit.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int = 4, max_queue: int = 64) -> None:
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown password executor kind {kind}")
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+
+        self.pending = 0
+        self.rejected = 0
+
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        # Created lazily so a process pool is started inside the gunicorn worker and not in the master
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password")
+
+        return self._executor
+
+    async def run(self, fn, *args):
+        if self.pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            LOGGER.warning(f"Password executor is saturated with {self.pending} pending jobs")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again",
+                headers={"Retry-After": "1"},
+            )
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_executor = PasswordExecutor(
+    kind=settings.PASSWORD_HASHER_EXECUTOR,
+    max_workers=settings.PASSWORD_HASHER_WORKERS,
+    max_queue=settings.PASSWORD_HASHER_MAX_QUEUE,
+)
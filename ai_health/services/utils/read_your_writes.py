@@ -0,0 +1,57 @@
+"""
+Keeps a user's reads on the primary for a short while after they write, so they see their own writes even
+when the read replica is behind.
+
+A user who sends a write gets a Redis key for REPLICA_STICKY_SECONDS. While the key exists, every request of
+theirs reads from the primary, whichever worker serves it.
+"""
+
+import logging
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from ai_health.root import database
+from ai_health.root.redis_manager import redis_manager
+from ai_health.root.settings import Settings
+
+
+settings = Settings()
+
+LOGGER = logging.getLogger(__name__)
+
+STICKY_KEY_PREFIX = "db_primary_sticky"
+
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def _sticky_key(user_id: str | UUID) -> str:
+    return f"{STICKY_KEY_PREFIX}:{UUID(str(user_id)).hex}"
+
+
+async def route_reads(method: str, user_id: str | UUID):
+    """
+    Called for every authenticated request, before the route runs
+    """
+    if database.replica_session is None:
+        return
+
+    if method not in READ_ONLY_METHODS:
+        database.read_from_primary()
+
+        try:
+            await redis_manager.cache_bytes(key=_sticky_key(user_id), value=b"1", ttl=settings.REPLICA_STICKY_SECONDS)
+        except RedisError as e:
+            LOGGER.exception(e)
+
+        return
+
+    try:
+        is_sticky = await redis_manager.get_cached_bytes(key=_sticky_key(user_id)) is not None
+    except RedisError as e:
+        # Without Redis we cant tell whether the user just wrote, the primary is always safe
+        LOGGER.exception(e)
+        is_sticky = True
+
+    if is_sticky:
+        database.read_from_primary()
@@ -0,0 +1,106 @@
+"""
+Cache of the serialized /auth/me aggregate of a user.
+
+The aggregate is stored under the user's current version number. Any write to the user's profile or to one of
+their visits, medications, appointments, lab reports, medical history or billings bumps the version, so the
+next read misses and rebuilds it, and so does a write to a doctor those records embed. Old versions are never
+read again and expire on their own.
+
+The /auth/me ETag is the version too, so the ETag and the cached body always change together. A user without
+a version, e.g once the key was evicted, starts at the current time in milliseconds instead of 0, so a version,
+and its ETag, isnt handed out again for different contents.
+"""
+
+import logging
+import time
+from typing import Optional
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from ai_health.root.redis_manager import redis_manager
+from ai_health.root.settings import Settings
+
+
+settings = Settings()
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _user_key(user_id: str | UUID) -> str:
+    return UUID(str(user_id)).hex
+
+
+def _version_key(user_id: str | UUID) -> str:
+    return f"user_aggregate_version:{_user_key(user_id)}"
+
+
+def _aggregate_key(user_id: str | UUID, version: int) -> str:
+    return f"user_aggregate:{_user_key(user_id)}:{version}"
+
+
+def _initial_version() -> int:
+    return time.time_ns() // 1_000_000
+
+
+async def get_version(user_id: str | UUID) -> Optional[int]:
+    """
+    The user's current version, None when Redis is unavailable
+    """
+    try:
+        return int(await redis_manager.get_or_set(key=_version_key(user_id), value=_initial_version()))
+    except RedisError as e:
+        LOGGER.exception(e)
+        return None
+
+
+async def get_cached_aggregate(user_id: str | UUID) -> tuple[Optional[int], Optional[bytes]]:
+    """
+    Returns the user's current version and the aggregate cached under it, if any.
+
+    The version is None when Redis is unavailable, the caller then shouldnt cache what it builds.
+    """
+    version = await get_version(user_id)
+
+    if version is None:
+        return None, None
+
+    try:
+        return version, await redis_manager.get_cached_bytes(key=_aggregate_key(user_id, version))
+    except RedisError as e:
+        LOGGER.exception(e)
+        return None, None
+
+
+async def cache_aggregate(user_id: str | UUID, version: Optional[int], aggregate: bytes):
+    if version is None:
+        return
+
+    try:
+        await redis_manager.cache_bytes(
+            key=_aggregate_key(user_id, version), value=aggregate, ttl=settings.USER_AGGREGATE_CACHE_TTL
+        )
+    except RedisError as e:
+        LOGGER.exception(e)
+
+
+async def bump_version(*user_ids: str | UUID | None):
+    """
+    Called by the db_handlers after a write to a user's records has been committed.
+
+    A failure is logged and not raised, the cached aggregate then stays stale until it expires.
+    """
+    user_ids = {_user_key(user_id) for user_id in user_ids if user_id is not None}
+
+    if not user_ids:
+        return
+
+    try:
+        async with redis_manager.batch() as batch:
+            initial_version = _initial_version()
+            for user_id in user_ids:
+                batch.set_if_missing(key=_version_key(user_id), value=initial_version)
+                batch.increment(key=_version_key(user_id))
+    except RedisError as e:
+        LOGGER.error(f"Couldnt bump the aggregate version of users {user_ids}")
+        LOGGER.exception(e)
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from typing import Optional
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from ai_health.root.redis_manager import redis_manager
+from ai_health.root.settings import Settings
+from ai_health.root.utils.ttl_cache import TTLCache
+from ai_health.schemas.auth_schemas import User
+
+
+settings = Settings()
+
+LOGGER = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = settings.USER_CACHE_INVALIDATION_CHANNEL
+
+user_cache = TTLCache(max_size=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL, name="user")
+
+_listener_task: asyncio.Task | None = None
+
+
+def _cache_key(user_id: str | UUID) -> str:
+    # The token carries the hex form of the id while the db returns a UUID, normalise both to the hex form
+    return UUID(str(user_id)).hex
+
+
+def get_cached_user(user_id: str | UUID) -> Optional[User]:
+    return user_cache.get(_cache_key(user_id))
+
+
+def cache_user(user: User):
+    user_cache.set(_cache_key(user.user_id), user)
+
+
+async def invalidate_user(user_id: str | UUID):
+    """
+    Removes the user from this worker's cache and tells the other workers to do the same
+    """
+    key = _cache_key(user_id)
+    user_cache.delete(key)
+
+    try:
+        await redis_manager.publish(channel=INVALIDATION_CHANNEL, message=key)
+    except RedisError as e:
+        # The other workers would serve the stale user until the TTL runs out
+        LOGGER.exception(e)
+
+
+def _handle_invalidation_message(message: dict):
+    data = message.get("data")
+
+    if isinstance(data, bytes):
+        data = data.decode()
+
+    user_cache.delete(data)
+
+
+async def _listen_for_invalidations():
+    while True:
+        pubsub = redis_manager.redis_client.pubsub(ignore_subscribe_messages=True)
+
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+
+                if message is not None:
+                    _handle_invalidation_message(message)
+
+        except RedisError as e:
+            # Invalidations sent while we were disconnected are lost, so start again from an empty cache
+            LOGGER.error("Lost the user cache invalidation channel, resubscribing")
+            LOGGER.exception(e)
+            user_cache.clear()
+            await asyncio.sleep(1)
+
+        finally:
+            await pubsub.aclose()
+
+
+def start_invalidation_listener():
+    """
+    Subscribes to the invalidation channel on a background task of this worker
+    """
+    global _listener_task
+
+    if _listener_task is None:
+        _listener_task = asyncio.create_task(_listen_for_invalidations())
+
+
+async def stop_invalidation_listener():
+    global _listener_task
+
+    if _listener_task is None:
+        return
+
+    _listener_task.cancel()
+
+    try:
+        await _listener_task
+    except asyncio.CancelledError:
+        pass
+
+    _listener_task = None
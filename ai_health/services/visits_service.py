@@ -1,10 +1,19 @@
 import logging
+from typing import AsyncIterable, Optional
 from datetime import datetime, timezone
 from fastapi import HTTPException, status
 
 from ai_health.schemas.visits_schema import VisitCreate, VisitUpdate, Visit, VisitList
 from ai_health.database.db_handlers import visits_db_handler
-from ai_health.services.utils.exceptions import RecordExistsException, ServiceException, NotFoundException
+from ai_health.database.versions import Version
+from ai_health.schemas.pagination_schema import PaginationParams
+from ai_health.services.utils import bulk
+from ai_health.services.utils.exceptions import (
+    BadRequestException,
+    NotFoundException,
+    RecordExistsException,
+    ServiceException,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +34,12 @@ async def create_visit(visit_create: VisitCreate):
     return Visit.model_validate(created_visit)
 
 
+async def create_visits_bulk(body: AsyncIterable[bytes]):
+    return await bulk.create_in_bulk(
+        body, VisitCreate, Visit, visits_db_handler.create_visits, detail="Visits created"
+    )
+
+
 async def get_visit_by_id(visit_id: str):
     try:
         visit = await visits_db_handler.get_visit(visit_id)
@@ -39,9 +54,19 @@ async def get_visit_by_id(visit_id: str):
     return Visit.model_validate(visit)
 
 
-async def get_all_visits():
+async def get_visit_version(visit_id: str) -> Optional[Version]:
+    try:
+        return await visits_db_handler.get_visit_version(visit_id)
+    except Exception as e:
+        LOGGER.exception(e)
+        return None
+
+
+async def get_all_visits(pagination: PaginationParams = PaginationParams()):
     try:
-        visits = await visits_db_handler.get_visits()
+        visits = await visits_db_handler.get_visits(limit=pagination.limit, cursor=pagination.cursor)
+    except BadRequestException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except ServiceException as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     except Exception as e:
@@ -51,6 +76,14 @@ async def get_all_visits():
     return visits
 
 
+async def get_all_visits_version() -> Optional[Version]:
+    try:
+        return await visits_db_handler.get_visits_version()
+    except Exception as e:
+        LOGGER.exception(e)
+        return None
+
+
 async def update_visit(visit_id: str, visit_update: VisitUpdate):
     try:
         updated_visit = await visits_db_handler.update_visit(visit_id, visit_update)
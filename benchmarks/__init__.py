@@ -0,0 +1,6 @@
+"""
+Benchmarks for the ai_health backend.
+
+Each module is runnable on its own with `python -m benchmarks.<module>` from the project root.
+They read the same `.env` as the app.
+"""
@@ -0,0 +1,109 @@
+"""
+Encode and decode time and stored size of a `UserWithAllRelations` payload for each cache codec.
+
+Pass --redis to also store each encoding in the Redis from the .env and report `MEMORY USAGE` for the key.
+
+    python -m benchmarks.cache_codecs --history-depth 20 --iterations 2000 --redis
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from ai_health.root.utils.cache_codecs import CacheSerializer
+from benchmarks.fixtures import make_user_with_relations
+from benchmarks.utils import print_table
+
+
+class StdlibJsonSerializer:
+    """
+    The format RedisManager used before the codec layer, it needs default=str for the UUIDs and datetimes
+    """
+
+    def dumps(self, value) -> bytes:
+        return json.dumps(value, default=str).encode()
+
+    def loads(self, data: bytes):
+        return json.loads(data)
+
+
+def build_serializers(threshold: int) -> dict:
+    serializers = {
+        "stdlib json": StdlibJsonSerializer(),
+        "orjson": CacheSerializer(codec="orjson", compression_threshold=2**62),
+        "orjson + zlib": CacheSerializer(codec="orjson", compression_threshold=threshold),
+    }
+
+    try:
+        import msgpack  # noqa: F401
+
+        serializers["msgpack"] = CacheSerializer(codec="msgpack", compression_threshold=2**62)
+        serializers["msgpack + zlib"] = CacheSerializer(codec="msgpack", compression_threshold=threshold)
+    except ImportError:
+        print("msgpack is not installed, skipping the msgpack codec")
+
+    return serializers
+
+
+def time_per_call(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def redis_memory_usage(encoded: dict[str, bytes]) -> dict[str, int]:
+    from ai_health.root.redis_manager import redis_manager
+
+    usage = {}
+    for name, data in encoded.items():
+        key = f"benchmark:cache_codecs:{name}"
+        await redis_manager.redis_client.set(key, data, ex=60)
+        usage[name] = await redis_manager.redis_client.memory_usage(key)
+        await redis_manager.delete_key(key)
+
+    await redis_manager.close()
+
+    return usage
+
+
+def main(history_depth: int, iterations: int, threshold: int, with_redis: bool):
+    payload = make_user_with_relations(history_depth=history_depth).model_dump()
+
+    serializers = build_serializers(threshold=threshold)
+    encoded = {name: serializer.dumps(payload) for name, serializer in serializers.items()}
+    memory = asyncio.run(redis_memory_usage(encoded)) if with_redis else {}
+
+    rows = []
+    for name, serializer in serializers.items():
+        data = encoded[name]
+        rows.append(
+            [
+                name,
+                time_per_call(lambda: serializer.dumps(payload), iterations),
+                time_per_call(lambda: serializer.loads(data), iterations),
+                len(data),
+                memory.get(name, "-"),
+            ]
+        )
+
+    print(f"UserWithAllRelations with {history_depth} rows per relation")
+    print_table(["codec", "encode us", "decode us", "bytes", "redis bytes"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--history-depth", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--threshold", type=int, default=1024)
+    parser.add_argument("--redis", action="store_true")
+    args = parser.parse_args()
+
+    main(
+        history_depth=args.history_depth,
+        iterations=args.iterations,
+        threshold=args.threshold,
+        with_redis=args.redis,
+    )
@@ -0,0 +1,127 @@
+"""
+Synthetic pydantic payloads shaped like the real responses, for benchmarks that dont need a database.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from ai_health.schemas.appointment_schema import AppointmentWithDoctor
+from ai_health.schemas.auth_schemas import UserWithAllRelations
+from ai_health.schemas.billings_schema import BillingWithDoctor
+from ai_health.schemas.doctor_schema import Doctor
+from ai_health.schemas.lab_report_schema import LabReport
+from ai_health.schemas.medical_history_schema import MedicalHistory
+from ai_health.schemas.medication_schema import MedicationWithDoctor
+from ai_health.schemas.visits_schema import VisitWithDoctor
+
+
+NOW = datetime(2024, 7, 1, 9, 30, tzinfo=timezone.utc)
+
+
+def make_doctor(i: int = 0) -> Doctor:
+    return Doctor(
+        doctor_id=uuid.uuid4(),
+        first_name=f"Doctor{i}",
+        last_name="Adeyemi",
+        specialty="General Practice",
+        contact_number="+2348012345678",
+        email=f"doctor{i}@ai-health.example.com",
+    )
+
+
+def make_appointment(patient_id: uuid.UUID, doctor: Doctor, i: int = 0) -> AppointmentWithDoctor:
+    return AppointmentWithDoctor(
+        appointment_id=uuid.uuid4(),
+        patient_id=patient_id,
+        doctor_id=doctor.doctor_id,
+        doctor=doctor,
+        appointment_date=NOW - timedelta(days=i),
+        next_appointment_date=NOW + timedelta(days=30 - i),
+        reason_for_appointment="Routine check up and blood pressure review",
+        status="SCHEDULED",
+    )
+
+
+def make_billing(doctor: Doctor, i: int = 0) -> BillingWithDoctor:
+    return BillingWithDoctor(
+        billing_id=uuid.uuid4(),
+        doctor_id=doctor.doctor_id,
+        doctor=doctor,
+        title=f"Consultation {i}",
+        status="PENDING",
+        amount=12500.0 + i,
+    )
+
+
+def make_user_with_relations(history_depth: int = 20, doctors: int = 5) -> UserWithAllRelations:
+    """
+    A patient with `history_depth` rows in each relation, shared between a handful of doctors
+    """
+    patient_id = uuid.uuid4()
+    doctor_pool = [make_doctor(i) for i in range(doctors)]
+
+    def doctor_for(i: int) -> Doctor:
+        return doctor_pool[i % doctors]
+
+    return UserWithAllRelations(
+        user_id=patient_id,
+        first_name="Ada",
+        last_name="Okafor",
+        user_type="PATIENT",
+        phone_number="+2348098765432",
+        email="ada.okafor@example.com",
+        date_of_birth=datetime(1990, 4, 12, tzinfo=timezone.utc),
+        gender="FEMALE",
+        address="12 Marina Road, Lagos",
+        is_verified=True,
+        visits=[
+            VisitWithDoctor(
+                visit_id=uuid.uuid4(),
+                patient_id=patient_id,
+                doctor_id=doctor_for(i).doctor_id,
+                doctor=doctor_for(i),
+                visit_date=NOW - timedelta(days=i),
+                reason_for_visit="Follow up",
+                notes="Patient is recovering well, continue the current medication",
+                vistor_name="Chidi Okafor",
+                visitor_relationship="Brother",
+            )
+            for i in range(history_depth)
+        ],
+        medications=[
+            MedicationWithDoctor(
+                medication_id=uuid.uuid4(),
+                patient_id=patient_id,
+                doctor_id=doctor_for(i).doctor_id,
+                doctor=doctor_for(i),
+                medication_name="Amlodipine",
+                dosage="5mg once daily",
+                start_date=NOW - timedelta(days=i),
+                end_date=NOW + timedelta(days=90),
+            )
+            for i in range(history_depth)
+        ],
+        appointments=[make_appointment(patient_id, doctor_for(i), i) for i in range(history_depth)],
+        lab_reports=[
+            LabReport(
+                report_id=uuid.uuid4(),
+                patient_id=patient_id,
+                test_name="Full blood count",
+                test_date=NOW - timedelta(days=i),
+                result="Within normal range",
+                notes="No further action needed",
+            )
+            for i in range(history_depth)
+        ],
+        medical_history=[
+            MedicalHistory(
+                history_id=uuid.uuid4(),
+                patient_id=patient_id,
+                condition="Hypertension",
+                diagnosis_date=NOW - timedelta(days=365 + i),
+                notes="Managed with medication and diet",
+            )
+            for i in range(history_depth)
+        ],
+        billings=[make_billing(doctor_for(i), i) for i in range(history_depth)],
+    )
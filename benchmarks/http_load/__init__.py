@@ -0,0 +1,16 @@
+"""
+End to end load benchmark of the real app, ai_health.root.app:app served by uvicorn, against the Postgres and
+Redis from the .env.
+
+Seeds a population of patients sharing a pool of doctors, each with `--history-depth` rows in every relation,
+signs every patient in, then drives each scenario in turn with `--concurrency` clients for `--duration`
+seconds. The report has the throughput, latency percentiles and database statements per request of each
+scenario, the statements are read from the app's Server-Timing header. The seeded rows, and the ones the
+create scenarios add, are removed at the end.
+
+The database must already be migrated. The client shares the machine with the server, give the server
+`--workers` to spare a core for it or point `--url` at a server running elsewhere.
+
+    python -m benchmarks.http_load --patients 50 --history-depth 50 --concurrency 20 --duration 20
+    python -m benchmarks.http_load --scenarios me,list_appointments --report after.json --compare before.json
+"""
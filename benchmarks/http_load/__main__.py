@@ -0,0 +1,90 @@
+import argparse
+import asyncio
+import contextlib
+
+import httpx
+
+from ai_health.root.database import engine
+from benchmarks import http_load
+from benchmarks.http_load.population import remove_population, seed_population
+from benchmarks.http_load.report import build_report, print_comparison, print_summary, read_report, write_report
+from benchmarks.http_load.runner import run_scenario, sign_in
+from benchmarks.http_load.scenarios import SCENARIOS_BY_NAME, VirtualUser
+from benchmarks.http_load.server import uvicorn_server
+
+
+async def main(args: argparse.Namespace):
+    scenarios = [SCENARIOS_BY_NAME[name] for name in args.scenarios.split(",")]
+
+    print(f"Seeding {args.patients} patients, {args.doctors} doctors, {args.history_depth} rows per relation")
+    population = await seed_population(args.patients, args.doctors, args.history_depth)
+
+    try:
+        server = contextlib.nullcontext(args.url) if args.url else uvicorn_server(args.host, args.port, args.workers)
+
+        async with server as url:
+            limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+            async with httpx.AsyncClient(base_url=url, limits=limits, timeout=args.timeout) as client:
+                users = [VirtualUser(patient=patient) for patient in population.patients]
+                await sign_in(client, users, args.concurrency)
+
+                results = []
+                for scenario in scenarios:
+                    print(f"Running {scenario.name} for {args.duration}s")
+                    results.append(
+                        await run_scenario(client, scenario, users, args.concurrency, args.duration, args.warmup)
+                    )
+    finally:
+        if not args.keep_data:
+            await remove_population(population)
+        await engine.dispose()
+
+    config = {
+        "url": args.url,
+        "workers": None if args.url else args.workers,
+        "patients": args.patients,
+        "doctors": args.doctors,
+        "history_depth": args.history_depth,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "warmup": args.warmup,
+    }
+    report = build_report(results, config)
+    write_report(report, args.report)
+
+    print_summary(report)
+    print(f"Report written to {args.report}")
+
+    if args.compare:
+        print_comparison(read_report(args.compare), report)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.http_load",
+        description=http_load.__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--patients", type=int, default=50)
+    parser.add_argument("--doctors", type=int, default=20)
+    parser.add_argument("--history-depth", type=int, default=50, help="Rows per relation of every patient")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS_BY_NAME), help="Comma separated, run in order")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=20, help="Seconds recorded per scenario")
+    parser.add_argument("--warmup", type=float, default=3, help="Seconds per scenario before recording")
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds before a request counts as failed")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--url", help="Load a server already running there instead of starting uvicorn")
+    parser.add_argument("--report", default="http_load_report.json")
+    parser.add_argument("--compare", help="A previous report to compare this run with")
+    parser.add_argument("--keep-data", action="store_true", help="Leave the seeded rows in the database")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios.split(",")) - set(SCENARIOS_BY_NAME)
+    if unknown:
+        parser.error(f"Unknown scenarios {', '.join(sorted(unknown))}, choose from {', '.join(SCENARIOS_BY_NAME)}")
+
+    asyncio.run(main(args))
@@ -0,0 +1,56 @@
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import delete
+
+from ai_health.database.orms.auth_orm import User as UserDB
+from ai_health.database.orms.doctor_orm import Doctor as DoctorDB
+from ai_health.root.database import async_session
+from ai_health.services.utils.password_utils import generate_password_hash
+from benchmarks.seed import SeededPatient, seed_doctors, seed_patient
+
+
+# Every seeded patient signs in with it
+PASSWORD = "benchmark-password"
+
+
+@dataclass
+class Population:
+    patients: list[SeededPatient]
+    doctor_ids: list[uuid.UUID]
+
+
+async def seed_population(patients: int, doctors: int, history_depth: int) -> Population:
+    doctor_ids = await seed_doctors(doctors)
+    # Hashed once, bcrypt would otherwise take longer than the inserts
+    password_hash = generate_password_hash(PASSWORD)
+
+    seeded = []
+    for i in range(patients):
+        seeded.append(
+            await seed_patient(
+                visits=history_depth,
+                medications=history_depth,
+                appointments=history_depth,
+                lab_reports=history_depth,
+                medical_history=history_depth,
+                billings=history_depth,
+                password=password_hash,
+                doctor_ids=doctor_ids,
+            )
+        )
+
+        if (i + 1) % 100 == 0:
+            print(f"Seeded {i + 1} of {patients} patients")
+
+    return Population(patients=seeded, doctor_ids=doctor_ids)
+
+
+async def remove_population(population: Population):
+    """
+    Deleting the patients cascades to their records, including the ones the create scenarios added
+    """
+    async with async_session() as session:
+        await session.execute(delete(UserDB).where(UserDB.user_id.in_([x.user_id for x in population.patients])))
+        await session.execute(delete(DoctorDB).where(DoctorDB.doctor_id.in_(population.doctor_ids)))
+        await session.commit()
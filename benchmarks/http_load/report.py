@@ -0,0 +1,123 @@
+import json
+import subprocess
+from datetime import datetime, timezone
+from typing import Optional
+
+from benchmarks.http_load.runner import ScenarioResult
+from benchmarks.utils import percentile, print_table
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return completed.stdout.strip()
+
+
+def _scenario_report(result: ScenarioResult) -> dict:
+    requests = len(result.latencies_ns)
+    latencies_ms = [latency / 1e6 for latency in result.latencies_ns]
+    statements = result.db_statements
+
+    return {
+        "name": result.scenario,
+        "note": result.note,
+        "requests": requests,
+        "errors": result.errors,
+        "statuses": {str(status): count for status, count in sorted(result.statuses.items())},
+        "seconds": round(result.seconds, 3),
+        "throughput_rps": round(requests / result.seconds, 2) if result.seconds else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies_ms) / requests, 3) if requests else 0.0,
+            "p50": round(percentile(latencies_ms, 50), 3),
+            "p95": round(percentile(latencies_ms, 95), 3),
+            "p99": round(percentile(latencies_ms, 99), 3),
+            "max": round(max(latencies_ms, default=0.0), 3),
+        },
+        # Null when the responses had no Server-Timing header, e.g an older build of the app
+        "db_statements_per_request": {
+            "mean": round(sum(statements) / len(statements), 2),
+            "p95": percentile(statements, 95),
+            "max": max(statements),
+        }
+        if statements
+        else None,
+    }
+
+
+def build_report(results: list[ScenarioResult], config: dict) -> dict:
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "config": config,
+        "scenarios": [_scenario_report(result) for result in results],
+    }
+
+
+def write_report(report: dict, path: str):
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+
+
+def read_report(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def print_summary(report: dict):
+    rows = []
+
+    for scenario in report["scenarios"]:
+        latency = scenario["latency_ms"]
+        statements = scenario["db_statements_per_request"]
+
+        rows.append(
+            [
+                scenario["name"],
+                scenario["requests"],
+                scenario["errors"],
+                float(scenario["throughput_rps"]),
+                float(latency["p50"]),
+                float(latency["p95"]),
+                float(latency["p99"]),
+                "-" if statements is None else float(statements["mean"]),
+            ]
+        )
+
+    print_table(["scenario", "requests", "errors", "req/s", "p50 ms", "p95 ms", "p99 ms", "db stmts"], rows)
+
+    for scenario in report["scenarios"]:
+        # Reports written before scenarios had notes dont have the key
+        if scenario.get("note"):
+            print(f"{scenario['name']}: {scenario['note']}")
+
+
+def print_comparison(baseline: dict, report: dict):
+    """
+    Changes of each scenario run in both, in percent of the baseline
+    """
+
+    def change(before: float, after: float) -> str:
+        return f"{(after - before) / before * 100:+.1f}%" if before else "-"
+
+    baseline_scenarios = {scenario["name"]: scenario for scenario in baseline["scenarios"]}
+    rows = []
+
+    for scenario in report["scenarios"]:
+        before = baseline_scenarios.get(scenario["name"])
+        if before is None:
+            continue
+
+        rows.append(
+            [
+                scenario["name"],
+                change(before["throughput_rps"], scenario["throughput_rps"]),
+                change(before["latency_ms"]["p50"], scenario["latency_ms"]["p50"]),
+                change(before["latency_ms"]["p99"], scenario["latency_ms"]["p99"]),
+            ]
+        )
+
+    print(f"Against {baseline.get('git_commit') or 'the baseline'} from {baseline['created_at']}")
+    print_table(["scenario", "req/s", "p50", "p99"], rows)
@@ -0,0 +1,98 @@
+import asyncio
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+import httpx
+
+from benchmarks.http_load.scenarios import Scenario, VirtualUser, signin_body
+
+
+# The db segment of the app's Server-Timing header, see ai_health.root.middlewares
+SERVER_TIMING_DB = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+# Sent for a request that failed before a response, e.g a refused connection or a timeout
+NO_RESPONSE = 0
+
+
+@dataclass
+class ScenarioResult:
+    scenario: str
+    note: Optional[str] = None
+    seconds: float = 0.0
+    latencies_ns: list[int] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    db_statements: list[int] = field(default_factory=list)
+
+    @property
+    def errors(self) -> int:
+        return sum(count for status, count in self.statuses.items() if not 200 <= status < 400)
+
+
+def _db_statements(response: httpx.Response) -> Optional[int]:
+    match = SERVER_TIMING_DB.search(response.headers.get("server-timing", ""))
+
+    return int(match.group(1)) if match else None
+
+
+async def sign_in(client: httpx.AsyncClient, users: list[VirtualUser], concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def sign_in_user(user: VirtualUser):
+        async with semaphore:
+            response = await client.post("/v1/auth/signin", json=signin_body(user))
+            response.raise_for_status()
+            user.access_token = response.json()["token"]["access_token"]
+
+    await asyncio.gather(*(sign_in_user(user) for user in users))
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    users: list[VirtualUser],
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> ScenarioResult:
+    """
+    Each of the `concurrency` clients sends its next request as soon as the previous one is answered. The
+    responses of the first `warmup` seconds arent recorded.
+    """
+    result = ScenarioResult(scenario=scenario.name, note=scenario.note)
+
+    async def client_loop(user: VirtualUser, deadline: float, record: bool):
+        i = 0
+
+        while time.perf_counter() < deadline:
+            start = time.perf_counter_ns()
+
+            try:
+                response = await client.request(**scenario.request(user, i))
+                status, db_statements = response.status_code, _db_statements(response)
+            except httpx.HTTPError:
+                status, db_statements = NO_RESPONSE, None
+
+            elapsed = time.perf_counter_ns() - start
+            i += 1
+
+            if record:
+                result.latencies_ns.append(elapsed)
+                result.statuses[status] += 1
+                if db_statements is not None:
+                    result.db_statements.append(db_statements)
+
+    clients = [users[i % len(users)] for i in range(concurrency)]
+
+    if warmup:
+        deadline = time.perf_counter() + warmup
+        await asyncio.gather(*(client_loop(user, deadline, record=False) for user in clients))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop(user, start + duration, record=True) for user in clients))
+    # The last requests end after the deadline, the throughput is over the time they actually took
+    result.seconds = time.perf_counter() - start
+
+    return result
@@ -0,0 +1,115 @@
+"""
+The requests each scenario sends. A client acts as one seeded patient and sends its scenario's request over
+and over, `i` counts its requests so the bodies of the create scenarios differ.
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Optional
+
+from benchmarks.fixtures import NOW
+from benchmarks.http_load.population import PASSWORD
+from benchmarks.seed import SeededPatient
+
+
+@dataclass
+class VirtualUser:
+    patient: SeededPatient
+    access_token: Optional[str] = None
+
+    def doctor_id(self, i: int) -> str:
+        return str(self.patient.doctor_ids[i % len(self.patient.doctor_ids)])
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    method: str
+    path: Callable[[VirtualUser], str]
+    body: Optional[Callable[[VirtualUser, int], dict]] = None
+    authenticated: bool = True
+    note: Optional[str] = None  # A caveat printed with the results, e.g what the request cant exercise
+
+    def request(self, user: VirtualUser, i: int) -> dict:
+        """
+        The keyword arguments of httpx.AsyncClient.request
+        """
+        request = {"method": self.method, "url": self.path(user)}
+
+        if self.body is not None:
+            request["json"] = self.body(user, i)
+        if self.authenticated:
+            request["headers"] = {"Authorization": f"Bearer {user.access_token}"}
+
+        return request
+
+
+def signin_body(user: VirtualUser, i: int = 0) -> dict:
+    return {"email": user.patient.email, "password": PASSWORD}
+
+
+def appointment_body(user: VirtualUser, i: int) -> dict:
+    return {
+        "patient_id": str(user.patient.user_id),
+        "doctor_id": user.doctor_id(i),
+        "appointment_date": (NOW + timedelta(days=i)).isoformat(),
+        "next_appointment_date": (NOW + timedelta(days=i + 30)).isoformat(),
+        "reason_for_appointment": "Routine check up and blood pressure review",
+        "status": "SCHEDULED",
+    }
+
+
+def visit_body(user: VirtualUser, i: int) -> dict:
+    return {
+        "patient_id": str(user.patient.user_id),
+        "doctor_id": user.doctor_id(i),
+        "visit_date": (NOW + timedelta(days=i)).isoformat(),
+        "reason_for_visit": "Follow up",
+        "notes": "Patient is recovering well, continue the current medication",
+        "vistor_name": "Chidi Okafor",
+        "visitor_relationship": "Brother",
+    }
+
+
+def medication_body(user: VirtualUser, i: int) -> dict:
+    return {
+        "patient_id": str(user.patient.user_id),
+        "doctor_id": user.doctor_id(i),
+        "medication_name": "Amlodipine",
+        "dosage": "5mg once daily",
+        "start_date": (NOW + timedelta(days=i)).isoformat(),
+        "end_date": (NOW + timedelta(days=i + 90)).isoformat(),
+    }
+
+
+def billing_body(user: VirtualUser, i: int) -> dict:
+    return {
+        "patient_id": str(user.patient.user_id),
+        "doctor_id": user.doctor_id(i),
+        "title": f"Consultation {i}",
+        "status": "PENDING",
+        "amount": 12500.0 + i,
+    }
+
+
+# These lists take no patient_id filter, so a request reads a page of every seeded patient's rows instead of
+# one patient's (patient_id, date) index range like the appointments and medications lists do
+UNFILTERED_LIST = "unfiltered, the endpoint takes no patient_id so pages span every patient's rows"
+
+SCENARIOS = (
+    Scenario("signin", "POST", lambda user: "/v1/auth/signin", body=signin_body, authenticated=False),
+    Scenario("me", "GET", lambda user: "/v1/auth/me"),
+    Scenario("list_appointments", "GET", lambda user: f"/v1/appointments/?patient_id={user.patient.user_id}"),
+    Scenario("list_medications", "GET", lambda user: f"/v1/medications/?patient_id={user.patient.user_id}"),
+    Scenario("list_billings", "GET", lambda user: "/v1/billings/"),
+    Scenario("list_visits", "GET", lambda user: "/v1/visits/", note=UNFILTERED_LIST),
+    Scenario("list_lab_reports", "GET", lambda user: "/v1/lab_reports/", note=UNFILTERED_LIST),
+    Scenario("list_medical_history", "GET", lambda user: "/v1/medical_history/", note=UNFILTERED_LIST),
+    Scenario("list_doctors", "GET", lambda user: "/v1/doctors/"),
+    Scenario("create_appointment", "POST", lambda user: "/v1/appointments/", body=appointment_body),
+    Scenario("create_visit", "POST", lambda user: "/v1/visits/", body=visit_body),
+    Scenario("create_medication", "POST", lambda user: "/v1/medications/", body=medication_body),
+    Scenario("create_billing", "POST", lambda user: "/v1/billings/", body=billing_body),
+)
+
+SCENARIOS_BY_NAME = {scenario.name: scenario for scenario in SCENARIOS}
@@ -0,0 +1,61 @@
+import asyncio
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+
+
+APP = "ai_health.root.app:app"
+
+STARTUP_TIMEOUT = 60  # Seconds
+SHUTDOWN_TIMEOUT = 30
+
+
+async def _wait_until_ready(url: str, process: subprocess.Popen):
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+
+    async with httpx.AsyncClient(base_url=url) as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+
+            try:
+                await client.get("/docs")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.25)
+
+    raise RuntimeError(f"uvicorn didnt answer on {url} within {STARTUP_TIMEOUT}s")
+
+
+@asynccontextmanager
+async def uvicorn_server(host: str, port: int, workers: int) -> AsyncIterator[str]:
+    """
+    Serves the app in a uvicorn subprocess, with the environment and .env of this one, yields its url
+    """
+    # fmt: off
+    command = [
+        sys.executable, "-m", "uvicorn", APP,
+        "--host", host,
+        "--port", str(port),
+        "--workers", str(workers),
+        "--no-access-log",
+        "--log-level", "warning",
+    ]
+    # fmt: on
+    process = subprocess.Popen(command)
+    url = f"http://{host}:{port}"
+
+    try:
+        await _wait_until_ready(url, process)
+        yield url
+    finally:
+        process.terminate()
+
+        try:
+            process.wait(timeout=SHUTDOWN_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
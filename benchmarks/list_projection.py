@@ -0,0 +1,155 @@
+"""
+Peak Python memory and latency of the list db_handlers on a page of `--rows` rows, the previous ORM query
+against the current column projection.
+
+The previous query selects the ORM entities, joins the doctor with joinedload where the schema has one and
+model_validates every row. The current one is the db_handler itself, selecting the schema's columns as Core
+rows and building the schemas with its Projection. Both read the same page of a seeded patient, `--rows` rows
+per list. Needs the migrated Postgres from the .env, the seeded patient is removed again at the end.
+
+    python -m benchmarks.list_projection --rows 10000 --iterations 20
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from ai_health.database.db_handlers import (
+    appointments_db_handler,
+    billing_db_handler,
+    labreports_db_handler,
+    medical_history_db_handler,
+    medications_db_handler,
+    visits_db_handler,
+)
+from ai_health.database.pagination import next_page, paginate
+from ai_health.root.database import engine, read_session
+from benchmarks.seed import remove_patient, seed_patient
+from benchmarks.utils import percentile, print_table
+
+
+# (list, the db_handler's projection, its sort column, its id column, the db_handler call)
+LISTS = (
+    (
+        "appointments",
+        appointments_db_handler.APPOINTMENTS,
+        appointments_db_handler.AppointmentDB.appointment_date,
+        appointments_db_handler.AppointmentDB.appointment_id,
+        lambda patient_id, rows: appointments_db_handler.get_appointments(limit=rows, patient_id=patient_id),
+    ),
+    (
+        "billings",
+        billing_db_handler.BILLINGS,
+        billing_db_handler.BillingDB.date_created,
+        billing_db_handler.BillingDB.billing_id,
+        lambda patient_id, rows: billing_db_handler.get_billings(user_id=patient_id, limit=rows),
+    ),
+    (
+        "visits",
+        visits_db_handler.VISITS,
+        visits_db_handler.VisitDB.visit_date,
+        visits_db_handler.VisitDB.visit_id,
+        lambda patient_id, rows: visits_db_handler.get_visits(limit=rows, patient_id=patient_id),
+    ),
+    (
+        "medications",
+        medications_db_handler.MEDICATIONS,
+        medications_db_handler.MedicationDB.start_date,
+        medications_db_handler.MedicationDB.medication_id,
+        lambda patient_id, rows: medications_db_handler.get_medications(limit=rows, patient_id=patient_id),
+    ),
+    (
+        "lab_reports",
+        labreports_db_handler.LAB_REPORTS,
+        labreports_db_handler.LabReportDB.test_date,
+        labreports_db_handler.LabReportDB.report_id,
+        lambda patient_id, rows: labreports_db_handler.get_lab_reports(limit=rows, patient_id=patient_id),
+    ),
+    (
+        "medical_history",
+        medical_history_db_handler.MEDICAL_HISTORIES,
+        medical_history_db_handler.MedicalHistoryDB.diagnosis_date,
+        medical_history_db_handler.MedicalHistoryDB.history_id,
+        lambda patient_id, rows: medical_history_db_handler.get_medical_histories(
+            limit=rows, patient_id=patient_id
+        ),
+    ),
+)
+
+
+def orm_loader(projection, sort_column, id_column):
+    """
+    The list as the db_handlers loaded it before the projection
+    """
+    orm, schema = projection.orm, projection.schema
+
+    async def load(patient_id, rows: int):
+        async with read_session() as session:
+            stmt = select(orm).where(orm.patient_id == patient_id)
+            if projection.nested:
+                stmt = stmt.options(*(joinedload(getattr(orm, field)) for field in projection.nested))
+
+            stmt = paginate(stmt, sort_column, id_column, limit=rows)
+            result = (await session.execute(statement=stmt)).unique().scalars().all()
+            result, _ = next_page(result, sort_column, id_column, limit=rows)
+
+            return [schema.model_validate(x) for x in result]
+
+    return load
+
+
+async def measure(loader, patient_id, rows: int, iterations: int) -> list:
+    # Warms up the connection pool and the statement caches
+    await loader(patient_id, rows)
+
+    tracemalloc.start()
+    await loader(patient_id, rows)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await loader(patient_id, rows)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return [peak_memory / 1024, percentile(latencies, 50), percentile(latencies, 95)]
+
+
+async def main(rows: int, iterations: int):
+    patient = await seed_patient(
+        visits=rows,
+        medications=rows,
+        appointments=rows,
+        lab_reports=rows,
+        medical_history=rows,
+        billings=rows,
+    )
+
+    try:
+        table = []
+        for name, projection, sort_column, id_column, handler in LISTS:
+            orm = await measure(orm_loader(projection, sort_column, id_column), patient.user_id, rows, iterations)
+            projected = await measure(handler, patient.user_id, rows, iterations)
+
+            table.append([name, "orm", *orm, "-", "-"])
+            table.append([name, "projection", *projected, orm[0] / projected[0], orm[1] / projected[1]])
+    finally:
+        await remove_patient(patient)
+        await engine.dispose()
+
+    print(f"{rows} rows per list, {iterations} iterations")
+    print_table(["list", "query", "peak KiB", "p50 ms", "p95 ms", "memory x", "p50 x"], table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(main(rows=args.rows, iterations=args.iterations))
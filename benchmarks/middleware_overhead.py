@@ -0,0 +1,103 @@
+"""
+Per request overhead of the timing middlewares, the old @app.middleware("http") one against the pure ASGI ones.
+
+Each variant wraps the same tiny app, requests are sent straight through the ASGI interface so no server or
+client time is measured. The streaming endpoint sends 100 chunks, BaseHTTPMiddleware relays each of them
+through a memory stream.
+
+    python -m benchmarks.middleware_overhead --requests 20000
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+
+from ai_health.root.middlewares import MetricsMiddleware, ServerTimingMiddleware
+from ai_health.root.utils.timed_route import TimedAPIRoute
+from benchmarks.utils import asgi_request, percentile, print_table
+
+
+VARIANTS = ("none", "base_http", "server_timing", "server_timing+metrics")
+PATHS = ("/json", "/stream")
+
+
+def build_app(variant: str) -> FastAPI:
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.router.route_class = TimedAPIRoute
+
+    @app.get("/json")
+    async def json_endpoint():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream_endpoint():
+        async def chunks():
+            for _ in range(100):
+                yield b"x" * 64
+
+        return StreamingResponse(chunks())
+
+    if variant == "base_http":
+        # The middleware this replaced, as it was in ai_health.root.app
+        @app.middleware("http")
+        async def add_process_time_header(request: Request, call_next):
+            start_time = time.time()
+            response = await call_next(request)
+            process_time = time.time() - start_time
+            response.headers["X-Process-Time"] = str(process_time)
+            return response
+
+    elif variant.startswith("server_timing"):
+        app.add_middleware(ServerTimingMiddleware)
+
+        if variant.endswith("+metrics"):
+            app.add_middleware(MetricsMiddleware)
+
+    return app
+
+
+async def measure(variant: str, path: str, requests: int) -> list[int]:
+    app = build_app(variant)
+
+    # Builds the middleware stack and warms the code paths up
+    for _ in range(min(requests, 500)):
+        await asgi_request(app, path)
+
+    return [await asgi_request(app, path) for _ in range(requests)]
+
+
+def main(requests: int):
+    rows = []
+
+    for path in PATHS:
+        baseline = None
+
+        for variant in VARIANTS:
+            durations = asyncio.run(measure(variant, path, requests))
+            mean_us = sum(durations) / len(durations) / 1e3
+            baseline = mean_us if baseline is None else baseline
+
+            rows.append(
+                [
+                    path,
+                    variant,
+                    mean_us,
+                    percentile(durations, 50) / 1e3,
+                    percentile(durations, 99) / 1e3,
+                    mean_us - baseline,
+                ]
+            )
+
+    print(f"{requests} requests per variant, times in microseconds")
+    print_table(["path", "middleware", "mean", "p50", "p99", "overhead"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+
+    main(requests=args.requests)
@@ -0,0 +1,84 @@
+"""
+Latency of an unrelated endpoint while signins verify bcrypt passwords at the same time.
+
+Compares verifying the password inline on the event loop with running it on the password executor.
+
+    python -m benchmarks.password_hashing --signins 40 --pings 200
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from ai_health.services.utils import password_utils
+from benchmarks.utils import percentile, print_table
+
+
+PASSWORD = "benchmark-password"
+PING_INTERVAL = 0.01  # Seconds
+
+
+def build_app(offload: bool, hashed_password: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.post("/signin")
+    async def signin():
+        if offload:
+            is_valid = await password_utils.password_executor.run(
+                password_utils.verify_password_hash, PASSWORD, hashed_password
+            )
+        else:
+            is_valid = password_utils.verify_password_hash(PASSWORD, hashed_password)
+
+        return {"valid": is_valid}
+
+    return app
+
+
+async def run_scenario(app: FastAPI, signins: int, pings: int) -> list[float]:
+    latencies = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+
+        async def ping_loop():
+            # Latency is measured from when each ping was due, so time spent stuck behind a blocked loop counts
+            start = time.perf_counter()
+            for i in range(pings):
+                due = start + i * PING_INTERVAL
+                await asyncio.sleep(max(due - time.perf_counter(), 0))
+                await client.get("/ping")
+                latencies.append((time.perf_counter() - due) * 1000)
+
+        await asyncio.gather(ping_loop(), *(client.post("/signin") for _ in range(signins)))
+
+    return latencies
+
+
+async def main(signins: int, pings: int):
+    hashed_password = password_utils.generate_password_hash(PASSWORD)
+
+    rows = []
+    for name, offload in (("inline", False), ("executor", True)):
+        latencies = await run_scenario(build_app(offload, hashed_password), signins=signins, pings=pings)
+        rows.append([name, percentile(latencies, 50), percentile(latencies, 99), max(latencies)])
+
+    password_utils.password_executor.shutdown()
+
+    print(f"/ping latency in ms with {signins} concurrent signins")
+    print_table(["mode", "p50", "p99", "max"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--signins", type=int, default=40)
+    parser.add_argument("--pings", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(main(signins=args.signins, pings=args.pings))
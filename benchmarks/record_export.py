@@ -0,0 +1,124 @@
+"""
+Peak RSS of exporting a large seeded patient, materialized like /auth/me versus streamed like /auth/me/export.
+
+Each strategy runs in its own process, so its peak RSS isnt polluted by the seeding or by the other
+strategy. Needs the migrated Postgres from the .env, the seeded patient is removed again at the end.
+
+    python -m benchmarks.record_export --rows 100000
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.utils import print_table
+
+
+RELATIONS = ("visits", "medications", "appointments", "lab_reports", "medical_history", "billings")
+STRATEGIES = ("materialized", "streamed")
+
+
+def peak_rss_kib() -> int:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+async def export(strategy: str, user_id: str) -> int:
+    from ai_health.database.db_handlers import auth_db_handler
+    from ai_health.root.database import engine
+    from ai_health.schemas.auth_schemas import User
+    from ai_health.services import auth_services
+
+    exported_bytes = 0
+
+    if strategy == "materialized":
+        user = await auth_db_handler.get_user_with_id_and_relations(user_id=user_id)
+        exported_bytes = len(user.model_dump_json().encode())
+    else:
+        user_extended = await auth_db_handler.get_user_with_user_id(user_id=user_id)
+        async for chunk in auth_services.export_user_records(user=User(**user_extended.model_dump())):
+            exported_bytes += len(chunk)
+
+    await engine.dispose()
+
+    return exported_bytes
+
+
+def measure(strategy: str, user_id: str):
+    # Imports the app modules before taking the baseline, so only the export itself is measured
+    import ai_health.root.app  # noqa: F401
+
+    baseline = peak_rss_kib()
+    start = time.perf_counter()
+    exported_bytes = asyncio.run(export(strategy, user_id))
+    seconds = time.perf_counter() - start
+
+    print(
+        json.dumps(
+            {"baseline_kib": baseline, "peak_kib": peak_rss_kib(), "bytes": exported_bytes, "seconds": seconds}
+        )
+    )
+
+
+async def seed(rows: int):
+    from benchmarks.seed import seed_patient
+
+    per_relation = rows // len(RELATIONS)
+
+    return await seed_patient(**{relation: per_relation for relation in RELATIONS})
+
+
+async def remove(patient):
+    from ai_health.root.database import engine
+    from benchmarks.seed import remove_patient
+
+    await remove_patient(patient)
+    await engine.dispose()
+
+
+def main(rows: int):
+    patient = asyncio.run(seed(rows))
+
+    results = []
+    try:
+        for strategy in STRATEGIES:
+            command = [sys.executable, "-m", "benchmarks.record_export", "--measure", strategy]
+            output = subprocess.run(
+                [*command, "--user-id", str(patient.user_id)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            results.append(
+                [
+                    strategy,
+                    result["baseline_kib"] / 1024,
+                    result["peak_kib"] / 1024,
+                    (result["peak_kib"] - result["baseline_kib"]) / 1024,
+                    result["bytes"],
+                    result["seconds"],
+                ]
+            )
+    finally:
+        asyncio.run(remove(patient))
+
+    print(f"{rows // len(RELATIONS) * len(RELATIONS)} records across {len(RELATIONS)} tables")
+    print_table(["strategy", "baseline MiB", "peak MiB", "growth MiB", "bytes", "seconds"], results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--measure", choices=STRATEGIES, help=argparse.SUPPRESS)
+    parser.add_argument("--user-id", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.user_id)
+    else:
+        main(rows=args.rows)
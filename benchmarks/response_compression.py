@@ -0,0 +1,137 @@
+"""
+Bytes on the wire against compression CPU for each response encoding and level, on bodies shaped like the
+real responses: the /auth/me aggregate, list pages and the /auth/me/export NDJSON stream.
+
+The bodies are serialized from the synthetic fixtures, so no database is needed. Whole bodies go through
+the encoder's `compress` like CompressionMiddleware does for a response sent at once, the export goes
+through its `stream` a chunk of EXPORT_CHUNK_SIZE rows at a time, each chunk flushed. CPU is process time
+per compression. zstd and br need the zstandard and brotli packages, they are skipped when missing.
+
+    python -m benchmarks.response_compression --history-depth 50 --page-size 50 --export-rows 5000
+"""
+
+import argparse
+import time
+
+from ai_health.root import compression
+from ai_health.root.settings import Settings
+from ai_health.schemas.appointment_schema import AppointmentList
+from ai_health.schemas.billings_schema import BillingsWithDoctorList
+from ai_health.schemas.doctor_schema import DoctorList
+from ai_health.services.auth_services import _export_line
+from benchmarks.fixtures import make_appointment, make_billing, make_doctor, make_user_with_relations
+from benchmarks.utils import print_table
+
+
+settings = Settings()
+
+RELATIONS = ("visits", "medications", "appointments", "lab_reports", "medical_history", "billings")
+
+# Per encoding, the fastest level, the default one and the ones above it
+LEVELS = {
+    "gzip": (1, 6, 9),
+    "br": (1, 4, 6, 9),
+    "zstd": (1, 3, 6, 12),
+}
+
+
+def bodies(history_depth: int, page_size: int) -> dict[str, bytes]:
+    patient = make_user_with_relations(history_depth=history_depth)
+    doctors = [make_doctor(i) for i in range(5)]
+
+    appointments = AppointmentList(
+        detail="Appointments gotten",
+        appointments=[make_appointment(patient.user_id, doctors[i % 5], i) for i in range(page_size)],
+    )
+    billings = BillingsWithDoctorList(billings=[make_billing(doctors[i % 5], i) for i in range(page_size)])
+    doctor_list = DoctorList(doctors=[make_doctor(i) for i in range(page_size)])
+
+    return {
+        "me": patient.model_dump_json().encode(),
+        "appointments page": appointments.model_dump_json().encode(),
+        "billings page": billings.model_dump_json().encode(),
+        "doctors page": doctor_list.model_dump_json().encode(),
+    }
+
+
+def export_chunks(rows: int) -> list[bytes]:
+    """
+    The export of a patient with `rows` rows per relation, chunked like export_user_records yields it
+    """
+    patient = make_user_with_relations(history_depth=rows)
+
+    chunks = [_export_line("user", patient)]
+    for relation in RELATIONS:
+        records = getattr(patient, relation)
+        for start in range(0, len(records), settings.EXPORT_CHUNK_SIZE):
+            chunk = records[start : start + settings.EXPORT_CHUNK_SIZE]
+            chunks.append(b"".join(_export_line(relation, record) for record in chunk))
+
+    return chunks
+
+
+def compress_body(encoder, body: bytes) -> int:
+    return len(encoder.compress(body))
+
+
+def compress_stream(encoder, chunks: list[bytes]) -> int:
+    stream = encoder.stream()
+    compressed = sum(len(stream.compress(chunk)) for chunk in chunks[:-1])
+
+    return compressed + len(stream.finish(chunks[-1]))
+
+
+def measure(compress, encoder, payload, iterations: int) -> tuple[int, float]:
+    size = compress(encoder, payload)
+
+    start = time.process_time_ns()
+    for _ in range(iterations):
+        compress(encoder, payload)
+    cpu_us = (time.process_time_ns() - start) / iterations / 1000
+
+    return size, cpu_us
+
+
+def main(history_depth: int, page_size: int, export_rows: int, iterations: int):
+    encoders = []
+    for name, levels in LEVELS.items():
+        for level in levels:
+            try:
+                encoders.append(compression.ENCODERS[name](level=level))
+            except ImportError as e:
+                print(f"Skipping {name}: {e}")
+                break
+
+    payloads = [(name, compress_body, body, len(body)) for name, body in bodies(history_depth, page_size).items()]
+    chunks = export_chunks(export_rows)
+    payloads.append(("export (streamed)", compress_stream, chunks, sum(len(chunk) for chunk in chunks)))
+
+    table = []
+    for payload_name, compress, payload, raw_size in payloads:
+        table.append([payload_name, "identity", "-", raw_size, 1.0, 0.0, "-"])
+
+        for encoder in encoders:
+            size, cpu_us = measure(compress, encoder, payload, iterations)
+            table.append([payload_name, encoder.name, encoder.level, size, raw_size / size, cpu_us, raw_size / cpu_us])
+
+    print(
+        f"history depth {history_depth}, pages of {page_size}, export of {export_rows} rows per relation, "
+        f"{iterations} iterations"
+    )
+    print_table(["payload", "encoding", "level", "bytes", "ratio", "cpu us", "MB/s"], table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history-depth", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--export-rows", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    main(
+        history_depth=args.history_depth,
+        page_size=args.page_size,
+        export_rows=args.export_rows,
+        iterations=args.iterations,
+    )
@@ -0,0 +1,213 @@
+"""
+Seeds a patient with a large history into the database from the .env, for benchmarks that query Postgres.
+
+The database must already be migrated. Everything seeded hangs off the patient and the seeded doctors, so
+`remove_patient` deletes it all through the ON DELETE CASCADE foreign keys.
+"""
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import delete, insert
+
+from ai_health.database.orms.auth_orm import User as UserDB
+from ai_health.database.orms.billing_orm import Billing as BillingDB
+from ai_health.database.orms.doctor_orm import Doctor as DoctorDB
+from ai_health.database.orms.medication_n_dosage_orm import (
+    Appointment as AppointmentDB,
+    LabReport as LabReportDB,
+    MedicalHistory as MedicalHistoryDB,
+    Medication as MedicationDB,
+)
+from ai_health.database.orms.visits_orm import Visit as VisitDB
+from ai_health.root.database import async_session
+from benchmarks.fixtures import NOW
+
+
+INSERT_CHUNK_SIZE = 1000
+
+
+@dataclass
+class SeededPatient:
+    user_id: uuid.UUID
+    email: str
+    doctor_ids: list[uuid.UUID] = field(default_factory=list)
+
+
+async def _insert_rows(session, orm, rows: list[dict]):
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        await session.execute(insert(orm), rows[start : start + INSERT_CHUNK_SIZE])
+
+
+async def seed_doctors(count: int) -> list[uuid.UUID]:
+    run_id = uuid.uuid4().hex[:8]
+    doctor_ids = [uuid.uuid4() for _ in range(count)]
+
+    async with async_session() as session:
+        await _insert_rows(
+            session,
+            DoctorDB,
+            [
+                {
+                    "doctor_id": doctor_id,
+                    "first_name": f"Doctor{i}",
+                    "last_name": "Adeyemi",
+                    "specialty": "General Practice",
+                    "contact_number": "+2348012345678",
+                    "email": f"benchmark-{run_id}-doctor{i}@ai-health.example.com",
+                }
+                for i, doctor_id in enumerate(doctor_ids)
+            ],
+        )
+        await session.commit()
+
+    return doctor_ids
+
+
+async def seed_patient(
+    visits: int = 50,
+    medications: int = 30,
+    appointments: int = 40,
+    lab_reports: int = 20,
+    medical_history: int = 20,
+    billings: int = 20,
+    doctors: int = 5,
+    password: str = "benchmark-password-hash",
+    doctor_ids: Optional[list[uuid.UUID]] = None,
+) -> SeededPatient:
+    """
+    Pass `doctor_ids` to share doctors already seeded with `seed_doctors` instead of seeding `doctors` new ones
+    """
+    if doctor_ids is None:
+        doctor_ids = await seed_doctors(doctors)
+
+    run_id = uuid.uuid4().hex[:8]
+    patient = SeededPatient(
+        user_id=uuid.uuid4(),
+        email=f"benchmark-{run_id}@ai-health.example.com",
+        doctor_ids=doctor_ids,
+    )
+
+    def doctor_for(i: int) -> uuid.UUID:
+        return patient.doctor_ids[i % len(patient.doctor_ids)]
+
+    async with async_session() as session:
+        await _insert_rows(
+            session,
+            UserDB,
+            [
+                {
+                    "user_id": patient.user_id,
+                    "first_name": "Ada",
+                    "last_name": "Okafor",
+                    "email": patient.email,
+                    "password": password,
+                    "phone_number": "+2348098765432",
+                    "user_type": "PATIENT",
+                    "is_verified": True,
+                    "date_of_birth": NOW - timedelta(days=365 * 34),
+                    "gender": "FEMALE",
+                    "address": "12 Marina Road, Lagos",
+                }
+            ],
+        )
+        await _insert_rows(
+            session,
+            VisitDB,
+            [
+                {
+                    "patient_id": patient.user_id,
+                    "doctor_id": doctor_for(i),
+                    "visit_date": NOW - timedelta(days=i),
+                    "reason_for_visit": "Follow up",
+                    "notes": "Patient is recovering well, continue the current medication",
+                    "vistor_name": "Chidi Okafor",
+                    "visitor_relationship": "Brother",
+                }
+                for i in range(visits)
+            ],
+        )
+        await _insert_rows(
+            session,
+            MedicationDB,
+            [
+                {
+                    "patient_id": patient.user_id,
+                    "doctor_id": doctor_for(i),
+                    "medication_name": "Amlodipine",
+                    "dosage": "5mg once daily",
+                    "start_date": NOW - timedelta(days=i),
+                    "end_date": NOW + timedelta(days=90),
+                }
+                for i in range(medications)
+            ],
+        )
+        await _insert_rows(
+            session,
+            AppointmentDB,
+            [
+                {
+                    "patient_id": patient.user_id,
+                    "doctor_id": doctor_for(i),
+                    "appointment_date": NOW - timedelta(days=i),
+                    "next_appointment_date": NOW + timedelta(days=30),
+                    "reason_for_appointment": "Routine check up and blood pressure review",
+                    "status": "SCHEDULED",
+                }
+                for i in range(appointments)
+            ],
+        )
+        await _insert_rows(
+            session,
+            LabReportDB,
+            [
+                {
+                    "patient_id": patient.user_id,
+                    "test_name": "Full blood count",
+                    "test_date": NOW - timedelta(days=i),
+                    "result": "Within normal range",
+                    "notes": "No further action needed",
+                }
+                for i in range(lab_reports)
+            ],
+        )
+        await _insert_rows(
+            session,
+            MedicalHistoryDB,
+            [
+                {
+                    "patient_id": patient.user_id,
+                    "condition": "Hypertension",
+                    "diagnosis_date": NOW - timedelta(days=365 + i),
+                    "notes": "Managed with medication and diet",
+                }
+                for i in range(medical_history)
+            ],
+        )
+        await _insert_rows(
+            session,
+            BillingDB,
+            [
+                {
+                    "patient_id": patient.user_id,
+                    "doctor_id": doctor_for(i),
+                    "title": f"Consultation {i}",
+                    "status": "PENDING",
+                    "amount": 12500.0 + i,
+                }
+                for i in range(billings)
+            ],
+        )
+
+        await session.commit()
+
+    return patient
+
+
+async def remove_patient(patient: SeededPatient):
+    async with async_session() as session:
+        await session.execute(delete(UserDB).where(UserDB.user_id == patient.user_id))
+        await session.execute(delete(DoctorDB).where(DoctorDB.doctor_id.in_(patient.doctor_ids)))
+        await session.commit()
@@ -0,0 +1,342 @@
+"""
+Where the CPU of turning database rows into a JSON response goes, for the User, AppointmentWithDoctor,
+BillingWithDoctor and UserWithAllRelations responses.
+
+The current path is timed a stage at a time: ORM hydration, the db_handler's model_validate, the
+`Model(**x.model_dump())` rebuild some services do, FastAPI's response_model validation and serialization,
+then ORJSONResponse's orjson encoding. The other variants start from Core rows of the same query, selecting
+only the columns the schema has:
+
+- typeadapter: a TypeAdapter of the response type validates the row mappings and dumps them to JSON
+- construct: model_construct builds the models without validating, a TypeAdapter dumps them
+- orjson: orjson encodes the row mappings as they are, no pydantic at all
+
+The rows are read from an in-memory SQLite seeded with a fixture patient, so no database is needed. Loading
+includes sqlite3's fetch instead of asyncpg's, compare the variants with each other rather than with
+production latencies. The lists are `--page-size` rows, the patient has `--history-depth` rows per relation.
+
+    python -m benchmarks.serialization --history-depth 50 --page-size 50 --iterations 500
+"""
+
+import argparse
+import asyncio
+import functools
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, get_args, get_origin
+
+import orjson
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Connection, create_engine, insert, select
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from ai_health.database.orms.auth_orm import User as UserDB
+from ai_health.database.orms.billing_orm import Billing as BillingDB
+from ai_health.database.orms.doctor_orm import Doctor as DoctorDB
+from ai_health.database.orms.medication_n_dosage_orm import (
+    Appointment as AppointmentDB,
+    LabReport as LabReportDB,
+    MedicalHistory as MedicalHistoryDB,
+    Medication as MedicationDB,
+)
+from ai_health.database.orms.visits_orm import Visit as VisitDB
+from ai_health.root.utils.abstract_base import AbstractBase
+from ai_health.schemas.appointment_schema import AppointmentWithDoctor
+from ai_health.schemas.auth_schemas import User, UserWithAllRelations
+from ai_health.schemas.billings_schema import BillingWithDoctor
+from ai_health.schemas.doctor_schema import Doctor
+from benchmarks.fixtures import make_user_with_relations
+from benchmarks.utils import print_table
+
+
+# The relations of UserWithAllRelations as (field, orm, doctor relationship the db_handler joins)
+RELATIONS = (
+    ("visits", VisitDB, VisitDB.doctor),
+    ("medications", MedicationDB, MedicationDB.doctor),
+    ("appointments", AppointmentDB, AppointmentDB.doctor),
+    ("lab_reports", LabReportDB, None),
+    ("medical_history", MedicalHistoryDB, None),
+    ("billings", BillingDB, BillingDB.doctor),
+)
+
+VARIANTS = ("current", "typeadapter", "construct", "orjson")
+STAGES = ("load", "validate", "rebuild", "response_model", "encode")
+
+
+def _columns(orm, schema: type[BaseModel]) -> list[str]:
+    return [name for name in schema.model_fields if name in orm.__table__.c]
+
+
+def _row(orm, values: dict) -> dict:
+    return {key: value for key, value in values.items() if key in orm.__table__.c}
+
+
+def seed(connection: Connection, patient: UserWithAllRelations):
+    doctors = {}
+    for field, _, doctor in RELATIONS:
+        if doctor is not None:
+            doctors.update({record.doctor.doctor_id: record.doctor for record in getattr(patient, field)})
+
+    connection.execute(insert(DoctorDB), [_row(DoctorDB, doctor.model_dump()) for doctor in doctors.values()])
+    connection.execute(insert(UserDB), [_row(UserDB, {**patient.model_dump(), "password": "benchmark"})])
+
+    for field, orm, _ in RELATIONS:
+        rows = [{**record.model_dump(), "patient_id": patient.user_id} for record in getattr(patient, field)]
+        connection.execute(insert(orm), [_row(orm, row) for row in rows])
+
+    connection.commit()
+
+
+def _core_list(connection: Connection, orm, schema: type[BaseModel], patient_id, limit: Optional[int]):
+    """
+    The rows as dicts shaped like `schema`, with the doctor nested under "doctor" when it has one, in one
+    joined query
+    """
+    own = _columns(orm, schema)
+    with_doctor = "doctor" in schema.model_fields
+    doctor_columns = _columns(DoctorDB, Doctor) if with_doctor else []
+
+    stmt = select(*(orm.__table__.c[name] for name in own)).where(orm.patient_id == patient_id).limit(limit)
+    if with_doctor:
+        stmt = stmt.add_columns(*(DoctorDB.__table__.c[name].label(f"doctor__{name}") for name in doctor_columns))
+        stmt = stmt.join(DoctorDB, orm.doctor_id == DoctorDB.doctor_id)
+
+    rows = []
+    for row in connection.execute(stmt).mappings():
+        values = {name: row[name] for name in own}
+        if with_doctor:
+            values["doctor"] = {name: row[f"doctor__{name}"] for name in doctor_columns}
+        rows.append(values)
+
+    return rows
+
+
+@functools.cache
+def _nested_models(model: type[BaseModel]) -> list[tuple[str, bool, type[BaseModel]]]:
+    nested = []
+
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        many = get_origin(annotation) is list
+        inner = get_args(annotation)[0] if many else annotation
+
+        if isinstance(inner, type) and issubclass(inner, BaseModel):
+            nested.append((name, many, inner))
+
+    return nested
+
+
+def construct(model: type[BaseModel], values: dict) -> BaseModel:
+    """
+    model_construct doesnt build nested models, the doctor and the relations are constructed here first
+    """
+    values = dict(values)
+
+    for name, many, inner in _nested_models(model):
+        if name in values:
+            value = values[name]
+            values[name] = [construct(inner, item) for item in value] if many else construct(inner, value)
+
+    return model.model_construct(**values)
+
+
+@dataclass
+class Payload:
+    name: str
+    item: type[BaseModel]
+    many: bool
+    load_orm: Callable[[Session], Any]
+    load_rows: Callable[[Connection], Any]
+
+    @functools.cached_property
+    def response_type(self):
+        return list[self.item] if self.many else self.item
+
+    @functools.cached_property
+    def adapter(self) -> TypeAdapter:
+        return TypeAdapter(self.response_type)
+
+    @functools.cached_property
+    def response_field(self):
+        return create_response_field(name=f"Response_{self.name}", type_=self.response_type, mode="serialization")
+
+    def validate(self, orm):
+        if self.many:
+            return [self.item.model_validate(x) for x in orm]
+        return self.item.model_validate(orm)
+
+    def rebuild(self, records):
+        if self.many:
+            return [self.item(**x.model_dump()) for x in records]
+        return self.item(**records.model_dump())
+
+    def construct(self, rows):
+        if self.many:
+            return [construct(self.item, row) for row in rows]
+        return construct(self.item, rows)
+
+
+def build_payloads(patient_id, page_size: int) -> list[Payload]:
+    def load_user(session: Session):
+        return session.execute(select(UserDB).where(UserDB.user_id == patient_id)).scalar_one()
+
+    def user_rows(connection: Connection):
+        stmt = select(*(UserDB.__table__.c[name] for name in _columns(UserDB, User)))
+        return dict(connection.execute(stmt.where(UserDB.user_id == patient_id)).mappings().one())
+
+    def list_loader(orm):
+        def load(session: Session):
+            stmt = select(orm).where(orm.patient_id == patient_id).options(joinedload(orm.doctor)).limit(page_size)
+            return session.execute(stmt).scalars().all()
+
+        return load
+
+    def list_rows(orm, schema):
+        return lambda connection: _core_list(connection, orm, schema, patient_id, page_size)
+
+    def load_aggregate(session: Session):
+        # As auth_db_handler.get_user_with_id_and_relations loads it
+        options = [
+            selectinload(getattr(UserDB, field)).joinedload(doctor)
+            if doctor is not None
+            else selectinload(getattr(UserDB, field))
+            for field, _, doctor in RELATIONS
+        ]
+        return session.execute(select(UserDB).where(UserDB.user_id == patient_id).options(*options)).scalar_one()
+
+    def aggregate_rows(connection: Connection):
+        rows = user_rows(connection)
+
+        for field, orm, _ in RELATIONS:
+            schema = get_args(UserWithAllRelations.model_fields[field].annotation)[0]
+            rows[field] = _core_list(connection, orm, schema, patient_id, None)
+
+        return rows
+
+    return [
+        Payload("User", User, False, load_user, user_rows),
+        Payload(
+            "AppointmentWithDoctor",
+            AppointmentWithDoctor,
+            True,
+            list_loader(AppointmentDB),
+            list_rows(AppointmentDB, AppointmentWithDoctor),
+        ),
+        Payload(
+            "BillingWithDoctor",
+            BillingWithDoctor,
+            True,
+            list_loader(BillingDB),
+            list_rows(BillingDB, BillingWithDoctor),
+        ),
+        Payload("UserWithAllRelations", UserWithAllRelations, False, load_aggregate, aggregate_rows),
+    ]
+
+
+async def run_once(engine, payload: Payload, variant: str) -> tuple[dict[str, int], bytes]:
+    """
+    One response built with `variant`, returns the nanoseconds of each stage and the body
+    """
+    times = {}
+    start = time.perf_counter_ns()
+
+    def lap(stage: str):
+        nonlocal start
+        now = time.perf_counter_ns()
+        times[stage] = now - start
+        start = now
+
+    if variant == "current":
+        with Session(engine) as session:
+            orm = payload.load_orm(session)
+            lap("load")
+            records = payload.validate(orm)
+            lap("validate")
+
+        records = payload.rebuild(records)
+        lap("rebuild")
+        content = await serialize_response(field=payload.response_field, response_content=records)
+        lap("response_model")
+        body = orjson.dumps(content)
+        lap("encode")
+
+        return times, body
+
+    with engine.connect() as connection:
+        rows = payload.load_rows(connection)
+    lap("load")
+
+    if variant == "orjson":
+        body = orjson.dumps(rows)
+    else:
+        records = payload.adapter.validate_python(rows) if variant == "typeadapter" else payload.construct(rows)
+        lap("validate")
+        body = payload.adapter.dump_json(records)
+    lap("encode")
+
+    return times, body
+
+
+async def measure(engine, payload: Payload, variant: str, iterations: int) -> tuple[dict[str, float], bytes]:
+    totals = dict.fromkeys(STAGES, 0)
+
+    for _ in range(min(iterations, 50)):
+        await run_once(engine, payload, variant)
+
+    for _ in range(iterations):
+        times, body = await run_once(engine, payload, variant)
+        for stage, duration in times.items():
+            totals[stage] += duration
+
+    return {stage: totals[stage] / iterations / 1e3 for stage in STAGES}, body
+
+
+async def run(history_depth: int, page_size: int, iterations: int):
+    # SQLAlchemy keeps one connection per thread for :memory:, so every session sees the seeded rows
+    engine = create_engine("sqlite://")
+    AbstractBase.metadata.create_all(engine)
+
+    patient = make_user_with_relations(history_depth=history_depth)
+    with engine.connect() as connection:
+        seed(connection, patient)
+
+    rows = []
+    for payload in build_payloads(patient.user_id, page_size):
+        expected = None
+
+        for variant in VARIANTS:
+            stage_us, body = await measure(engine, payload, variant, iterations)
+
+            decoded = orjson.loads(body)
+            expected = decoded if expected is None else expected
+            same = "yes" if decoded == expected else "no"
+
+            rows.append(
+                [
+                    payload.name,
+                    variant,
+                    *(stage_us[stage] if stage_us[stage] else "-" for stage in STAGES),
+                    sum(stage_us.values()),
+                    len(body),
+                    same,
+                ]
+            )
+
+    print(f"{history_depth} rows per relation, {page_size} rows per list, {iterations} iterations, microseconds")
+    print_table(["payload", "variant", *STAGES, "total", "bytes", "same json"], rows)
+
+
+def main(history_depth: int, page_size: int, iterations: int):
+    asyncio.run(run(history_depth=history_depth, page_size=page_size, iterations=iterations))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history-depth", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    main(history_depth=args.history_depth, page_size=args.page_size, iterations=args.iterations)
@@ -0,0 +1,60 @@
+"""
+Throughput of `auth_utils.extract_token` for a bearer token that is sent over and over.
+
+"before" rebuilds the serializer and checks both signatures on every call, like the decode path used to.
+"after" is the current `extract_token`, which serves repeated tokens from the verified token cache.
+
+    python -m benchmarks.token_decode --iterations 50000
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi.security import HTTPAuthorizationCredentials
+from itsdangerous.url_safe import URLSafeSerializer
+
+from ai_health.services.utils import auth_utils
+from benchmarks.utils import print_table
+
+
+def extract_token_uncached(encrypted_token: str):
+    token = URLSafeSerializer(auth_utils.ITS_DANGEROUS_SECRET).loads(encrypted_token)
+    payload = auth_utils.get_access_token_data(token=token)
+
+    return payload.get("user_id")
+
+
+async def main(iterations: int):
+    encrypted_token = auth_utils.get_token_data_from_data(data={"user_id": "benchmark-user"}).access_token
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=encrypted_token)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        extract_token_uncached(encrypted_token)
+    before = time.perf_counter() - start
+
+    auth_utils.verified_token_cache.clear()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await auth_utils.extract_token(credentials=credentials)
+    after = time.perf_counter() - start
+
+    print(f"extract_token with the same token {iterations} times")
+    print_table(
+        ["path", "calls/s", "us/call"],
+        [
+            ["before", iterations / before, before / iterations * 1e6],
+            ["after", iterations / after, after / iterations * 1e6],
+        ],
+    )
+    print(f"cache {auth_utils.verified_token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50000)
+    args = parser.parse_args()
+
+    asyncio.run(main(iterations=args.iterations))
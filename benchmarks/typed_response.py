@@ -0,0 +1,111 @@
+"""
+CPU per request of the list endpoints' responses, FastAPI's response_model pass against @typed_response.
+
+Every list response model gets two routes returning the same already built page, like their services do,
+one plain and one marked with @typed_response. Requests are sent straight through the ASGI interface, so
+only the app's own work is measured. CPU is the process time over the requests, the rest of the request
+(routing, dependencies, middlewares) is the same for both and cancels out in the difference. Both routes
+must send the same bytes, the last column checks it.
+
+    python -m benchmarks.typed_response --page-size 50 --requests 2000 --rounds 5
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+
+from ai_health.root.utils.timed_route import TimedAPIRoute
+from ai_health.root.utils.typed_response import typed_response
+from ai_health.schemas.appointment_schema import AppointmentList
+from ai_health.schemas.billings_schema import BillingsWithDoctorList
+from ai_health.schemas.doctor_schema import DoctorList
+from ai_health.schemas.lab_report_schema import LabReportList
+from ai_health.schemas.medical_history_schema import MedicalHistoryList
+from ai_health.schemas.medication_schema import MedicationList
+from ai_health.schemas.visits_schema import VisitList
+from benchmarks.fixtures import make_doctor, make_user_with_relations
+from benchmarks.utils import asgi_request, print_table
+
+
+def build_pages(page_size: int) -> dict:
+    patient = make_user_with_relations(history_depth=page_size)
+
+    return {
+        "appointments": AppointmentList(detail="Appointments retrieved", appointments=patient.appointments),
+        "billings": BillingsWithDoctorList(billings=patient.billings),
+        "doctors": DoctorList(doctors=[make_doctor(i) for i in range(page_size)]),
+        "lab_reports": LabReportList(detail="Lab reports retrieved", lab_reports=patient.lab_reports),
+        "medical_history": MedicalHistoryList(
+            detail="Medical histories retrieved", medical_histories=patient.medical_history
+        ),
+        "medications": MedicationList(detail="Medications retrieved", medications=patient.medications),
+        "visits": VisitList(detail="Visits retrieved", visits=patient.visits),
+    }
+
+
+def _endpoint(page):
+    async def endpoint():
+        return page
+
+    return endpoint
+
+
+def build_app(pages: dict) -> FastAPI:
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.router.route_class = TimedAPIRoute
+
+    for name, page in pages.items():
+        app.get(f"/plain/{name}", response_model=type(page))(_endpoint(page))
+        app.get(f"/typed/{name}", response_model=type(page))(typed_response(_endpoint(page)))
+
+    return app
+
+
+async def measure(app: FastAPI, path: str, requests: int) -> float:
+    """
+    Mean CPU microseconds per request
+    """
+    for _ in range(min(requests, 200)):
+        await asgi_request(app, path)
+
+    start = time.process_time_ns()
+    for _ in range(requests):
+        await asgi_request(app, path)
+
+    return (time.process_time_ns() - start) / requests / 1e3
+
+
+def main(page_size: int, requests: int, rounds: int):
+    pages = build_pages(page_size)
+    app = build_app(pages)
+    client = TestClient(app)
+    rows = []
+
+    for name in pages:
+        # The routes take turns and the fastest round counts, so a noisy neighbour doesnt favour either
+        plain, typed = float("inf"), float("inf")
+        for _ in range(rounds):
+            plain = min(plain, asyncio.run(measure(app, f"/plain/{name}", requests)))
+            typed = min(typed, asyncio.run(measure(app, f"/typed/{name}", requests)))
+
+        body = client.get(f"/typed/{name}").content
+        same = "yes" if body == client.get(f"/plain/{name}").content else "no"
+
+        rows.append([name, plain, typed, plain - typed, (plain - typed) / plain * 100, len(body), same])
+
+    print(f"{page_size} items per page, best of {rounds} rounds of {requests} requests, CPU microseconds per request")
+    print_table(["list", "response_model", "typed_response", "saved", "saved %", "bytes", "same body"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    main(page_size=args.page_size, requests=args.requests, rounds=args.rounds)
@@ -0,0 +1,130 @@
+"""
+Rows fetched, peak Python memory and latency of loading a `UserWithAllRelations` for a large seeded patient.
+
+Compares the previous single statement joining all six collections with the current
+`auth_db_handler.get_user_with_id_and_relations`. Needs the migrated Postgres from the .env, the seeded
+patient is removed again at the end.
+
+    python -m benchmarks.user_relations_loading --visits 50 --medications 30 --appointments 40 --iterations 50
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import joinedload
+
+from ai_health.database.db_handlers import auth_db_handler
+from ai_health.database.orms.auth_orm import User as UserDB
+from ai_health.database.orms.billing_orm import Billing as BillingDB
+from ai_health.database.orms.medication_n_dosage_orm import Appointment as AppointmentDB, Medication as MedicationDB
+from ai_health.database.orms.visits_orm import Visit as VisitDB
+from ai_health.root.database import async_session, engine
+from ai_health.schemas.auth_schemas import UserWithAllRelations
+from benchmarks.seed import remove_patient, seed_patient
+from benchmarks.utils import percentile, print_table
+
+
+class QueryCounter:
+    def __init__(self) -> None:
+        self.statements = 0
+        self.rows = 0
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+        self.rows += max(cursor.rowcount, 0)
+
+
+async def load_with_joinedload(user_id) -> UserWithAllRelations:
+    async with async_session() as session:
+        stmt = (
+            select(UserDB)
+            .filter(UserDB.user_id == user_id)
+            .options(
+                joinedload(UserDB.medical_history),
+                joinedload(UserDB.lab_reports),
+                joinedload(UserDB.visits).joinedload(VisitDB.doctor),
+                joinedload(UserDB.appointments).joinedload(AppointmentDB.doctor),
+                joinedload(UserDB.medications).joinedload(MedicationDB.doctor),
+                joinedload(UserDB.billings).joinedload(BillingDB.doctor),
+            )
+        )
+
+        result = (await session.execute(statement=stmt)).unique().scalar_one()
+
+        return UserWithAllRelations.model_validate(result)
+
+
+async def measure(loader, user_id, iterations: int, counter: QueryCounter) -> list:
+    # Warms up the connection pool and the statement caches
+    await loader(user_id)
+
+    counter.statements = counter.rows = 0
+    await loader(user_id)
+    statements, rows = counter.statements, counter.rows
+
+    tracemalloc.start()
+    await loader(user_id)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await loader(user_id)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return [statements, rows, peak_memory / 1024, percentile(latencies, 50), percentile(latencies, 95)]
+
+
+async def main(iterations: int, **relation_sizes):
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "after_cursor_execute", counter.after_cursor_execute)
+
+    patient = await seed_patient(**relation_sizes)
+
+    try:
+        rows = [
+            ["joinedload", *await measure(load_with_joinedload, patient.user_id, iterations, counter)],
+            [
+                "selectinload",
+                *await measure(
+                    lambda user_id: auth_db_handler.get_user_with_id_and_relations(user_id=user_id),
+                    patient.user_id,
+                    iterations,
+                    counter,
+                ),
+            ],
+        ]
+    finally:
+        await remove_patient(patient)
+        await engine.dispose()
+
+    print(", ".join(f"{name} {size}" for name, size in relation_sizes.items()))
+    print_table(["strategy", "statements", "rows fetched", "peak KiB", "p50 ms", "p95 ms"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--visits", type=int, default=50)
+    parser.add_argument("--medications", type=int, default=30)
+    parser.add_argument("--appointments", type=int, default=40)
+    parser.add_argument("--lab-reports", type=int, default=20)
+    parser.add_argument("--medical-history", type=int, default=20)
+    parser.add_argument("--billings", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(
+        main(
+            iterations=args.iterations,
+            visits=args.visits,
+            medications=args.medications,
+            appointments=args.appointments,
+            lab_reports=args.lab_reports,
+            medical_history=args.medical_history,
+            billings=args.billings,
+        )
+    )
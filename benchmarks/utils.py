@@ -0,0 +1,68 @@
+import asyncio
+import math
+import time
+from typing import Sequence
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """
+    Nearest rank percentile, pct is between 0 and 100
+    """
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+
+    return ordered[rank]
+
+
+def print_table(headers: Sequence[str], rows: Sequence[Sequence]):
+    rows = [[f"{cell:.3f}" if isinstance(cell, float) else str(cell) for cell in row] for row in rows]
+    widths = [max(len(str(header)), *(len(row[i]) for row in rows)) for i, header in enumerate(headers)]
+
+    print("  ".join(str(header).ljust(width) for header, width in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+
+
+async def asgi_request(app, path: str, headers: Sequence[tuple[bytes, bytes]] = ()) -> int:
+    """
+    Sends a GET straight through the ASGI interface, so no server or client time is measured, returns the
+    nanoseconds until the app returned
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"benchmark"), *headers],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+
+    body_sent = False
+    disconnected = asyncio.Event()
+
+    async def receive():
+        nonlocal body_sent
+
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        # Like a server, waits for a disconnect that doesnt come, streaming responses listen for one
+        await disconnected.wait()
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter_ns()
+    await app(scope, receive, send)
+
+    return time.perf_counter_ns() - start
@@ -0,0 +1,24 @@
+"""
+Gunicorn settings for the app server, used by backend_app.service.
+
+Every worker keeps its Prometheus samples in PROMETHEUS_MULTIPROC_DIR so /metrics can add them up. The
+directory is emptied when gunicorn starts, and the files of a worker that exits are marked dead.
+"""
+
+import os
+import shutil
+
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/ai_health_prometheus")
+
+from prometheus_client import multiprocess  # noqa: E402 the directory must be set before it is imported
+
+
+def on_starting(server):
+    multiproc_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+
+    shutil.rmtree(multiproc_dir, ignore_errors=True)
+    os.makedirs(multiproc_dir)
+
+
+def child_exit(server, worker):
+    multiprocess.mark_process_dead(worker.pid)
@@ -30,6 +30,19 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = AbstractBase.metadata
 
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """
+    Leaves out the unique constraints on a primary key that are only in the database. Revision c41e9a7d2b6f
+    kept the ones a foreign key is bound to, the models dont declare them, a primary key is unique already.
+    """
+    if type_ == "unique_constraint" and reflected and compare_to is None:
+        return set(object.columns.keys()) != set(object.table.primary_key.columns.keys())
+
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -52,6 +65,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -61,7 +75,7 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,136 @@
+"""add list indexes, drop duplicate pk unique constraints
+
+Revision ID: c41e9a7d2b6f
+Revises: 75a80e192ad9
+Create Date: 2026-10-18 10:12:41.306518
+
+The unique constraints on a primary key that a foreign key is bound to are kept, see DROP_DUPLICATE_UNIQUES.
+The models dont declare them, env.py's include_object leaves them out of autogenerate and alembic check.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e9a7d2b6f'
+down_revision: Union[str, None] = '75a80e192ad9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Index name, table, columns. They match the filters and the keyset order of the list db_handlers.
+INDEXES = [
+    (
+        "ix_appointments_patient_id_appointment_date",
+        "appointments",
+        ["patient_id", "appointment_date DESC", "appointment_id DESC"],
+    ),
+    (
+        "ix_appointments_doctor_id_appointment_date",
+        "appointments",
+        ["doctor_id", "appointment_date DESC", "appointment_id DESC"],
+    ),
+    ("ix_appointments_appointment_date", "appointments", ["appointment_date DESC", "appointment_id DESC"]),
+    ("ix_visits_patient_id_visit_date", "visits", ["patient_id", "visit_date DESC", "visit_id DESC"]),
+    ("ix_visits_doctor_id_visit_date", "visits", ["doctor_id", "visit_date DESC", "visit_id DESC"]),
+    ("ix_visits_visit_date", "visits", ["visit_date DESC", "visit_id DESC"]),
+    ("ix_medications_patient_id_start_date", "medications", ["patient_id", "start_date DESC", "medication_id DESC"]),
+    ("ix_medications_doctor_id_start_date", "medications", ["doctor_id", "start_date DESC", "medication_id DESC"]),
+    ("ix_medications_start_date", "medications", ["start_date DESC", "medication_id DESC"]),
+    ("ix_labreports_patient_id_test_date", "labreports", ["patient_id", "test_date DESC", "report_id DESC"]),
+    ("ix_labreports_test_date", "labreports", ["test_date DESC", "report_id DESC"]),
+    (
+        "ix_medical_history_patient_id_diagnosis_date",
+        "medical_history",
+        ["patient_id", "diagnosis_date DESC", "history_id DESC"],
+    ),
+    ("ix_medical_history_diagnosis_date", "medical_history", ["diagnosis_date DESC", "history_id DESC"]),
+    ("ix_billings_patient_id_date_created", "billings", ["patient_id", "date_created DESC", "billing_id DESC"]),
+    ("ix_billings_doctor_id", "billings", ["doctor_id"]),
+    ("ix_doctors_date_created", "doctors", ["date_created DESC", "doctor_id DESC"]),
+]
+
+# Primary keys that also got unique constraints, from unique=True on the ORM columns
+PRIMARY_KEYS = [
+    ("users", "user_id"),
+    ("doctors", "doctor_id"),
+    ("appointments", "appointment_id"),
+    ("visits", "visit_id"),
+    ("medications", "medication_id"),
+    ("labreports", "report_id"),
+    ("medical_history", "history_id"),
+    ("billings", "billing_id"),
+]
+
+# The duplicates were created unnamed by two different revisions, so they are found by their column.
+# One that a foreign key was bound to instead of the primary key is kept, dropping it would fail.
+DROP_DUPLICATE_UNIQUES = """
+DO $$
+DECLARE
+    constraint_name text;
+BEGIN
+    FOR constraint_name IN
+        SELECT con.conname
+        FROM pg_constraint con
+        JOIN pg_attribute att ON att.attrelid = con.conrelid AND att.attnum = ANY (con.conkey)
+        WHERE con.conrelid = '{table}'::regclass
+          AND con.contype = 'u'
+          AND array_length(con.conkey, 1) = 1
+          AND att.attname = '{column}'
+          AND NOT EXISTS (
+              SELECT 1
+              FROM pg_constraint fk
+              WHERE fk.contype = 'f' AND fk.conindid = con.conindid
+          )
+    LOOP
+        EXECUTE format('ALTER TABLE {table} DROP CONSTRAINT IF EXISTS %I', constraint_name);
+    END LOOP;
+END $$;
+"""
+
+# Only where the upgrade dropped every unique of the column. The one a foreign key is bound to was kept, and
+# as an unnamed default it already has the {table}_{column}_key name.
+RESTORE_UNIQUE = """
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_constraint con
+        JOIN pg_attribute att ON att.attrelid = con.conrelid AND att.attnum = ANY (con.conkey)
+        WHERE con.conrelid = '{table}'::regclass
+          AND con.contype = 'u'
+          AND array_length(con.conkey, 1) = 1
+          AND att.attname = '{column}'
+    ) THEN
+        ALTER TABLE {table} ADD CONSTRAINT {table}_{column}_key UNIQUE ({column});
+    END IF;
+END $$;
+"""
+
+
+def upgrade() -> None:
+    for table, column in PRIMARY_KEYS:
+        op.execute(DROP_DUPLICATE_UNIQUES.format(table=table, column=column))
+
+    # CREATE INDEX CONCURRENTLY doesnt lock writes but cant run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [sa.text(column) for column in columns],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+    for table, column in PRIMARY_KEYS:
+        op.execute(RESTORE_UNIQUE.format(table=table, column=column))
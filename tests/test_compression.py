@@ -0,0 +1,66 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from ai_health.root.compression import GzipEncoder
+from ai_health.root.middlewares import CompressionMiddleware
+
+
+pytestmark = pytest.mark.anyio
+
+LARGE = {"detail": "x" * 2048}
+
+
+app = Starlette(
+    routes=[
+        Route("/small", lambda request: JSONResponse({"detail": "ok"})),
+        Route("/large", lambda request: JSONResponse(LARGE)),
+        Route("/image", lambda request: Response(b"\x89PNG" * 1024, media_type="image/png")),
+        # Like the 304s conditional() raises, without a Content-Type
+        Route("/not-modified", lambda request: Response(status_code=304, headers={"ETag": 'W/"1"'})),
+    ]
+)
+
+
+@pytest.fixture
+def client() -> AsyncClient:
+    middleware = CompressionMiddleware(app, encoders=[GzipEncoder()], minimum_size=1024)
+
+    return AsyncClient(transport=ASGITransport(app=middleware), base_url="http://test")
+
+
+@pytest.mark.parametrize(
+    "path, accept_encoding",
+    [("/small", "gzip"), ("/large", "identity"), ("/large", "")],
+    ids=["too small", "no offered encoding", "no accept encoding"],
+)
+async def test_uncompressed_json_still_varies_on_accept_encoding(client, path, accept_encoding):
+    response = await client.get(path, headers={"Accept-Encoding": accept_encoding})
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+async def test_compressed_json_varies_on_accept_encoding_once(client):
+    response = await client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.json() == LARGE
+
+
+async def test_not_modified_varies_on_accept_encoding(client):
+    response = await client.get("/not-modified", headers={"Accept-Encoding": "gzip", "If-None-Match": 'W/"1"'})
+
+    assert response.status_code == 304
+    assert "content-type" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+async def test_incompressible_types_dont_vary(client):
+    response = await client.get("/image", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
@@ -0,0 +1,72 @@
+import anyio
+import fakeredis
+import pytest
+
+from ai_health.database import cache
+from ai_health.root.redis_manager import redis_manager
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def redis(monkeypatch):
+    monkeypatch.setattr(redis_manager, "redis_client", fakeredis.FakeAsyncRedis())
+
+
+def cached_reader(rows: dict, **cached_kwargs):
+    """
+    A cached read of `rows`. When `rows` has `read` and `hold` events, it sets `read` once it has read the row
+    and holds the result until the test sets `hold`
+    """
+
+    @cache.cached(dict, **cached_kwargs)
+    async def read(row_id: str) -> dict:
+        result = dict(rows[row_id])
+        if "hold" in rows:
+            rows["read"].set()
+            await rows["hold"].wait()
+
+        return result
+
+    return read
+
+
+async def test_invalidating_a_tag_deletes_its_entries():
+    rows = {"a": {"name": "old"}}
+    read = cached_reader(rows, tags=["row:{row_id}"])
+
+    assert await read("a") == {"name": "old"}
+
+    rows["a"] = {"name": "new"}
+    assert await read("a") == {"name": "old"}
+
+    await cache.invalidate_tags("row:a")
+    assert await read("a") == {"name": "new"}
+
+
+@pytest.mark.parametrize(
+    "cached_kwargs, tag",
+    [
+        ({"tags": ["row:{row_id}"]}, "row:a"),
+        ({"result_tags": lambda row: [cache.make_tag("owner", row["owner"])]}, "owner:1"),
+    ],
+    ids=["tags", "result tags"],
+)
+async def test_a_load_that_read_before_an_invalidation_isnt_kept(cached_kwargs, tag):
+    rows = {"a": {"name": "old", "owner": 1}, "read": anyio.Event(), "hold": anyio.Event()}
+    read = cached_reader(rows, **cached_kwargs)
+
+    async with anyio.create_task_group() as task_group:
+        task_group.start_soon(read, "a")
+        await rows["read"].wait()
+
+        # A write commits and invalidates while the load still holds what it read before
+        rows["a"] = {"name": "new", "owner": 1}
+        await cache.invalidate_tags(tag)
+
+        rows["hold"].set()
+
+    del rows["read"], rows["hold"]
+
+    assert await read("a") == {"name": "new", "owner": 1}
@@ -0,0 +1,111 @@
+import uuid
+from datetime import datetime, timezone
+
+import fakeredis
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from ai_health.database.db_handlers import doctor_db_handler
+from ai_health.database.orms.doctor_orm import Doctor as DoctorDB
+from ai_health.root.app import app
+from ai_health.root.redis_manager import redis_manager
+from ai_health.root.utils.abstract_base import AbstractBase
+from ai_health.schemas.auth_schemas import User
+from ai_health.schemas.doctor_schema import DoctorUpdate
+from ai_health.services.utils import auth_utils
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def database(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(AbstractBase.metadata.create_all)
+
+    monkeypatch.setattr(doctor_db_handler, "async_session", async_sessionmaker(engine, expire_on_commit=False))
+
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture
+async def doctor_id(database, monkeypatch) -> uuid.UUID:
+    monkeypatch.setattr(redis_manager, "redis_client", fakeredis.FakeAsyncRedis())
+
+    doctor_id = uuid.uuid4()
+    async with database.begin() as connection:
+        await connection.execute(
+            insert(DoctorDB).values(
+                doctor_id=doctor_id,
+                first_name="Doctor0",
+                last_name="Adeyemi",
+                specialty="General Practice",
+                contact_number="+2348012345678",
+                email="doctor0@ai-health.example.com",
+                # SQLite's now() has whole seconds, an update in the same second wouldnt move it
+                date_updated=datetime(2024, 7, 1, 9, 30, tzinfo=timezone.utc),
+            )
+        )
+
+    return doctor_id
+
+
+@pytest.fixture
+def client(doctor_id) -> AsyncClient:
+    user = User(
+        user_id=uuid.uuid4(),
+        first_name="Ada",
+        last_name="Okafor",
+        email="ada.okafor@example.com",
+        phone_number="+2348098765432",
+        user_type="PATIENT",
+        date_of_birth=datetime(1990, 4, 12, tzinfo=timezone.utc),
+        gender="FEMALE",
+        address="12 Marina Road, Lagos",
+    )
+    app.dependency_overrides[auth_utils.get_current_user] = lambda: user
+
+    yield AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("path", ["/v1/doctors/{doctor_id}", "/v1/doctors/"])
+async def test_etag_is_the_one_of_the_cached_body(client, database, doctor_id, path):
+    path = path.format(doctor_id=doctor_id)
+    response = await client.get(path)
+    etag, body = response.headers["ETag"], response.json()
+
+    # Written behind the cache, like a write that has committed and not invalidated its tags yet
+    async with database.begin() as connection:
+        await connection.execute(update(DoctorDB).where(DoctorDB.doctor_id == doctor_id).values(first_name="Renamed"))
+
+    response = await client.get(path)
+
+    assert response.json() == body
+    assert response.headers["ETag"] == etag
+
+
+@pytest.mark.parametrize("path", ["/v1/doctors/{doctor_id}", "/v1/doctors/"])
+async def test_editing_a_doctor_sends_it_again(client, doctor_id, path):
+    path = path.format(doctor_id=doctor_id)
+    response = await client.get(path)
+    etag = response.headers["ETag"]
+
+    response = await client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    await doctor_db_handler.update_doctor(doctor_id=doctor_id, doctor_update=DoctorUpdate(first_name="Renamed"))
+
+    response = await client.get(path, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert "Renamed" in response.text
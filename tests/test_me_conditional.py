@@ -0,0 +1,132 @@
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+import fakeredis
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from ai_health.database.db_handlers import auth_db_handler, doctor_db_handler
+from ai_health.database.orms.auth_orm import User as UserDB
+from ai_health.database.orms.doctor_orm import Doctor as DoctorDB
+from ai_health.database.orms.medication_n_dosage_orm import Appointment as AppointmentDB
+from ai_health.root.app import app
+from ai_health.root.redis_manager import redis_manager
+from ai_health.root.utils.abstract_base import AbstractBase
+from ai_health.schemas.auth_schemas import User
+from ai_health.schemas.doctor_schema import DoctorUpdate
+from ai_health.services.utils import auth_utils
+
+
+pytestmark = pytest.mark.anyio
+
+NOW = datetime(2024, 7, 1, 9, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def database(monkeypatch):
+    # One in-memory database shared by every session
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(AbstractBase.metadata.create_all)
+
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def session():
+        async with session_maker() as session:
+            yield session
+
+    monkeypatch.setattr(auth_db_handler, "async_session", session_maker)
+    monkeypatch.setattr(auth_db_handler, "read_session", session)
+    monkeypatch.setattr(doctor_db_handler, "async_session", session_maker)
+
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    monkeypatch.setattr(redis_manager, "redis_client", fakeredis.FakeAsyncRedis())
+
+
+@pytest.fixture
+async def patient(database) -> tuple[User, uuid.UUID]:
+    user_id, doctor_id = uuid.uuid4(), uuid.uuid4()
+    user = {
+        "user_id": user_id,
+        "first_name": "Ada",
+        "last_name": "Okafor",
+        "email": "ada.okafor@example.com",
+        "password": "hash",
+        "phone_number": "+2348098765432",
+        "user_type": "PATIENT",
+        "date_of_birth": datetime(1990, 4, 12, tzinfo=timezone.utc),
+        "gender": "FEMALE",
+        "address": "12 Marina Road, Lagos",
+    }
+
+    async with database.begin() as connection:
+        await connection.execute(insert(UserDB).values(user))
+        await connection.execute(
+            insert(DoctorDB).values(
+                doctor_id=doctor_id,
+                first_name="Doctor0",
+                last_name="Adeyemi",
+                specialty="General Practice",
+                contact_number="+2348012345678",
+                email="doctor0@ai-health.example.com",
+            )
+        )
+        await connection.execute(
+            insert(AppointmentDB).values(
+                appointment_id=uuid.uuid4(),
+                patient_id=user_id,
+                doctor_id=doctor_id,
+                appointment_date=NOW,
+                next_appointment_date=NOW,
+                reason_for_appointment="Routine check up",
+                status="SCHEDULED",
+            )
+        )
+
+    return User(**{key: value for key, value in user.items() if key != "password"}), doctor_id
+
+
+@pytest.fixture
+def client(redis, patient) -> AsyncClient:
+    user, _ = patient
+    app.dependency_overrides[auth_utils.get_current_user] = lambda: user
+
+    yield AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+    app.dependency_overrides.clear()
+
+
+async def test_me_is_not_modified_until_its_cached_aggregate_changes(client):
+    response = await client.get("/v1/auth/me")
+    assert response.status_code == 200
+
+    response = await client.get("/v1/auth/me", headers={"If-None-Match": response.headers["ETag"]})
+    assert response.status_code == 304
+
+
+async def test_editing_a_doctor_sends_me_again_with_the_new_doctor(client, patient):
+    _, doctor_id = patient
+
+    response = await client.get("/v1/auth/me")
+    etag = response.headers["ETag"]
+    assert response.json()["appointments"][0]["doctor"]["first_name"] == "Doctor0"
+
+    await doctor_db_handler.update_doctor(doctor_id=doctor_id, doctor_update=DoctorUpdate(first_name="Renamed"))
+
+    response = await client.get("/v1/auth/me", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["appointments"][0]["doctor"]["first_name"] == "Renamed"
@@ -0,0 +1,65 @@
+import logging
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from ai_health.root import query_budget
+from ai_health.root.middlewares import MetricsMiddleware, QueryBudgetMiddleware
+from ai_health.root.utils.timed_route import TimedAPIRoute
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def engine(monkeypatch):
+    # The mode is read when the app starts, the engine is only instrumented when it isnt off
+    monkeypatch.setattr(query_budget, "ENABLED", True)
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    query_budget.instrument_engine(engine.sync_engine)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def client(engine) -> AsyncClient:
+    router = APIRouter(route_class=TimedAPIRoute)
+
+    @router.get("/over-budget")
+    @query_budget.query_budget(1)
+    async def over_budget():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            await connection.execute(text("SELECT 2"))
+
+        return {"detail": "ok"}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(QueryBudgetMiddleware)
+    app.add_middleware(MetricsMiddleware)
+
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+async def test_strict_mode_fails_a_request_over_its_budget(monkeypatch, client):
+    monkeypatch.setattr(query_budget.settings, "QUERY_BUDGET_MODE", "strict")
+
+    with pytest.raises(query_budget.QueryBudgetExceeded, match="ran 2 queries, its budget is 1"):
+        await client.get("/over-budget")
+
+
+async def test_log_mode_only_logs_a_request_over_its_budget(monkeypatch, client, caplog):
+    monkeypatch.setattr(query_budget.settings, "QUERY_BUDGET_MODE", "log")
+
+    with caplog.at_level(logging.WARNING, logger=query_budget.LOGGER.name):
+        response = await client.get("/over-budget")
+
+    assert response.status_code == 200
+    assert "GET /over-budget ran 2 queries, its budget is 1" in caplog.text